@@ -10,19 +10,28 @@ try:
 
     import vrController
     import vrFileIO
-    import csv
     import os
     import random
     import string
     import vrScenegraph
     import vrOptimize
     import vrMaterialPtr
-    import re
     import vrNodePtr
     import vrNodeUtils
     import vrFieldAccess
     import vrGeometryEditor
     import vrFileDialog
+    import sys
+    import time
+    import concurrent.futures
+
+    # 插件目录加入搜索路径，用于导入核心模块
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from vrToolsCore import (matchScoring, signatureCache, sceneTraversal, nodeInfo, duplicateFaces, geometryHash,
+                             jobScheduler, profiler, csvLoader, searchIndex, nameMatcher,
+                             materialTagger, materialTable, referenceTable,
+                             textureStrip, textureBudget, bboxCulling,
+                             tessellationPlanner, tessellationCache, lodPlanner, decoreBatches)
 except ImportError:
     importError = True
     pass
@@ -40,6 +49,114 @@ version = 'V1.4 - VRED 2023.2 -'
 form, base = uiTools.loadUiType('VredVRTools.ui')
 
 
+# 场景树遍历使用的子节点获取函数
+def getNodeChildren(node):
+    return node.getChildren()
+
+
+# 节点在场景树中的路径
+def getNodePath(node):
+    names = []
+    while node.isValid():
+        names.append(node.getName())
+        node = node.getParent()
+    return '/'.join(reversed(names))
+
+
+# 节点为几何体时返回几何体节点，否则返回None
+def asGeometryNode(node):
+    geo = vrdGeometryNode(node)
+    if geo.isValid():
+        return geo
+    return None
+
+
+# 在工作线程中缩小并重新压缩图像，返回保存路径，无法读取或保存时返回None
+def downscaleImage(source, directory, width, height, quality, lossy=True):
+    image = QtGui.QImage(source)
+    if image.isNull():
+        return None
+    scaled = image.scaled(width, height, QtCore.Qt.IgnoreAspectRatio, QtCore.Qt.SmoothTransformation)
+    if lossy and not scaled.hasAlphaChannel():
+        # 不带透明通道的颜色贴图重新压缩为JPEG
+        target = textureBudget.outputPath(source, directory, width, height, '.jpg')
+        if scaled.save(target, None, quality):
+            return target
+        return None
+    # 数据贴图和带透明通道的图像保持原格式，无法写入原格式时保存为无损的PNG
+    target = textureBudget.outputPath(source, directory, width, height)
+    if scaled.save(target, None, 100):
+        return target
+    target = textureBudget.outputPath(source, directory, width, height, '.png')
+    if scaled.save(target):
+        return target
+    return None
+
+
+class MaterialListModel(QtCore.QAbstractListModel):
+
+    """
+    UE材质列表模型
+    过滤结果保存为可见名称的序号，过滤时只重置模型，视图按需读取可见行
+    """
+
+    def __init__(self, names=(), renamed=None, parent=None):
+        super(MaterialListModel, self).__init__(parent)
+        self.searchIndex = searchIndex.TrigramIndex(names)
+        # 已重命名的材质名称
+        self.renamed = renamed if renamed is not None else set()
+        self.query = ''
+        self.hideRenamed = False
+        self.rows = list(range(len(self.searchIndex)))
+
+    def setNames(self, names):
+        self.beginResetModel()
+        self.searchIndex = searchIndex.TrigramIndex(names)
+        self.rows = self.filterRows()
+        self.endResetModel()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        name = self.searchIndex.names[self.rows[index.row()]]
+        if role == QtCore.Qt.DisplayRole:
+            return name
+        if role == QtCore.Qt.ForegroundRole and name in self.renamed:
+            return QtGui.QBrush(QtCore.Qt.gray)
+        return None
+
+    def name(self, index):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        return self.searchIndex.names[self.rows[index.row()]]
+
+    def filterRows(self):
+        rows = self.searchIndex.search(self.query)
+        if self.hideRenamed and self.renamed:
+            names = self.searchIndex.names
+            rows = [row for row in rows if names[row] not in self.renamed]
+        return rows
+
+    def setFilter(self, query, hideRenamed):
+        """ 按搜索文本和是否隐藏已重命名项过滤 """
+        self.query = query
+        self.hideRenamed = hideRenamed
+        self.beginResetModel()
+        self.rows = self.filterRows()
+        self.endResetModel()
+
+    def markRenamed(self, names):
+        """ 记录已重命名的材质，隐藏已重命名项时重新过滤 """
+        self.renamed.update(names)
+        if self.hideRenamed:
+            self.setFilter(self.query, self.hideRenamed)
+
+
 class VredVRTools(form, base):
 
     """
@@ -54,18 +171,42 @@ class VredVRTools(form, base):
         super(VredVRTools, self).__init__(parent)
         parent.layout().addWidget(self)
         self.parent = parent
+
+        # 记录每次操作的耗时和VRED接口调用次数
+        self.profiler = profiler.Profiler(
+            {'vrScenegraph': vrScenegraph, 'vrOptimize': vrOptimize, 'vrNodeUtils': vrNodeUtils,
+             'vrNodePtr': vrNodePtr, 'vrMaterialPtr': vrMaterialPtr, 'vrGeometryEditor': vrGeometryEditor,
+             'vrMaterialService': vrMaterialService, 'vrNodeService': vrNodeService,
+             'vrDecoreService': vrDecoreService, 'vrUndoService': vrUndoService},
+            profiler.createLogger())
+
         self.setupUi(self)
         self.setupUserInterface()
 
         self.thresholdValue = 0
         self.sizethresholdValue = 0
+        self.matchMode = 0
+        self.useSignatureCache = True
+        self.lastJobTimings = []
+        # 自适应细分的三角形预算
+        self.tessellationBudget = 2000000
+        # 增量细分记录，按场景文件加载
+        self.tessellationRecords = None
+        # 分批去除内部面的每批最大图元数量和每像素长度
+        self.decoreBatchSize = 2000000
+        self.decoreCellSize = decoreBatches.DEFAULT_CELL_SIZE
 
         self.refFilename = ''
         self.matMatchMode = 0
+        # 导出材质替换表时每个文件的最大行数，0 为不拆分
+        self.matMaxRows = 0
         self.materialList = []
         self.fileopenpath = ''
 
-        self.renamed_item = []
+        # 已重命名的UE材质名称
+        self.renamed_item = set()
+        # 判断未重命名材质并统计标记结果
+        self.materialTags = materialTagger.TagIndex()
 
         self.dialog = None
         self.selmats = None
@@ -90,7 +231,7 @@ class VredVRTools(form, base):
         self._versionlabel.setText(version)
         self._versionlabel.setAlignment(QtCore.Qt.AlignCenter)
 
-        self._merge.clicked.connect(self.mergeSelGeos)
+        self._merge.clicked.connect(self.profiled(self.mergeSelGeos))
         self._merge.setIcon(QtGui.QIcon(".\icon\icon_merge.png"))
         self._merge.setIconSize(QtCore.QSize(32, 32))
 
@@ -114,9 +255,57 @@ class VredVRTools(form, base):
         self._vrTools.setIcon(QtGui.QIcon(".\icon\icon_vrtool.png"))
         self._vrTools.setIconSize(QtCore.QSize(32, 32))
 
+        self.setupProfilePanel()
+
+    def setupProfilePanel(self):
+        """性能记录面板，默认折叠"""
+
+        self._profileToggle = QtWidgets.QToolButton()
+        self._profileToggle.setText('性能记录')
+        self._profileToggle.setCheckable(True)
+        self._profileToggle.setToolButtonStyle(QtCore.Qt.ToolButtonTextBesideIcon)
+        self._profileToggle.setArrowType(QtCore.Qt.RightArrow)
+
+        self._profileMemory = QtWidgets.QCheckBox('记录内存峰值')
+        self._profileMemory.setChecked(self.profiler.trackMemory)
+
+        self._profileText = QtWidgets.QPlainTextEdit()
+        self._profileText.setReadOnly(True)
+        self._profileText.setMaximumBlockCount(1000)
+
+        VBoxLayout = QtWidgets.QVBoxLayout()
+        VBoxLayout.setContentsMargins(0, 0, 0, 0)
+        VBoxLayout.addWidget(self._profileMemory)
+        VBoxLayout.addWidget(self._profileText)
+
+        self._profilePanel = QtWidgets.QWidget()
+        self._profilePanel.setLayout(VBoxLayout)
+        self._profilePanel.setVisible(False)
+
+        self.layout().addWidget(self._profileToggle)
+        self.layout().addWidget(self._profilePanel)
+
+        self._profileToggle.toggled.connect(self.toggleProfilePanel)
+        self._profileMemory.toggled.connect(self.setProfileMemory)
+        self.profiler.listeners.append(self.showProfileRecord)
+
+    def toggleProfilePanel(self, checked):
+        self._profileToggle.setArrowType(QtCore.Qt.DownArrow if checked else QtCore.Qt.RightArrow)
+        self._profilePanel.setVisible(checked)
+
+    def setProfileMemory(self, checked):
+        self.profiler.trackMemory = checked
+
+    def showProfileRecord(self, record):
+        self._profileText.appendPlainText(time.strftime('%H:%M:%S ', time.localtime(record.started)) + record.summary())
+
+    def profiled(self, function):
+        """返回记录性能的按钮槽函数"""
+        return lambda: self.profiler.run(function.__name__, function)
+
     # 用于遍历几何体的函数
     def findGeosRecursive(self, node, geos, predicate):
-        """ Recursively traverses the scenegraph starting at node
+        """ Traverses the scenegraph starting at node
             and collects geometry nodes which can be filtered
             with a predicate.
             Args:
@@ -124,15 +313,30 @@ class VredVRTools(form, base):
                 geos (list of vrdGeometryNode): List of collected geometry nodes
                 predicate (function): None or predicate(vrdGeometryNode)->bool
         """
-        geo = vrdGeometryNode(node)
-        if geo.isValid():
-            if predicate is None or predicate(geo):
-                geos.append(geo)
-            # stop traversing the tree
-        else:
-            # traverse the children
-            for child in node.getChildren():
-                self.findGeosRecursive(child, geos, predicate)
+        geos.extend(self.iterGeos(node, predicate))
+
+    def iterGeos(self, node, predicate=None, maxDepth=None):
+        """ Lazily yields geometry nodes below node using an explicit stack,
+            geometry nodes are not traversed further.
+            Args:
+                node (vrdNode): Start node
+                predicate (function): None or predicate(vrdGeometryNode)->bool
+                maxDepth (int): None or maximum traversal depth
+        """
+        return sceneTraversal.iterLeaves(node, getNodeChildren, asGeometryNode, predicate, maxDepth)
+
+
+    def createNodeInfoCache(self):
+        """ 创建节点信息缓存，在一次操作内记忆节点类型、子节点和包装对象 """
+        return nodeInfo.NodeInfoCache(
+            lambda node: node.getObjectId(),
+            {
+                'type': lambda node, objectId: vrNodePtr.toNode(objectId).getType(),
+                'name': lambda node, objectId: node.getName(),
+                'children': lambda node, objectId: vrdNode(node).getChildren(),
+                'ptr': lambda node, objectId: vrNodePtr.toNode(objectId),
+                'geometry': lambda node, objectId: vrdGeometryNode(node),
+            })
 
 
     def optimization_menu(self):
@@ -144,28 +348,46 @@ class VredVRTools(form, base):
             normal_Btn = QtWidgets.QPushButton('统一法线')
             normal_Btn.setIcon(self.get_icon('icon_normal.png'))
             normal_Btn.setIconSize(QtCore.QSize(32, 32))
-            normal_Btn.clicked.connect(self.unified_Normals)
+            normal_Btn.clicked.connect(self.profiled(self.unified_Normals))
 
             remove_symmetry_Btn = QtWidgets.QPushButton('分割对称对象')
             remove_symmetry_Btn.setIcon(self.get_icon('icon_stitch.png'))
             remove_symmetry_Btn.setIconSize(QtCore.QSize(32, 32))
-            remove_symmetry_Btn.clicked.connect(self.remove_symmetry)
+            remove_symmetry_Btn.clicked.connect(self.profiled(self.remove_symmetry))
 
             removeFace_Btn = QtWidgets.QPushButton('删除重复面')
             removeFace_Btn.setIcon(self.get_icon('icon_clear.png'))
             removeFace_Btn.setIconSize(QtCore.QSize(32, 32))
-            removeFace_Btn.clicked.connect(self.removeFace)
+            removeFace_Btn.clicked.connect(self.profiled(self.removeFace))
+
+            identical_Btn = QtWidgets.QPushButton('查找相同零件')
+            identical_Btn.setIcon(self.get_icon('icon_material_search.png'))
+            identical_Btn.setIconSize(QtCore.QSize(32, 32))
+            identical_Btn.clicked.connect(self.profiled(self.findIdenticalParts))
+
+            reshare_Btn = QtWidgets.QPushButton('重新共享几何体')
+            reshare_Btn.setIcon(self.get_icon('icon_merge.png'))
+            reshare_Btn.setIconSize(QtCore.QSize(32, 32))
+            reshare_Btn.clicked.connect(self.profiled(self.reshareCores))
 
             tessellation_Btn = QtWidgets.QPushButton('细分曲面')
             tessellation_Btn.setIcon(self.get_icon('icon_stitch.png'))
             tessellation_Btn.setIconSize(QtCore.QSize(32, 32))
-            tessellation_Btn.clicked.connect(self.tessellate_surfaces)
+            tessellation_Btn.clicked.connect(self.profiled(self.tessellate_surfaces))
+
+            lod_Btn = QtWidgets.QPushButton('生成LOD')
+            lod_Btn.setIcon(self.get_icon('icon_stitch.png'))
+            lod_Btn.setIconSize(QtCore.QSize(32, 32))
+            lod_Btn.clicked.connect(self.profiled(self.buildLods))
 
             VBoxLayout = QtWidgets.QVBoxLayout()
             VBoxLayout.addWidget(normal_Btn)
             VBoxLayout.addWidget(remove_symmetry_Btn)
             VBoxLayout.addWidget(removeFace_Btn)
+            VBoxLayout.addWidget(identical_Btn)
+            VBoxLayout.addWidget(reshare_Btn)
             VBoxLayout.addWidget(tessellation_Btn)
+            VBoxLayout.addWidget(lod_Btn)
 
             self.optimization_dialog = QtWidgets.QDialog(self)
             self.optimization_dialog.setLayout(VBoxLayout)
@@ -216,18 +438,7 @@ class VredVRTools(form, base):
     def tessellate_surfaces(self):
 
         def getBoundingBox(node):
-            return vrNodePtr.toNode(node.getObjectId()).getBoundingBox()
-
-        def compareBoundingBox(defaultBB, newBB, ToleranceValue):
-            min = []
-            max = []
-            for idx in range(0, 3):
-                min.append(defaultBB[idx] - ToleranceValue <= newBB[idx])
-            for idx in range(3, 6):
-                max.append(defaultBB[idx] + ToleranceValue >= newBB[idx])
-            # print(min + max)
-            if len(set(min + max)) != 1:
-                return True
+            return info.ptr(node).getBoundingBox()
 
         def setQuality(text):
             if text == '粗糙':
@@ -281,6 +492,20 @@ class VredVRTools(form, base):
             stitchingTolerance_LE.setValidator(Validator)
             stitchingTolerance_LE.setText('0.10')
             preserveUVs_checkBox = QtWidgets.QCheckBox('保留UV')
+
+            # 自适应细分：以上参数作为参考，按零件大小、屏幕重要度和三角形预算分配
+            adaptive_checkBox = QtWidgets.QCheckBox('自适应细分')
+            budget_label = QtWidgets.QLabel('三角形预算：')
+            budget_spinBox = QtWidgets.QSpinBox()
+            budget_spinBox.setRange(10000, 2000000000)
+            budget_spinBox.setSingleStep(100000)
+            budget_spinBox.setValue(self.tessellationBudget)
+            budget_spinBox.setEnabled(False)
+            adaptive_checkBox.toggled.connect(budget_spinBox.setEnabled)
+
+            # 增量细分：跳过上次细分后状态（含每个曲面的网格内容）和参数都未变化的零件
+            incremental_checkBox = QtWidgets.QCheckBox('增量细分（跳过未变化的零件）')
+            incremental_checkBox.setChecked(True)
             buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
 
             VBoxLayout = QtWidgets.QVBoxLayout()
@@ -296,6 +521,10 @@ class VredVRTools(form, base):
             VBoxLayout.addWidget(st_label)
             VBoxLayout.addWidget(stitchingTolerance_LE)
             VBoxLayout.addWidget(preserveUVs_checkBox)
+            VBoxLayout.addWidget(adaptive_checkBox)
+            VBoxLayout.addWidget(budget_label)
+            VBoxLayout.addWidget(budget_spinBox)
+            VBoxLayout.addWidget(incremental_checkBox)
             VBoxLayout.addWidget(buttonbox)
 
             dialog = QtWidgets.QDialog()
@@ -308,17 +537,21 @@ class VredVRTools(form, base):
 
             if res == dialog.Accepted:
 
+                # 记忆节点信息，避免重复转换节点
+                info = self.createNodeInfoCache()
+
                 # 遍历获取选中的所有几何体
                 process_nodes_vrdNode = []
                 for node in nodes:
                     allnodes = []
                     self.findGeosRecursive(vrdNode(node), allnodes, None)
                     process_nodes_vrdNode += allnodes
+                self.profiler.addNodes(len(process_nodes_vrdNode))
 
                 # 转换vrdNode到vrNodePtr
                 process_nodes = []
                 for node in process_nodes_vrdNode:
-                    vrNode = vrNodePtr.toNode(node.getObjectId())
+                    vrNode = info.ptr(node)
                     process_nodes.append(vrNode)
 
                 # 储存原始边界框信息
@@ -335,132 +568,696 @@ class VredVRTools(form, base):
                 stitchingTolerance = float(stitchingTolerance_LE.text())
                 preserveUVs = preserveUVs_checkBox.isChecked()
 
-                vrGeometryEditor.tessellateSurfaces(process_nodes, chordalDeviation, normalTolerance, maxChordLength,
-                                                    enableStitching,
-                                                    stitchingTolerance, preserveUVs)
+                # 上次细分的记录，场景未保存时只在本次会话中保留
+                cachefile = tessellationCache.cachePath(vrFileIO.getFileIOFilePath())
+                if self.tessellationRecords is None or self.tessellationRecords.path != cachefile:
+                    self.tessellationRecords = tessellationCache.TessellationCache(cachefile)
+                records = self.tessellationRecords
+                paths = [getNodePath(node) for node in process_nodes_vrdNode]
+                states = [self.tessellationState(node, bb) for node, bb in zip(process_nodes_vrdNode, defaultBBs)]
+
+                if adaptive_checkBox.isChecked():
+                    self.tessellationBudget = budget_spinBox.value()
+                    triangles = []
+                    for node, path, state in zip(process_nodes_vrdNode, paths, states):
+                        geo = vrdGeometryNode(node)
+                        count = geo.getPrimitiveCount() if geo.isValid() else 0
+                        # 未变化的零件按上次的弦偏离换算为参考弦偏离下的三角形数量
+                        previous = records.parameters(path, state)
+                        if previous is not None:
+                            count = count * previous[0] / chordalDeviation
+                        triangles.append(count)
+                    surfaceParameters = self.planTessellation(defaultBBs, triangles, self.tessellationBudget,
+                                                              chordalDeviation)
+                    if surfaceParameters is None:
+                        return
+                else:
+                    surfaceParameters = [(chordalDeviation, normalTolerance, maxChordLength)] * len(process_nodes)
+                parameters = [surface + (enableStitching, stitchingTolerance, preserveUVs)
+                              for surface in surfaceParameters]
+
+                # 只细分状态或参数发生变化的零件
+                if incremental_checkBox.isChecked():
+                    dirty = [idx for idx in range(len(process_nodes))
+                             if not records.isClean(paths[idx], states[idx], parameters[idx])]
+                else:
+                    dirty = list(range(len(process_nodes)))
+
+                # 参数相同的零件一次细分
+                groups = tessellationPlanner.groupByParameters([parameters[idx] for idx in dirty])
+                for parameter, indices in groups.items():
+                    vrGeometryEditor.tessellateSurfaces([process_nodes[dirty[idx]] for idx in indices], *parameter)
 
-                # 对比边界框，在原始边界框外的曲面都将被清除
+                # 收集细分后的曲面及其边界框，owners为所属几何体的序号
                 ToleranceValue = 1
-                for node in process_nodes:
-                    childnodes = vrdNode(node).getChildren()
-                    idx = process_nodes.index(node)
-                    default = defaultBBs[idx]
-                    # print(default)
-                    for childnode in childnodes:
-                        newBB = getBoundingBox(childnode)
-                        # print(newBB)
-                        if compareBoundingBox(default, newBB, ToleranceValue) == True:
+                childnodes = []
+                owners = []
+                newBBs = []
+                for idx in dirty:
+                    for childnode in info.children(process_nodes[idx]):
+                        childnodes.append(childnode)
+                        owners.append(idx)
+                        newBBs.append(getBoundingBox(childnode))
+
+                # 对比边界框，在原始边界框外的曲面都将被清除
+                outside = bboxCulling.outsideFlags(defaultBBs, owners, newBBs, ToleranceValue)
+                removeNodes = [childnode for childnode, flag in zip(childnodes, outside) if flag]
+
+                if removeNodes:
+                    vrUndoService.beginUndo()
+                    vrUndoService.beginMultiCommand("tessellate_cleanup")
+                    try:
+                        for childnode in removeNodes:
                             vrScenegraph.deleteNode(childnode, True)
-                            pass
+                    finally:
+                        vrUndoService.endMultiCommand()
+                        vrUndoService.endUndo()
+
+                # 记录细分后的状态，下次细分时用于判断零件是否变化
+                for idx in dirty:
+                    node = process_nodes_vrdNode[idx]
+                    records.update(paths[idx], self.tessellationState(node, info.ptr(node).getBoundingBox()),
+                                   parameters[idx])
+                try:
+                    records.save()
+                except OSError as e:
+                    print('tessellation records not saved: %s' % e)
+
+                print('tessellated %d parts in %d groups, skipped %d unchanged parts' % (
+                    len(dirty), len(groups), len(process_nodes) - len(dirty)))
+                print('removed %d of %d surfaces outside the original bounding boxes' % (len(removeNodes), len(childnodes)))
+                print(info.report())
 
         else:
             self._MessageBox('请选择对象！')
 
 
-    def removeFace(self):
+    def cameraPosition(self):
+        """
+        当前相机的世界坐标，无法获取时返回None
+        """
+        try:
+            camera = vrCameraService.getActiveCamera()
+            translation = camera.getWorldTransform().column(3)
+            return translation.x(), translation.y(), translation.z()
+        except Exception:
+            return None
+
+
+    def tessellationState(self, node, boundingBox):
+        """
+        零件的状态指纹：曲面名称和数量、每个曲面的网格内容哈希、图元数量、世界变换和边界框
+        """
+        geo = vrdGeometryNode(node)
+        primitiveCount = geo.getPrimitiveCount() if geo.isValid() else 0
+        try:
+            transform = list(node.getWorldTransform().data())
+        except Exception:
+            transform = []
+        children = node.getChildren()
+        surfaceNames = [child.getName() for child in children]
+        # 曲面形状改变后细分网格随之改变，名称和边界框不变的修改也能被发现
+        surfaceHashes = [self.geometryContentHash(geo)]
+        surfaceHashes.extend(self.geometryContentHash(vrdGeometryNode(child)) for child in children)
+        return tessellationCache.fingerprint(surfaceNames, surfaceHashes, primitiveCount, transform, boundingBox)
+
+
+    def planTessellation(self, boundingBoxes, triangles, budget, reference):
+        """
+        计算自适应细分参数，返回每个零件的 (弦偏离, 法线公差, 最大弦长)；
+        估算的三角形数量超出预算时询问是否继续，取消时返回None
+        Args:
+            boundingBoxes (list): 零件细分前的边界框
+            triangles (list of int): 零件当前的三角形数量
+            budget (int): 三角形总数预算
+            reference (float): 参考弦偏离
+        """
+        eye = self.cameraPosition()
+        diagonals = []
+        importances = []
+        for bb in boundingBoxes:
+            diagonal = ((bb[3] - bb[0]) ** 2 + (bb[4] - bb[1]) ** 2 + (bb[5] - bb[2]) ** 2) ** 0.5
+            center = ((bb[0] + bb[3]) / 2.0, (bb[1] + bb[4]) / 2.0, (bb[2] + bb[5]) / 2.0)
+            diagonals.append(diagonal)
+            importances.append(tessellationPlanner.importance(center, diagonal, eye))
+
+        parameters, estimate = tessellationPlanner.planParameters(diagonals, triangles, budget, reference, importances)
+        print('adaptive tessellation: %d parts, estimated %d triangles (budget %d)' % (
+            len(parameters), estimate, budget))
+
+        if estimate > budget:
+            msgBox = QtWidgets.QMessageBox()
+            msgBox.setWindowTitle("VredVRTools")
+            msgBox.setInformativeText('估算三角形数量超出预算：\n'
+                                      '估算 %d / 预算 %d\n是否继续细分？' % (estimate, budget))
+            msgBox.setStandardButtons(QtWidgets.QMessageBox.Ok | QtWidgets.QMessageBox.Cancel)
+            if msgBox.exec_() != QtWidgets.QMessageBox.Ok:
+                return None
+        return parameters
+
+
+    def buildLods(self):
+        """
+        为选中对象下的几何体生成LOD：原始几何体为第0级，其余级别为克隆后按细分预设重新细分的几何体，
+        放在LOD节点下，由VRED按与相机的距离切换
+        """
+        nodes = vrScenegraph.getSelectedNodes()
+        if len(nodes) == 0:
+            self._MessageBox('请选择对象！')
+            return
+
+        levels_label = QtWidgets.QLabel('级别数量（含原始几何体）：')
+        levels_spinBox = QtWidgets.QSpinBox()
+        levels_spinBox.setRange(2, lodPlanner.MAX_LEVELS)
+        levels_spinBox.setValue(3)
+
+        scale_label = QtWidgets.QLabel('切换距离系数：')
+        scale_spinBox = QtWidgets.QDoubleSpinBox()
+        scale_spinBox.setRange(0.1, 10.0)
+        scale_spinBox.setSingleStep(0.1)
+        scale_spinBox.setValue(1.0)
+
+        decore_checkBox = QtWidgets.QCheckBox('粗糙级别去除内部面')
+        decore_checkBox.setChecked(True)
+        buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+
+        VBoxLayout = QtWidgets.QVBoxLayout()
+        VBoxLayout.addWidget(levels_label)
+        VBoxLayout.addWidget(levels_spinBox)
+        VBoxLayout.addWidget(scale_label)
+        VBoxLayout.addWidget(scale_spinBox)
+        VBoxLayout.addWidget(decore_checkBox)
+        VBoxLayout.addWidget(buttonbox)
+
+        dialog = QtWidgets.QDialog()
+        dialog.setLayout(VBoxLayout)
+        dialog.setWindowTitle('生成LOD')
+        buttonbox.accepted.connect(dialog.accept)
+        buttonbox.rejected.connect(dialog.reject)
+
+        if dialog.exec_() != dialog.Accepted:
+            return
+
+        count = levels_spinBox.value()
+        scale = scale_spinBox.value()
+        levels = lodPlanner.planLevels(count, decore_checkBox.isChecked())
+
+        # 收集选中对象下的几何体，已经在LOD节点下的几何体不再处理；
+        # 没有NURBS曲面的几何体无法重新细分，生成的级别与原始网格相同，只会增加内存，跳过
+        info = self.createNodeInfoCache()
+        parts = []
+        skipped = 0
+        for node in nodes:
+            allnodes = []
+            self.findGeosRecursive(vrdNode(node), allnodes, None)
+            for geonode in allnodes:
+                part = info.ptr(geonode)
+                if part.getParent().getType() == 'LOD':
+                    continue
+                if not any(info.type(child) == 'Surface' for child in info.children(geonode)):
+                    skipped += 1
+                    continue
+                parts.append(part)
+        self.profiler.addNodes(len(parts) + skipped)
+
+        # 每个级别的克隆，同一级别一次细分
+        levelNodes = [[] for level in levels]
+        vrUndoService.beginUndo()
+        vrUndoService.beginMultiCommand("build_lod")
+        try:
+            for part in parts:
+                name = part.getName()
+                parent = part.getParent()
+                bb = part.getBoundingBox()
+                lod = vrScenegraph.createNode('LOD', name + '_LOD', parent)
+                vrScenegraph.moveNode(part, parent, lod)
+                for level, clones in zip(levels, levelNodes):
+                    # 克隆插入在原始几何体旁边（LOD节点下），不在其他位置时才移动
+                    clone = vrScenegraph.cloneNode(part, True)
+                    cloneParent = clone.getParent()
+                    if cloneParent.getID() != lod.getID():
+                        vrScenegraph.moveNode(clone, cloneParent, lod)
+                    # 解除共享，避免重新细分影响原始几何体
+                    vrNodeUtils.unshareCores(clone)
+                    clone.setName(name + level.suffix)
+                    clones.append(clone)
+                self.setLodRanges(lod, bb, lodPlanner.switchRanges(
+                    ((bb[3] - bb[0]) ** 2 + (bb[4] - bb[1]) ** 2 + (bb[5] - bb[2]) ** 2) ** 0.5, count, scale))
+
+            for level, clones in zip(levels, levelNodes):
+                if not clones:
+                    continue
+                chordalDeviation, normalTolerance, maxChordLength = level.parameters
+                vrGeometryEditor.tessellateSurfaces(clones, chordalDeviation, normalTolerance, maxChordLength,
+                                                    True, 0.1, True)
+                if level.decore is not None:
+                    resolution, qualitySteps = level.decore
+                    settings = vrdDecoreSettings()
+                    settings.setResolution(resolution)
+                    settings.setQualitySteps(qualitySteps)
+                    settings.setCorrectFaceNormals(True)
+                    settings.setDecoreEnabled(True)
+                    settings.setSubObjectMode(vrGeometryTypes.DecoreSubObjectMode.Components)
+                    settings.setTransparentObjectMode(vrGeometryTypes.DecoreTransparentObjectMode.Ignore)
+                    # 各零件在运行时独立切换级别，每个零件单独去除内部面，不能被其他零件遮挡而删除
+                    for clone in clones:
+                        vrDecoreService.decore([vrdNode(clone)], True, settings)
+        finally:
+            vrUndoService.endMultiCommand()
+            vrUndoService.endUndo()
+
+        print('built %d LOD nodes with %d levels' % (len(parts), count))
+        print(info.report())
+        if skipped:
+            self._MessageBox('已生成LOD：' + str(len(parts)) + ' 个\n跳过没有NURBS曲面、无法重新细分的几何体：' + str(skipped) + ' 个')
+
+
+    def setLodRanges(self, lod, boundingBox, ranges):
+        """
+        设置LOD节点的切换距离和中心点（零件边界框中心）
+        """
+        fields = lod.fields()
+        fields.setMReal32('range', ranges)
+        fields.setVec3f('center', (boundingBox[0] + boundingBox[3]) / 2.0, (boundingBox[1] + boundingBox[4]) / 2.0,
+                        (boundingBox[2] + boundingBox[5]) / 2.0)
+
+
+    def removeDuplicateFaces(self, geonodes, tolerance, useVertexHash):
         """
-        删除几何体下的重复面
+        删除几何体下的重复面，返回删除数量
         """
-        def remove_face(node):
+        def signature(child, useVertexHash):
             """
-            删除几何体的重复面
+            计算面的签名：中心点、边界框尺寸、图元数量和可选的顶点哈希
+            """
+            BBC = vrNodeUtils.getBoundingBoxCenter(child, True)
+            bx = vrNodePtr.toNode(child.getObjectId()).getBoundingBox()
+            extents = (bx[3] - bx[0], bx[4] - bx[1], bx[5] - bx[2])
+
+            primitiveCount = None
+            hashValue = None
+            geo = vrdGeometryNode(child)
+            if geo.isValid():
+                primitiveCount = geo.getPrimitiveCount()
+                if useVertexHash:
+                    hashValue = self.geometryContentHash(geo)
+
+            return duplicateFaces.FaceSignature((BBC.x(), BBC.y(), BBC.z()), extents, primitiveCount, hashValue)
+
+        def remove_face(node, tolerance, useVertexHash):
+            """
+            删除几何体的重复面，每组重复面保留最后一个，返回删除数量
             """
             selnodes = vrdNode(node).getChildren()
-            center_item = []
-            for node in selnodes:
-                BBC = vrNodeUtils.getBoundingBoxCenter(node, True)
-
-                center_item.append((BBC.x(), BBC.y(), BBC.z()))
-
-            set_item = set(center_item)
-
-            for center in set_item:
-                index = [i for i, val in enumerate(center_item) if val == center]
-                if len(index) > 1:
-                    PCounts = []
-                    for i in index:
-                        PCounts.append(vrdGeometryNode(vrdNode(node)).getPrimitiveCount())
-                    if len(set(PCounts)) == 1:
-                        index.pop()
-                        for idx in index:
-                            vrScenegraph.deleteNode(selnodes[idx], True)
-
-        node = vrScenegraph.getSelectedNode()
-        if node.getType() == 'Geometry':
-            remove_face(node)
-        else:
+            signatures = [signature(child, useVertexHash) for child in selnodes]
+
+            removed = 0
+            for group in duplicateFaces.findDuplicates(signatures, tolerance):
+                for idx in group[:-1]:
+                    vrScenegraph.deleteNode(selnodes[idx], True)
+                    removed += 1
+            return removed
+
+        self.profiler.addNodes(len(geonodes))
+        removed = 0
+        for geonode in geonodes:
+            removed += remove_face(geonode, tolerance, useVertexHash)
+        return removed
+
+
+    def removeFace(self):
+        """
+        删除选中几何体下的重复面
+        """
+        # 收集选中对象下的所有几何体
+        geonodes = []
+        for node in vrScenegraph.getSelectedNodes():
+            self.findGeosRecursive(vrdNode(node), geonodes, None)
+
+        if len(geonodes) == 0:
             self._MessageBox('请选择几何体！')
-        pass
+            return
+
+        tolerance_label = QtWidgets.QLabel('位置容差（单位mm）：')
+        tolerance_LE = QtWidgets.QLineEdit()
+        # 公差不能为负数
+        validator = QtGui.QDoubleValidator()
+        validator.setBottom(0)
+        tolerance_LE.setValidator(validator)
+        tolerance_LE.setText('0.001')
+        vertexHash_checkBox = QtWidgets.QCheckBox('比较顶点数据')
+        buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+
+        VBoxLayout = QtWidgets.QVBoxLayout()
+        VBoxLayout.addWidget(tolerance_label)
+        VBoxLayout.addWidget(tolerance_LE)
+        VBoxLayout.addWidget(vertexHash_checkBox)
+        VBoxLayout.addWidget(buttonbox)
+
+        dialog = QtWidgets.QDialog()
+        dialog.setLayout(VBoxLayout)
+        dialog.setWindowTitle('删除重复面')
+        buttonbox.accepted.connect(dialog.accept)
+        buttonbox.rejected.connect(dialog.reject)
+
+        if dialog.exec_() != dialog.Accepted:
+            return
+
+        # 输入框可能停留在 '-'、'.' 等中间状态
+        try:
+            tolerance = float(tolerance_LE.text() or 0)
+        except ValueError:
+            self._MessageBox('公差无效！')
+            return
+        if tolerance < 0:
+            self._MessageBox('公差不能为负数！')
+            return
+        useVertexHash = vertexHash_checkBox.isChecked()
+
+        vrUndoService.beginUndo()
+        vrUndoService.beginMultiCommand("removeFace")
+        try:
+            removed = self.removeDuplicateFaces(geonodes, tolerance, useVertexHash)
+        finally:
+            vrUndoService.endMultiCommand()
+            vrUndoService.endUndo()
+
+        self._MessageBox('已删除重复面：' + str(removed))
+
+
+    def geometryContentHash(self, geo):
+        """
+        按块读取顶点和索引缓冲区，计算几何体内容哈希
+        """
+        if not geo.isValid():
+            return None
+        return geometryHash.contentHash(geo.getPositions(), geo.getIndices())
+
+
+    def scanIdenticalParts(self):
+        """
+        按内容哈希对选中对象下的几何体分组，返回 (选中节点, 全部几何体, 相同零件分组)
+        """
+        nodes = vrScenegraph.getSelectedNodes()
+        geonodes = []
+        for node in nodes:
+            self.findGeosRecursive(vrdNode(node), geonodes, None)
+        self.profiler.addNodes(len(geonodes))
+
+        self._pbar.reset()
+        hashes = {}
+        for geonode in geonodes:
+            hashes[geonode.getObjectId()] = self.geometryContentHash(geonode)
+            self._pbar.setValue(len(hashes) / len(geonodes) * 100)
+        self._pbar.reset()
+
+        groups = geometryHash.groupIdentical(geonodes, lambda geonode: hashes[geonode.getObjectId()])
+        return nodes, geonodes, groups
+
+
+    def findIdenticalParts(self):
+        """
+        查找并选择内容完全相同的几何体
+        """
+        nodes, geonodes, groups = self.scanIdenticalParts()
+        if len(nodes) == 0:
+            self._MessageBox('请选择对象！')
+            return
+
+        selnodes = []
+        for group in groups:
+            for geonode in group:
+                selnodes.append(vrNodePtr.toNode(geonode.getObjectId()))
+        vrScenegraph.selectNodes(selnodes)
+
+        self._MessageBox('找到相同零件：' + str(len(groups)) + ' 组，共 ' + str(len(selnodes)) + ' 个')
+
+
+    def countCores(self, geonodes):
+        """
+        统计几何体实际使用的独立几何数据数量，互为克隆（共享几何数据）的几何体只计一次
+        """
+        ids = set(geonode.getObjectId() for geonode in geonodes)
+        counted = set()
+        cores = 0
+        for geonode in geonodes:
+            objectId = geonode.getObjectId()
+            if objectId in counted:
+                continue
+            cores += 1
+            counted.add(objectId)
+            for clone in vrNodeService.getClones(geonode):
+                cloneId = clone.getObjectId()
+                if cloneId in ids:
+                    counted.add(cloneId)
+        return cores
+
+
+    def reshareCores(self):
+        """
+        重新共享内容相同的几何体，与合并时的清除共享关系相反
+        """
+        nodes, geonodes, groups = self.scanIdenticalParts()
+        if len(nodes) == 0:
+            self._MessageBox('请选择对象！')
+            return
+        if len(groups) == 0:
+            self._MessageBox('没有找到相同零件！')
+            return
+
+        # 内容哈希只用于判断是否值得共享，结果按共享前后实际的独立几何数据数量报告
+        before = self.countCores(geonodes)
+        vrUndoService.beginUndo()
+        vrUndoService.beginMultiCommand("reshareCores")
+        try:
+            for node in nodes:
+                vrOptimize.shareGeometries(node)
+        finally:
+            vrUndoService.endMultiCommand()
+            vrUndoService.endUndo()
+        after = self.countCores(geonodes)
+
+        duplicates = sum(len(group) - 1 for group in groups)
+        self._MessageBox('已重新共享几何体：独立几何数据 ' + str(before) + ' → ' + str(after) + '，减少 ' +
+                         str(before - after) + ' 个\n内容相同的零件：' + str(len(groups)) + ' 组，' +
+                         str(duplicates) + ' 个可共享')
 
 
     def unified_Normals(self):
-        settings = vrdDecoreSettings()
-        settings.setResolution(1024)
-        settings.setQualitySteps(8)
-        settings.setCorrectFaceNormals(True)
-        settings.setDecoreEnabled(False)
-        settings.setSubObjectMode(vrGeometryTypes.DecoreSubObjectMode.Components)
-        settings.setTransparentObjectMode(vrGeometryTypes.DecoreTransparentObjectMode.Ignore)
+
+        def createSettings(resolution, qualitySteps):
+            settings = vrdDecoreSettings()
+            settings.setResolution(resolution)
+            settings.setQualitySteps(qualitySteps)
+            settings.setCorrectFaceNormals(True)
+            settings.setDecoreEnabled(False)
+            settings.setSubObjectMode(vrGeometryTypes.DecoreSubObjectMode.Components)
+            settings.setTransparentObjectMode(vrGeometryTypes.DecoreTransparentObjectMode.Ignore)
+            return settings
+
         treatAsCombinedObject = True
 
         nodesToDecore = vrNodeService.getSelectedNodes()
-
-        if nodesToDecore != []:
-            vrDecoreService.decore(nodesToDecore, treatAsCombinedObject, settings)
-        else:
+        if nodesToDecore == []:
             self._MessageBox('请选择对象！')
+            return
+
+        resolution_label = QtWidgets.QLabel('分辨率：')
+        resolution_comboBox = QtWidgets.QComboBox()
+        resolution_comboBox.addItems(['256', '512', '1024', '2048', '4096'])
+        resolution_comboBox.setCurrentIndex(2)
+
+        qualitySteps_label = QtWidgets.QLabel('质量级数：')
+        qualitySteps_spinBox = QtWidgets.QSpinBox()
+        qualitySteps_spinBox.setRange(1, 32)
+        qualitySteps_spinBox.setValue(8)
+
+        # 分批：按空间位置和图元数量分组，每组按尺寸选择分辨率
+        batch_checkBox = QtWidgets.QCheckBox('分批处理（按组自动选择分辨率）')
+        batchSize_label = QtWidgets.QLabel('每批最大图元数量：')
+        batchSize_spinBox = QtWidgets.QSpinBox()
+        batchSize_spinBox.setRange(10000, 100000000)
+        batchSize_spinBox.setSingleStep(100000)
+        batchSize_spinBox.setValue(self.decoreBatchSize)
+        cellSize_label = QtWidgets.QLabel('每像素长度（mm）：')
+        cellSize_spinBox = QtWidgets.QDoubleSpinBox()
+        cellSize_spinBox.setRange(0.1, 100.0)
+        cellSize_spinBox.setValue(self.decoreCellSize)
+        for widget in (batchSize_spinBox, cellSize_spinBox):
+            widget.setEnabled(False)
+            batch_checkBox.toggled.connect(widget.setEnabled)
+        batch_checkBox.toggled.connect(lambda checked: resolution_comboBox.setEnabled(not checked))
+        buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
 
+        VBoxLayout = QtWidgets.QVBoxLayout()
+        VBoxLayout.addWidget(resolution_label)
+        VBoxLayout.addWidget(resolution_comboBox)
+        VBoxLayout.addWidget(qualitySteps_label)
+        VBoxLayout.addWidget(qualitySteps_spinBox)
+        VBoxLayout.addWidget(batch_checkBox)
+        VBoxLayout.addWidget(batchSize_label)
+        VBoxLayout.addWidget(batchSize_spinBox)
+        VBoxLayout.addWidget(cellSize_label)
+        VBoxLayout.addWidget(cellSize_spinBox)
+        VBoxLayout.addWidget(buttonbox)
 
-    def mergeSelGeos(self):
+        dialog = QtWidgets.QDialog()
+        dialog.setLayout(VBoxLayout)
+        dialog.setWindowTitle('统一法线')
+        buttonbox.accepted.connect(dialog.accept)
+        buttonbox.rejected.connect(dialog.reject)
 
+        if dialog.exec_() != dialog.Accepted:
+            return
 
+        qualitySteps = qualitySteps_spinBox.value()
+        if not batch_checkBox.isChecked():
+            vrDecoreService.decore(nodesToDecore, treatAsCombinedObject,
+                                   createSettings(int(resolution_comboBox.currentText()), qualitySteps))
+            return
 
+        self.decoreBatchSize = batchSize_spinBox.value()
+        self.decoreCellSize = cellSize_spinBox.value()
+        finished = self.decoreBatches(nodesToDecore, self.decoreBatchSize, self.decoreCellSize, qualitySteps,
+                                      createSettings)
+        self._MessageBox('统一法线完成！' if finished else '统一法线已取消，已完成的分组保留！')
 
-        # 用于处理所有合并节点的函数，保留次级结构
-        def mergeALLNodes(node, CurrentNodeCount, AllCount):
 
-            # 清除变换信息
-            vrOptimize.flushTransformations(node)
+    def decoreBatches(self, nodes, batchSize, cellSize, qualitySteps, createSettings):
+        """
+        将选中对象下的几何体按空间位置分为图元数量接近的若干组，逐组去除内部面，记录每组耗时
+        Args:
+            nodes (list): 选中的vrdNode
+            batchSize (int): 每组最大图元数量
+            cellSize (float): 每像素对应的长度，用于按组的尺寸选择分辨率
+            qualitySteps (int): 质量级数
+            createSettings (function): createSettings(resolution, qualitySteps)->vrdDecoreSettings
+        Returns:
+            bool: 全部完成返回True，中途取消返回False
+        """
+        info = self.createNodeInfoCache()
+        parts = []
+        for node in nodes:
+            allnodes = []
+            self.findGeosRecursive(node, allnodes, None)
+            parts += allnodes
+        self.profiler.addNodes(len(parts))
+        if not parts:
+            return True
+
+        boxes = [info.ptr(part).getBoundingBox() for part in parts]
+        weights = []
+        for part in parts:
+            geo = vrdGeometryNode(part)
+            weights.append(max(geo.getPrimitiveCount() if geo.isValid() else 0, 1))
+
+        groups = []
+        for indices in decoreBatches.splitGroups(boxes, weights, batchSize):
+            resolution = decoreBatches.resolutionFor(decoreBatches.extentOf(decoreBatches.groupBounds(boxes, indices)),
+                                                     cellSize)
+            groups.append((indices, sum(weights[idx] for idx in indices), resolution))
+
+        # 按历史耗时估算总时间
+        history = decoreBatches.TimingHistory(decoreBatches.historyPath())
+        estimates = [history.estimate(primitives, resolution, qualitySteps) for indices, primitives, resolution in groups]
+        message = '去除内部面：%d 组' % len(groups)
+        if None not in estimates:
+            message += '，预计 %.1f 分钟' % (sum(estimates) / 60.0)
+        print(message)
+
+        progressDialog = QtWidgets.QProgressDialog(message, '取消', 0, len(groups), self)
+        progressDialog.setWindowTitle('统一法线')
+        progressDialog.setWindowModality(QtCore.Qt.WindowModal)
+        progressDialog.setMinimumDuration(0)
+
+        def decoreJobs():
+            for groupIdx, (indices, primitives, resolution) in enumerate(groups):
+
+                def decoreGroup(indices=indices, primitives=primitives, resolution=resolution):
+                    start = time.perf_counter()
+                    vrDecoreService.decore([parts[idx] for idx in indices], True, createSettings(resolution, qualitySteps))
+                    history.add(primitives, resolution, qualitySteps, time.perf_counter() - start)
+
+                yield ('decore group %d (%d parts, %d primitives, %d px)' % (
+                    groupIdx, len(indices), primitives, resolution), decoreGroup)
+
+        # 每组完成后更新进度并处理界面事件，取消时在当前组完成后停止
+        runner = jobScheduler.ChunkedJobRunner(decoreJobs(), 0, QtWidgets.QApplication.processEvents,
+                                               progressDialog.setValue)
+        progressDialog.canceled.connect(runner.cancel)
 
-            nodes = []
-            nodes = vrdNode(node).getChildren()
+        vrUndoService.beginUndo()
+        vrUndoService.beginMultiCommand("decoreBatches")
+        try:
+            finished = runner.run()
+        finally:
+            vrUndoService.endMultiCommand()
+            vrUndoService.endUndo()
+            progressDialog.close()
+            try:
+                history.save()
+            except OSError as e:
+                print('decore history not saved: %s' % e)
 
-            # 初始化进度
-            nodeprocess = 0
+        print(runner.report())
+        self.lastJobTimings = runner.timings
+        return finished
 
-            for child in nodes:
-                if vrNodePtr.toNode(child.getObjectId()).getType() != "Geometry":
-                    # 合并几何体
-                    mergeGeos(child)
 
-                    # 移动合并后的几何体到根组节点
-                    for eachgeo in child.getChildren():
-                        vrScenegraph.moveNode(eachgeo, child, node)
+    def mergeSelGeos(self):
 
-                    # 清除无用节点
-                    # deleteNoneNode(child)
+        # 将合并拆分为按子树执行的小任务，保留次级结构
+        def mergeJobs(roots):
+            for rootIdx, node in enumerate(roots):
 
+                def prepare(node=node):
+                    # 清除共享关系
+                    vrNodeUtils.unshareCores(node)
+                    # 清除变换信息
+                    vrOptimize.flushTransformations(node)
 
+                yield ('prepare ' + node.getName(), prepare)
 
-                # 计算当前进度
-                nodeprocess += 1
+                nodes = info.children(node)
+                self.profiler.addNodes(len(nodes))
+                state['current'] = rootIdx
+                state['children'] = len(nodes)
 
-                if AllCount == 1:
-                    currentpersent = nodeprocess / len(nodes)
-                else:
-                    currentpersent = (CurrentNodeCount / AllCount) + (nodeprocess / len(nodes)) * (1 / AllCount)
+                for childIdx, child in enumerate(nodes):
+                    if not info.isGeometry(child):
+                        yield ('merge ' + info.name(child), lambda node=node, child=child: mergeChild(node, child))
+                    state['done'] = childIdx + 1
 
-                self._pbar.setValue(currentpersent * 100)
+                # 清除无用节点
+                yield ('cleanup ' + node.getName(), lambda node=node: deleteNoneNode(node))
 
-            # 清除无用节点
-            deleteNoneNode(node)
+        # 合并子节点下的几何体，并移动到根组节点
+        def mergeChild(node, child):
+            # 合并几何体
+            mergeGeos(child)
+
+            # 移动合并后的几何体到根组节点
+            for eachgeo in child.getChildren():
+                vrScenegraph.moveNode(eachgeo, child, node)
+
+        # 计算当前进度
+        def updateProgress(jobCount):
+            AllCount = len(roots)
+            if state['children'] == 0:
+                currentpersent = (state['current'] + 1) / AllCount
+            else:
+                currentpersent = (state['current'] + state['done'] / state['children']) / AllCount
+            self._pbar.setValue(currentpersent * 100)
+            progressDialog.setValue(currentpersent * 100)
 
         # 用于清除无用节点的函数
         def deleteNoneNode(node):
-            allnodes = vrdNode(node).getChildren()
+            # 子节点已发生变化，重新获取子节点，已知类型的节点直接使用缓存
+            info.invalidate(node)
+            allnodes = info.children(node)
 
             for child in allnodes:
-                if vrNodePtr.toNode(child.getObjectId()).getType() != "Geometry":
+                if not info.isGeometry(child):
                     vrScenegraph.deleteNode(child, True)
 
 
@@ -499,23 +1296,46 @@ class VredVRTools(form, base):
 
             self._pbar.reset()
 
+            # 记忆节点信息，避免重复转换节点
+            info = self.createNodeInfoCache()
 
-            nodeprocess = 0
+            # 去掉被其他选中节点包含的节点，得到互不相关的子树
+            roots = sceneTraversal.topLevelNodes(
+                nodes,
+                lambda node: node.getParent() if node.getParent().isValid() else None,
+                lambda node: node.getID())
 
-            for node in nodes:
-                # 清除共享关系
-                vrNodeUtils.unshareCores(node)
+            state = {'current': 0, 'children': 0, 'done': 0}
 
-                nodeprocess += 1
+            progressDialog = QtWidgets.QProgressDialog('合并中...', '取消', 0, 100, self)
+            progressDialog.setWindowTitle('合并')
+            progressDialog.setWindowModality(QtCore.Qt.WindowModal)
+            progressDialog.setMinimumDuration(0)
 
-                # 合并几何体
-                mergeALLNodes(node, nodeprocess, len(nodes))
+            runner = jobScheduler.ChunkedJobRunner(mergeJobs(roots), 0.1, QtWidgets.QApplication.processEvents, updateProgress)
+            progressDialog.canceled.connect(runner.cancel)
 
-            print("done merge")
+            # 整个合并作为一个撤销步骤，取消时撤销已完成的部分
+            vrUndoService.beginUndo()
+            vrUndoService.beginMultiCommand("mergeSelGeos")
+            try:
+                finished = runner.run()
+            finally:
+                vrUndoService.endMultiCommand()
+                vrUndoService.endUndo()
+                progressDialog.close()
+
+            print("done merge" if finished else "merge cancelled")
+            print(runner.report())
+            print(info.report())
+            self.lastJobTimings = runner.timings
             self._pbar.reset()
 
-
-            self._MessageBox("合并完成！")
+            if finished:
+                self._MessageBox("合并完成！")
+            else:
+                vrUndoService.undo()
+                self._MessageBox("合并已取消！")
         else:
             self._MessageBox("请选择对象！")
 
@@ -534,12 +1354,12 @@ class VredVRTools(form, base):
             ue_rename_Btn = QtWidgets.QPushButton('覆盖 - 重命名')
             ue_rename_Btn.setIcon(self.get_icon('icon_rename.png'))
             ue_rename_Btn.setIconSize(QtCore.QSize(32, 32))
-            ue_rename_Btn.clicked.connect(self.renameDefault)
+            ue_rename_Btn.clicked.connect(self.profiled(self.renameDefault))
 
             ue_rename_change_Btn = QtWidgets.QPushButton('修改 - 重命名')
             ue_rename_change_Btn.setIcon(self.get_icon('icon_rename.png'))
             ue_rename_change_Btn.setIconSize(QtCore.QSize(32, 32))
-            ue_rename_change_Btn.clicked.connect(self.renameChange)
+            ue_rename_change_Btn.clicked.connect(self.profiled(self.renameChange))
 
             datasmith_Btn = QtWidgets.QPushButton('导出Datasmith')
             datasmith_Btn.setIcon(self.get_icon('icon_export.png'))
@@ -577,59 +1397,57 @@ class VredVRTools(form, base):
     def import_UEMaterial(self):
 
         def import_material():
-            ue_Materials = []
-
             filedialog = QtWidgets.QFileDialog()
-            self.fileopenpath = \
+            fileopenpath = \
             filedialog.getOpenFileName(self, '导入UE材质表', os.path.join(os.path.expanduser("~"), 'Desktop'), 'CSV(*.csv)')[
                 0]
 
-            if os.path.exists(self.fileopenpath):
-                encodes = ['UTF-8', 'UTF-16']
-                i = 0
-                while i < len(encodes):
-                    try:
-                        with open(self.fileopenpath, 'r', encoding=encodes[i]) as csvfile:
-                            reader = csv.reader(csvfile)
-                            for row in reader:
-                                ue_Materials += [row[1]]
-                            ue_Materials.pop(0)
-                        break
-                    except:
-                        i += 1
-                        if i > len(encodes):
-                            self.fileopenpath = ''
-                            self._MessageBox('导入出错！')
+            if os.path.exists(fileopenpath):
+                # 流式读取第二列（材质名称），自动判断编码，跳过格式错误的行
+                stats = csvLoader.LoadStats()
+                try:
+                    ue_Materials = csvLoader.loadColumn(fileopenpath, 1, True, None, stats)
+                except (OSError, LookupError) as e:
+                    self._MessageBox('导入出错！\n' + str(e))
+                    return
+
+                print('%s: %s, %d rows, %d skipped, %d duplicates' % (
+                    os.path.basename(fileopenpath), stats.encoding, stats.rows, stats.skipped, stats.duplicates))
 
+                if not ue_Materials:
+                    self._MessageBox('导入出错！\n文件中没有材质名称')
+                    return
+
+                self.fileopenpath = fileopenpath
                 ue_import_label.setText(os.path.basename(self.fileopenpath))
 
                 self.materialList = ue_Materials
+                self.materialTags.setNames(self.materialList)
 
-                listview.clear()
+                model.setNames(self.materialList)
 
-                listview.addItems(self.materialList)
+                if stats.skipped:
+                    self._MessageBox('已导入 ' + str(len(ue_Materials)) + ' 个材质，跳过格式错误的行：' + str(stats.skipped))
 
         def rename():
 
             tag = '未重命名材质'
 
-            if self.selmats and listview.currentItem():
+            name = model.name(listview.currentIndex())
+            if self.selmats and name:
                 for selmat in self.selmats:
-                    selmat.setName(listview.currentItem().text())
+                    selmat.setName(name)
                     preview_name.setText(selmat.getName())
 
                     oldmat = vrMaterialPtr.toMaterial(selmat.getObjectId())
                     vrMaterialPtr.removeMaterialTag(oldmat, tag)
 
-                self.renamed_item.append(listview.currentItem())
-                hide_renamed()
+                model.markRenamed([name])
 
 
 
         def update_search():
-            for i in range(listview.count()):
-                item = listview.item(i)
-                item.setHidden(ue_searchbar.text().lower() not in item.text().lower() or hide_checkBox.isChecked() and item in self.renamed_item)
+            model.setFilter(ue_searchbar.text(), hide_checkBox.isChecked())
 
         def receivedMessage(message_id, args):
             # Listen specifically to the SELECTED CAMERA message
@@ -664,21 +1482,32 @@ class VredVRTools(form, base):
             self.ue_material = None
 
         def hide_renamed():
-            if hide_checkBox.isChecked() == True:
-                for i in range(listview.count()):
-                    item = listview.item(i)
-                    item.setHidden(item in self.renamed_item or ue_searchbar.text().lower() not in item.text().lower())
-            if hide_checkBox.isChecked() == False:
-                for i in range(listview.count()):
-                    item = listview.item(i)
-                    item.setHidden(False or ue_searchbar.text().lower() not in item.text().lower())
+            searchTimer.stop()
+            update_search()
 
         def tag_material():
             tag = '未重命名材质'
-            for mat in vrMaterialService.getAllMaterials():
-                if mat.getName() not in self.materialList:
-                    oldmat = vrMaterialPtr.toMaterial(mat.getObjectId())
-                    vrMaterialPtr.addMaterialTag(oldmat, tag)
+
+            # 与材质实际的标记状态比较，只修改需要改变的材质
+            mats = vrMaterialPtr.getAllMaterials()
+            toTag, toUntag = self.materialTags.update(mats, lambda mat: mat.getName(),
+                                                      lambda mat: vrMaterialPtr.hasMaterialTag(mat, tag))
+            self.profiler.addNodes(len(mats))
+
+            vrUndoService.beginUndo()
+            vrUndoService.beginMultiCommand("tag_material")
+            try:
+                for mat in toTag:
+                    vrMaterialPtr.addMaterialTag(mat, tag)
+                for mat in toUntag:
+                    vrMaterialPtr.removeMaterialTag(mat, tag)
+            finally:
+                vrUndoService.endMultiCommand()
+                vrUndoService.endUndo()
+
+            tagged, untagged, touched, skipped = self.materialTags.report()
+            self._MessageBox('未重命名材质：' + str(tagged) + '\n已重命名材质：' + str(untagged) +
+                             '\n本次修改：' + str(touched) + '\n未变化跳过：' + str(skipped))
 
 
 
@@ -693,26 +1522,39 @@ class VredVRTools(form, base):
             ue_importMaterial_Btn = QtWidgets.QPushButton('导入UE材质表')
             ue_importMaterial_Btn.setIcon(self.get_icon('icon_export.png'))
             ue_importMaterial_Btn.setIconSize(QtCore.QSize(32, 32))
-            ue_importMaterial_Btn.clicked.connect(import_material)
+            ue_importMaterial_Btn.clicked.connect(lambda: self.profiler.run('import_material', import_material))
 
             ue_tagMaterial_Btn = QtWidgets.QPushButton('标记未重命名材质')
             ue_tagMaterial_Btn.setIcon(self.get_icon('icon_material.png'))
             ue_tagMaterial_Btn.setIconSize(QtCore.QSize(32, 32))
-            ue_tagMaterial_Btn.clicked.connect(tag_material)
+            ue_tagMaterial_Btn.clicked.connect(lambda: self.profiler.run('tag_material', tag_material))
 
             ue_rename_Btn = QtWidgets.QPushButton('重命名材质')
             ue_rename_Btn.setIcon(self.get_icon('icon_rename.png'))
             ue_rename_Btn.setIconSize(QtCore.QSize(32, 32))
             ue_rename_Btn.clicked.connect(rename)
 
+            ue_suggest_Btn = QtWidgets.QPushButton('自动匹配建议')
+            ue_suggest_Btn.setIcon(self.get_icon('icon_material_search.png'))
+            ue_suggest_Btn.setIconSize(QtCore.QSize(32, 32))
+            ue_suggest_Btn.clicked.connect(lambda: self.profiler.run('suggestMaterials', self.suggestMaterials, model))
+
             ue_searchbar_label = QtWidgets.QLabel('搜索:')
 
+            # 输入停止一段时间后再搜索，连续输入时不重复过滤
+            searchTimer = QtCore.QTimer(self)
+            searchTimer.setSingleShot(True)
+            searchTimer.setInterval(150)
+            searchTimer.timeout.connect(update_search)
+
             ue_searchbar = QtWidgets.QLineEdit()
-            ue_searchbar.textChanged.connect(update_search)
+            ue_searchbar.textChanged.connect(lambda text: searchTimer.start())
 
-            listview = QtWidgets.QListWidget()
+            model = MaterialListModel(self.materialList, self.renamed_item, self)
 
-            listview.addItems(self.materialList)
+            listview = QtWidgets.QListView()
+            listview.setUniformItemSizes(True)
+            listview.setModel(model)
 
             hide_checkBox = QtWidgets.QCheckBox('隐藏已重命名项')
             hide_checkBox.stateChanged.connect(hide_renamed)
@@ -733,6 +1575,7 @@ class VredVRTools(form, base):
             VBoxLayout.addWidget(preview_label)
             VBoxLayout.addWidget(preview_name)
             VBoxLayout.addWidget(ue_rename_Btn)
+            VBoxLayout.addWidget(ue_suggest_Btn)
 
             self.ue_material = QtWidgets.QDialog(self)
             self.ue_material.setLayout(VBoxLayout)
@@ -753,8 +1596,106 @@ class VredVRTools(form, base):
 
 
 
+    def suggestMaterials(self, model):
+        """
+        为场景中未使用UE材质名称的材质查找最相似的UE材质，批量接受首选建议
+        """
+        if not self.materialList:
+            self._MessageBox('请先导入UE材质表！')
+            return
+
+        ueNames = set(self.materialList)
+        mats = [mat for mat in vrMaterialService.getAllMaterials() if mat.getName() not in ueNames]
+        if not mats:
+            self._MessageBox('所有材质均已使用UE材质名称！')
+            return
+
+        def progress(done, total):
+            self._pbar.setValue(done / total * 100)
+            QtWidgets.QApplication.processEvents()
+
+        # 通过倒排索引只与共享少见三字符的名称比较
+        self._pbar.reset()
+        matcher = nameMatcher.NameMatcher(self.materialList)
+        suggestions = matcher.suggestAll([mat.getName() for mat in mats], 1, progress)
+        self._pbar.reset()
+        self.profiler.addNodes(len(mats))
+
+        table = QtWidgets.QTableWidget(len(mats), 3)
+        table.setHorizontalHeaderLabels(['材质', 'UE材质', '相似度'])
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        for row, (mat, suggestion) in enumerate(zip(mats, suggestions)):
+            table.setItem(row, 0, QtWidgets.QTableWidgetItem(mat.getName()))
+            if suggestion:
+                score, idx = suggestion[0]
+                table.setItem(row, 1, QtWidgets.QTableWidgetItem(matcher.names[idx]))
+                table.setItem(row, 2, QtWidgets.QTableWidgetItem('%.2f' % score))
+        table.resizeColumnsToContents()
+
+        threshold_label = QtWidgets.QLabel('最低相似度:')
+        threshold_spinBox = QtWidgets.QDoubleSpinBox()
+        threshold_spinBox.setRange(0, 1)
+        threshold_spinBox.setSingleStep(0.05)
+        threshold_spinBox.setValue(0.6)
+
+        buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        buttonbox.button(QtWidgets.QDialogButtonBox.Ok).setText('接受首选建议')
+
+        VBoxLayout = QtWidgets.QVBoxLayout()
+        VBoxLayout.addWidget(table)
+        VBoxLayout.addWidget(threshold_label)
+        VBoxLayout.addWidget(threshold_spinBox)
+        VBoxLayout.addWidget(buttonbox)
+
+        dialog = QtWidgets.QDialog(self)
+        dialog.setLayout(VBoxLayout)
+        dialog.setWindowTitle('自动匹配建议')
+        dialog.resize(600, 600)
+
+        buttonbox.accepted.connect(dialog.accept)
+        buttonbox.rejected.connect(dialog.reject)
+
+        res = dialog.exec_()
+
+        if res == dialog.Accepted:
+            tag = '未重命名材质'
+            threshold = threshold_spinBox.value()
+            renamed = []
+
+            vrUndoService.beginUndo()
+            vrUndoService.beginMultiCommand("suggestMaterials")
+            try:
+                for mat, suggestion in zip(mats, suggestions):
+                    if not suggestion or suggestion[0][0] < threshold:
+                        continue
+                    name = matcher.names[suggestion[0][1]]
+                    mat.setName(name)
+                    oldmat = vrMaterialPtr.toMaterial(mat.getObjectId())
+                    vrMaterialPtr.removeMaterialTag(oldmat, tag)
+                    renamed.append(name)
+            finally:
+                vrUndoService.endMultiCommand()
+                vrUndoService.endUndo()
+
+            model.markRenamed(renamed)
+            self._MessageBox('已重命名材质：' + str(len(renamed)))
+
+
     def datasmith_menu(self):
 
+        def show_texture_stats():
+            stats = self.profiler.run('clearTextures', self.clearTextures, True)
+            self._MessageBox('将清理贴图：' + str(stats.textures) + '\n涉及材质：' + str(stats.materials) +
+                             '\n无颜色组件的材质：' + str(stats.skippedMaterials) +
+                             '\n涉及图像：' + str(len(stats.seenImages)) +
+                             '\n被清理贴图引用的内存（共享图像只计一次，不代表实际释放的内存）：' +
+                             '%.1f MB' % (stats.bytes / 1048576.0))
+
+        def update_downscale(checked):
+            downscale_checkBox.setEnabled(not checked)
+            if checked:
+                downscale_checkBox.setChecked(False)
+
         self.dialog.reject()
 
         optimization_label = QtWidgets.QLabel('优化选项：')
@@ -768,6 +1709,31 @@ class VredVRTools(form, base):
         clear_texture_checkBox = QtWidgets.QCheckBox('清理材质贴图')
         clear_texture_checkBox.setChecked(True)
 
+        # 只统计不修改
+        texture_stats_Btn = QtWidgets.QPushButton('统计将清理的贴图')
+        texture_stats_Btn.clicked.connect(show_texture_stats)
+
+        # 清理材质贴图会关闭全部贴图，此时缩小贴图没有意义，两个选项互斥
+        downscale_checkBox = QtWidgets.QCheckBox('缩小超出预算的贴图（需取消清理材质贴图）')
+        downscale_checkBox.setChecked(False)
+        update_downscale(clear_texture_checkBox.isChecked())
+        clear_texture_checkBox.toggled.connect(update_downscale)
+
+        budget_label = QtWidgets.QLabel('贴图显存预算（MB）：')
+        budget_spinBox = QtWidgets.QSpinBox()
+        budget_spinBox.setRange(0, 65536)
+        budget_spinBox.setSingleStep(256)
+        budget_spinBox.setValue(2048)
+
+        maxSize_label = QtWidgets.QLabel('最大边长：')
+        maxSize_combobox = QtWidgets.QComboBox()
+        for size in ('8192', '4096', '2048', '1024'):
+            maxSize_combobox.addItem(size)
+        maxSize_combobox.setCurrentIndex(1)
+
+        texture_audit_Btn = QtWidgets.QPushButton('贴图审查')
+        texture_audit_Btn.clicked.connect(lambda: self.profiler.run('showTextureAudit', self.showTextureAudit))
+
         buttonbox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
 
         VBoxLayout = QtWidgets.QVBoxLayout()
@@ -775,6 +1741,13 @@ class VredVRTools(form, base):
         VBoxLayout.addWidget(clear_environment_checkBox)
         VBoxLayout.addWidget(clear_unusable_checkBox)
         VBoxLayout.addWidget(clear_texture_checkBox)
+        VBoxLayout.addWidget(texture_stats_Btn)
+        VBoxLayout.addWidget(downscale_checkBox)
+        VBoxLayout.addWidget(budget_label)
+        VBoxLayout.addWidget(budget_spinBox)
+        VBoxLayout.addWidget(maxSize_label)
+        VBoxLayout.addWidget(maxSize_combobox)
+        VBoxLayout.addWidget(texture_audit_Btn)
         VBoxLayout.addWidget(buttonbox)
 
         dialog = QtWidgets.QDialog()
@@ -798,11 +1771,22 @@ class VredVRTools(form, base):
             vrFileIO.save(currentScenePath)
 
             if clear_environment_checkBox.isChecked() == True:
-                self.clear_environments()
+                self.profiler.run('clear_environments', self.clear_environments)
             if clear_unusable_checkBox.isChecked() == True:
-                self.clear_unusable()
+                self.profiler.run('clear_unusable', self.clear_unusable)
             if clear_texture_checkBox.isChecked() == True:
-                self.clearTextures()
+                self.profiler.run('clearTextures', self.clearTextures)
+            elif downscale_checkBox.isChecked() == True:
+                # 缩小后的图像保存在场景文件旁的目录中，取消时不导出
+                directory = os.path.splitext(currentScenePath)[0] + '_textures'
+                replaced = self.profiler.run('downscaleTextures', self.downscaleTextures, directory,
+                                             budget_spinBox.value() * 1048576, int(maxSize_combobox.currentText()))
+                if replaced is None:
+                    return
+                if replaced:
+                    self._MessageBox('已缩小贴图：' + str(replaced) + ' 张')
+                else:
+                    self._MessageBox('贴图未超出预算和最大边长，无需缩小')
 
             self.datasmith()
         pass
@@ -816,6 +1800,127 @@ class VredVRTools(form, base):
             self._MessageBox('缺少Datasmith插件！')
 
 
+    def auditTextures(self):
+        """
+        按图像文件汇总材质引用的贴图，返回按显存占用从大到小排列的TextureInfo列表
+        """
+        def references():
+            for mat in vrMaterialService.getAllMaterials():
+                for channel in textureStrip.CHANNELS:
+                    # 不同类型的材质提供的贴图通道不同
+                    getter = getattr(mat, 'get' + channel[0].upper() + channel[1:] + 'Texture', None)
+                    if getter is None:
+                        continue
+                    texture = getter()
+                    if not texture.isValid() or not texture.getUseTexture():
+                        continue
+                    image = texture.getImage()
+                    if not image.isValid():
+                        continue
+                    yield image.getAbsolutePath(), image.getWidth(), image.getHeight(), mat.getName(), channel, texture
+
+        textures = textureBudget.collect(references())
+        self.profiler.addNodes(sum(len(info.uses) for info in textures))
+        return textures
+
+
+    def showTextureAudit(self):
+        """
+        显示贴图列表，按显存占用排序
+        """
+        textures = self.auditTextures()
+
+        table = QtWidgets.QTableWidget(len(textures), 5)
+        table.setHorizontalHeaderLabels(['贴图', '分辨率', '格式', '显存(MB)', '引用'])
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        for row, info in enumerate(textures):
+            table.setItem(row, 0, QtWidgets.QTableWidgetItem(info.path))
+            table.setItem(row, 1, QtWidgets.QTableWidgetItem('%d x %d' % (info.width, info.height)))
+            table.setItem(row, 2, QtWidgets.QTableWidgetItem(info.format))
+            table.setItem(row, 3, QtWidgets.QTableWidgetItem('%.1f' % (info.bytes / 1048576.0)))
+            table.setItem(row, 4, QtWidgets.QTableWidgetItem(', '.join('%s.%s' % use for use in info.uses)))
+        table.resizeColumnsToContents()
+
+        total = sum(info.bytes for info in textures)
+        total_label = QtWidgets.QLabel('贴图：' + str(len(textures)) + '，估算显存：' + '%.1f MB' % (total / 1048576.0))
+
+        VBoxLayout = QtWidgets.QVBoxLayout()
+        VBoxLayout.addWidget(total_label)
+        VBoxLayout.addWidget(table)
+
+        dialog = QtWidgets.QDialog(self)
+        dialog.setLayout(VBoxLayout)
+        dialog.setWindowTitle('贴图审查')
+        dialog.resize(800, 600)
+        dialog.exec_()
+
+
+    def downscaleTextures(self, directory, budget, maxSize, quality=90):
+        """
+        按显存预算和最大边长缩小贴图，在线程池中缩放和压缩图像，完成后替换材质贴图
+        返回替换的图像数量，取消时返回None
+        """
+        textures = self.auditTextures()
+        plan = textureBudget.planDownscale(textures, budget, maxSize)
+        if not plan:
+            return 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        progressDialog = QtWidgets.QProgressDialog('缩小贴图...', '取消', 0, len(plan), self)
+        progressDialog.setWindowTitle('缩小贴图')
+        progressDialog.setWindowModality(QtCore.Qt.WindowModal)
+        progressDialog.setMinimumDuration(0)
+
+        # QImage可以在工作线程中使用，VRED接口只在主线程调用
+        results = {}
+        cancelled = False
+        with concurrent.futures.ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+            futures = dict((executor.submit(downscaleImage, info.path, directory, width, height, quality, info.isColor), info)
+                           for info, (width, height) in plan.items())
+            pending = set(futures)
+            while pending:
+                done, pending = concurrent.futures.wait(pending, timeout=0.05)
+                for future in done:
+                    try:
+                        results[futures[future]] = future.result()
+                    except Exception:
+                        results[futures[future]] = None
+                progressDialog.setValue(len(results))
+                QtWidgets.QApplication.processEvents()
+                if progressDialog.wasCanceled():
+                    cancelled = True
+                    for future in pending:
+                        future.cancel()
+                    break
+        progressDialog.close()
+
+        if cancelled:
+            return None
+
+        replaced = 0
+        vrUndoService.beginUndo()
+        vrUndoService.beginMultiCommand("downscaleTextures")
+        try:
+            for info, target in results.items():
+                if target is None:
+                    print('skip texture: ' + info.path)
+                    continue
+                image = vrImageService.loadImage(target)
+                for texture in info.handles:
+                    texture.setImage(image)
+                replaced += 1
+        finally:
+            vrUndoService.endMultiCommand()
+            vrUndoService.endUndo()
+
+        before = sum(info.bytes for info in textures)
+        after = before - sum(info.bytes - textureStrip.imageBytes(width, height, info.bytesPerPixel)
+                             for info, (width, height) in plan.items() if results.get(info))
+        print('downscaled %d textures: %.1f MB -> %.1f MB' % (replaced, before / 1048576.0, after / 1048576.0))
+        return replaced
+
+
     def clear_environments(self):
         name = 'Studio'
 
@@ -834,19 +1939,40 @@ class VredVRTools(form, base):
         vrOptimize.cleanupGroupNodes(node, True)
 
 
-    def clearTextures(self):
+    def clearTextures(self, dryRun=False):
+        """
+        关闭所有材质的贴图，dryRun为True时只统计将清理的贴图数量和引用的内存，返回统计结果
+        """
         mats = vrMaterialPtr.getAllMaterials()
-        data = ['diffuse', 'glossy', 'specular', 'incandescence', 'bump', 'transparency', 'scatter', 'roughness',
-                'displacement', 'fresnel', 'rotation', 'indexOfRefraction', 'specularBump', 'metallic',
-                'ambientOcclusion']
+        self.profiler.addNodes(len(mats))
+
+        stats = textureStrip.StripStats()
         for mat in mats:
-            for fname in data:
-                colorComponentData = vrFieldAccess.vrFieldAccess(mat.fields().getFieldContainer('colorComponentData'))
-                Component = vrFieldAccess.vrFieldAccess(colorComponentData.getFieldContainer(fname + 'Component'))
-                Component.setBool("useTexture", False)
+            # 每个材质只读取一次颜色组件容器，没有颜色组件的材质跳过
+            fields = mat.fields()
+            if not fields.hasField('colorComponentData'):
+                stats.skippedMaterials += 1
+                continue
+            colorComponentData = vrFieldAccess.vrFieldAccess(fields.getFieldContainer('colorComponentData'))
+            textureStrip.stripMaterial(colorComponentData, vrFieldAccess.vrFieldAccess, stats, dryRun, self.textureMemory)
 
-            # print('Done')
-        # self._MessageBox('已清除所有材质贴图！')
+        print(('dry run: ' if dryRun else 'cleared: ') + stats.summary())
+        return stats
+
+
+    def textureMemory(self, component):
+        """
+        估算颜色组件贴图占用的内存，返回 (图像容器, 字节数)，没有图像时为 (None, 0)，读取不到图像尺寸时字节数为0
+        """
+        if not component.hasField('image'):
+            return None, 0
+        container = component.getFieldContainer('image')
+        image = vrFieldAccess.vrFieldAccess(container)
+        if not image.isValid() or not image.hasField('width'):
+            return container, 0
+        depth = image.getInt32('depth') if image.hasField('depth') else 1
+        return container, textureStrip.imageBytes(image.getInt32('width'), image.getInt32('height'),
+                                                  image.getInt32('bpp'), depth)
 
 
     def selectRef(self):
@@ -872,11 +1998,18 @@ class VredVRTools(form, base):
         combobox = QtWidgets.QComboBox()
         combobox.addItem('包含')
         combobox.addItem('精确匹配')
+        Clabel = QtWidgets.QLabel('每个文件最大行数（0 为不拆分）：')
+        maxRows_spinBox = QtWidgets.QSpinBox()
+        maxRows_spinBox.setRange(0, 10000000)
+        maxRows_spinBox.setSingleStep(10000)
+        maxRows_spinBox.setValue(self.matMaxRows)
 
 
         VBoxLayout = QtWidgets.QVBoxLayout()
         VBoxLayout.addWidget(Blabel)
         VBoxLayout.addWidget(combobox)
+        VBoxLayout.addWidget(Clabel)
+        VBoxLayout.addWidget(maxRows_spinBox)
         VBoxLayout.addWidget(Alabel)
         VBoxLayout.addWidget(Alineedit)
         VBoxLayout.addWidget(Bopen)
@@ -892,6 +2025,7 @@ class VredVRTools(form, base):
         res = dialog.exec_()
         if res == dialog.Accepted:
             self.matMatchMode = combobox.currentIndex()
+            self.matMaxRows = maxRows_spinBox.value()
             if Alineedit.text() == '':
                 self.refFilename = ''
 
@@ -906,85 +2040,40 @@ class VredVRTools(form, base):
         savefilepath = dialog.getSaveFileName(self, '选择保存路径', os.path.join(os.path.join(os.path.expanduser("~"), 'Desktop'), defaultname), 'CSV(*.csv)')[0]
 
         if savefilepath != '':
-
-            rowName = []
-            searchstring = []
-            stringMatch = []
-            materialReplacement = []
-            dict_materialReplacement = {}
-
-            mats = vrMaterialPtr.getAllMaterials()
-
-            if self.matMatchMode == 0:
-                print('yes')
-                # for mat in oldmatsname:
-                #     newMatname = re.sub(u"([^\u4E00-\u9FA5\uf900-\ufa2d\u0041-\u005a\u0061-\u007a])", "", mat)
-                #     rowName.append(newMatname)
-                #     rowName = sorted(set(rowName), key=rowName.index)
-                for mat in mats:
-                    newMatname = re.sub(u"([^\u4E00-\u9FA5\uf900-\ufa2d\u0041-\u005a\u0061-\u007a\u005f])", "", mat.getName())
-                    searchstring.append(newMatname)
-                    searchstring = sorted(set(searchstring), key=searchstring.index)
-
-                for row in searchstring:
-                    # text = translator.translate(row)
-                    # result = text.translatedText
-                    # result = result.replace(' ', '_')
-                    rowName.append(row)
-
-                i = 0
-                for i in range(0, len(searchstring)):
-                    stringMatch.append('Contains')
-                    i += 1
-
-            if self.matMatchMode == 1:
-                print('no')
-                # for mat in oldmatsname:
-                #     rowName.append(mat)
-
-                for mat in mats:
-                    # text = translator.translate(mat.getName())
-                    # result = text.translatedText
-                    # result = result.replace(' ', '_')
-                    rowName.append(mat.getName())
-                    searchstring.append(mat.getName())
-
-                i = 0
-                for i in range(0, len(mats)):
-                    stringMatch.append('Exact Match')
-                    i += 1
-
-            if self.refFilename != '':
-                row1 = []
-                row2 = []
-                with open(self.refFilename, 'r', encoding='utf-8') as csvfile:
-                    reader = csv.reader(csvfile)
-                    for row in reader:
-                        row1 += [row[1]]
-                        row2 += [row[3]]
-                    dict_materialReplacement = dict(zip(row1, row2))
-                    dict_materialReplacement.pop('SearchString')
-
-            for search in searchstring:
-                materialReplacement.append(dict_materialReplacement.get(search))
+            self.profiler.run('writeMaterialData', self.writeMaterialData, savefilepath)
 
 
+    def writeMaterialData(self, savefilepath):
+        """
+        按当前匹配模式和参考表生成UE材质替换表并写入文件，行数超过上限时拆分为多个文件
+        """
+        mats = vrMaterialPtr.getAllMaterials()
+        self.profiler.addNodes(len(mats))
 
+        # 参考表按路径和修改时间缓存，重复导出时不再读取
+        reference = None
+        if self.refFilename != '':
+            try:
+                reference = referenceTable.load(self.refFilename)
+            except OSError:
+                self._MessageBox('读取参考表出错！\n' + self.refFilename)
+                return
 
+        # 逐行规范化、去重并写入
+        rows = materialTable.iterRows((mat.getName() for mat in mats), self.matMatchMode, reference)
 
-            # 写入文件
+        # 写入文件
 
-            try:
-                with open(savefilepath, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f, delimiter=",")
-                    header = ['Row Name', 'Search String', 'String Match', 'Material Replacement']
-                    writer.writerow(header)
-                    writer.writerows(zip(rowName, searchstring, stringMatch, materialReplacement))
+        try:
+            paths = materialTable.writeRows(savefilepath, rows, self.matMaxRows)
+        except OSError:
+            self._MessageBox('写入错误！\n请检查文件是否在其他程序中使用！')
+        else:
+            if len(paths) > 1:
+                self._MessageBox('导出成功！\n已拆分为 ' + str(len(paths)) + ' 个文件')
+            else:
                 self._MessageBox('导出成功！')
 
-            except:
-                self._MessageBox('写入错误！\n请检查文件是否在其他程序中使用！')
-
 
     def _MessageBox(self, message):
         msgBox = QtWidgets.QMessageBox()
@@ -1010,72 +2099,41 @@ class VredVRTools(form, base):
 
     def Rename_default_Recursive(self, node):
 
-        def rename():
+        def rename(node, geos):
             node_basename = self.GetNodeBasename(node)
             # 恢复base名
             node.setName(node_basename)
             # 重命名
-            for childgeo in geos:
-                childgeo.setName(node_basename + '_' + str(geos.index(childgeo)))
+            for idx, childgeo in enumerate(geos):
+                childgeo.setName(node_basename + '_' + str(idx))
 
             node.setName(node_basename + '_' + str(len(geos)))
 
-        geos = []
-        others = []
-
-        for child in node.getChildren():
-            geo = vrdGeometryNode(child)
-            if geo.isValid():
-                geos.append(geo)
-            else:
-                others.append(child)
-
-        # 尝试找出数字后缀
-        try:
-            has_idx = int(node.getName().split('_')[-1])
+        # 遍历所有非几何体节点，geos为其子几何体
+        for node, geos, others in sceneTraversal.iterBranches(node, getNodeChildren, asGeometryNode):
 
-        # 如果类型转换错误，即后缀并不是数字类型
-        except ValueError:
+            self.profiler.addNodes(1 + len(geos))
 
             # 子几何体数量不为空时，增加后缀来记录当前使用的最大数字值，避免后面出现几何体数字后缀重复使用的情况
             if len(geos) != 0:
                 # 重命名
-                rename()
-
-        # 如果类型转换成功
-        else:
-
-            # 子几何体数量不为空时，且非日期形式
-            if len(geos) != 0:
-                # 重命名
-                rename()
-        finally:
-
-            # 递归遍历
-            for child in others:
-                self.Rename_default_Recursive(child)
+                rename(node, geos)
 
     def Rename_change_Recursive(self, node):
-        geos = []
-        others = []
 
-        for child in node.getChildren():
-            geo = vrdGeometryNode(child)
-            if geo.isValid():
-                geos.append(geo)
-            else:
-                others.append(child)
+        # 遍历所有非几何体节点，geos为其子几何体
+        for node, geos, others in sceneTraversal.iterBranches(node, getNodeChildren, asGeometryNode):
+            self.profiler.addNodes(1 + len(geos))
 
+            # 将已经使用的数字加入集合
+            i = 0
+            try:
+                has_idx = int(node.getName().split('_')[-1])
+            except ValueError:
+                pass
+            else:
+                i = has_idx
 
-        # 将已经使用的数字加入集合
-        i = 0
-        try:
-            has_idx = int(node.getName().split('_')[-1])
-        except ValueError:
-            pass
-        else:
-            i = has_idx
-        finally:
             node_basename = self.GetNodeBasename(node)
 
             for childgeo in geos:
@@ -1087,10 +2145,6 @@ class VredVRTools(form, base):
             if len(geos) != 0:
                 node.setName(node_basename + '_' + str(i))
 
-            # 递归遍历
-            for child in others:
-                self.Rename_change_Recursive(child)
-
 
     def renameDefault(self):
 
@@ -1137,12 +2191,14 @@ class VredVRTools(form, base):
             else:
                 self.thresholdValue = int(Clineedit.text())
                 self.sizethresholdValue = int(Dlineedit.text())
+                self.matchMode = Ecombobox.currentIndex()
+                self.useSignatureCache = cache_checkBox.isChecked()
                 self.matchdialog.close()
 
                 vrUndoService.beginUndo()
                 vrUndoService.beginMultiCommand("MatchMaterial")
                 try:
-                    self.materialsCore(self.selectedoldnode, self.selelctednewnode)
+                    self.profiler.run('materialsCore', self.materialsCore, self.selectedoldnode, self.selelctednewnode)
                 except:
                     pass
                 finally:
@@ -1171,6 +2227,17 @@ class VredVRTools(form, base):
             Alabel = QtWidgets.QLabel("位置阈值（单位mm）:")
             Blabel = QtWidgets.QLabel("边界框相似度阈值 %:")
 
+            # 匹配模式，顺序与 matchScoring.MATCH_LAST / MATCH_GREEDY / MATCH_ASSIGNMENT 一致
+            Elabel = QtWidgets.QLabel("匹配模式:")
+            Ecombobox = QtWidgets.QComboBox()
+            Ecombobox.addItem('最后匹配项')
+            Ecombobox.addItem('最佳匹配（就近优先）')
+            Ecombobox.addItem('最佳匹配（全局最优）')
+            Ecombobox.setCurrentIndex(self.matchMode)
+
+            cache_checkBox = QtWidgets.QCheckBox('使用参考节点缓存')
+            cache_checkBox.setChecked(self.useSignatureCache)
+
             selectOld = QtWidgets.QPushButton('选择参考节点')
             selectOld.setIcon(QtGui.QIcon(self.get_icon('icon_material_select.png')))
             selectOld.setIconSize(QtCore.QSize(32, 32))
@@ -1195,6 +2262,9 @@ class VredVRTools(form, base):
             VBoxLayout.addWidget(Clineedit)
             VBoxLayout.addWidget(Blabel)
             VBoxLayout.addWidget(Dlineedit)
+            VBoxLayout.addWidget(Elabel)
+            VBoxLayout.addWidget(Ecombobox)
+            VBoxLayout.addWidget(cache_checkBox)
             VBoxLayout.addWidget(AAAlabel)
             VBoxLayout.addWidget(buttonbox)
 
@@ -1223,17 +2293,6 @@ class VredVRTools(form, base):
 
     def materialsCore(self, oldnode, newnode):
 
-        # 计算空间向量距离的函数
-        def CalVectorLength(vector1, vector2):
-            x1 = vector1.x()
-            y1 = vector1.y()
-            z1 = vector1.z()
-            x2 = vector2.x()
-            y2 = vector2.y()
-            z2 = vector2.z()
-            length = pow(pow(x1 - x2, 2) + pow(y1 - y2, 2) + pow(z1 - z2, 2), 0.5)
-            return length
-
         # 获取边界框最大最小坐标，返回对角线向量
         def getBoundingBoxVector(node):
             bx = vrNodePtr.toNode(node.getObjectId()).getBoundingBox()
@@ -1246,123 +2305,144 @@ class VredVRTools(form, base):
             vector = [x1 - x2, y1 - y2, z1 - z2]
             return vector
 
-        # 获取向量长度
-        def getvectorlength(vector):
-            x = vector[0]
-            y = vector[1]
-            z = vector[2]
-            length = pow(pow(x, 2) + pow(y, 2) + pow(z, 2), 0.5)
-            return length
-
-        # 计算向量余弦相似度，取值[-1,1]，cos = 1，夹角=0，最相似；cos = 0，夹角=90，不相似；cos = -1，方向相反
-        def cos_sim(vector1, vector2):
-            x1 = vector1[0]
-            y1 = vector1[1]
-            z1 = vector1[2]
-            x2 = vector2[0]
-            y2 = vector2[1]
-            z2 = vector2[2]
-            upnum = x1 * x2 + y1 * y2 + z1 * z2
-            lownum = pow(pow(x1, 2) + pow(y1, 2) + pow(z1, 2), 0.5) * pow(pow(x2, 2) + pow(y2, 2) + pow(z2, 2), 0.5)
-            if lownum != 0:
-                cos = upnum / lownum
-            else:
-                cos = 0
-            return cos
-
-
-        # 计算比较百分比
-        def Calpercent(a,b):
-            percent = 1
-            if a < b:
-                if b != 0:
-                    percent = a / b
-                else:
-                    percent = 0
-            if a > b:
-                if a != 0:
-                    percent = b / a
-                else:
-                    percent = 0
-
-            return percent
-
-
-        self._pbar.reset()
-
-        # 遍历老数据对象
-        oldgeonodes = []
-        self.findGeosRecursive(vrdNode(oldnode), oldgeonodes, None)
-
-        oldVectors = []  # 定义老数据对象中心点数组
-
-        olddict = {}  # 定义老对象字典，key=中心点，value=边界框大小
-
-
-        # 循环添加中心点到数组，为字典添加内容
-        for oldgeonode in oldgeonodes:
-            oldvector = vrNodeUtils.getBoundingBoxCenter(oldgeonode, False)
-            oldbxvector = getBoundingBoxVector(oldgeonode)
-            oldVectors.append(oldvector)
-            olddict[oldvector] = oldbxvector
-
-        print("Old Data Done")
-
-        # 遍历新数据对象
-        newgeonodes = []
-        self.findGeosRecursive(vrdNode(newnode), newgeonodes, None)
-
-        # 统一赋予检查材质
-        mat = vrMaterialPtr.findMaterial('CheckMat')
-        if mat.getName() == None:
-            mat = vrMaterialPtr.createMaterial("UPlasticMaterial")
-            mat.setName('CheckMat')
-            mat.fields().setVec3f("diffuseColor", 0, 1, 0)
-            mat.fields().setVec4f("incandescenceColor", 0, 1, 0, 1)
-
-        for newgeonode in newgeonodes:
-            newgeonode.applyMaterial(mat)
-
-        nodeprocess = 0
-
-        # 循环新对象节点，查找老对象数组和字典，通过阈值对中心点位置差异和边界框大小进行比较，符合条件则替换材质
-        for newgeonode in newgeonodes:
-            newvector = vrNodeUtils.getBoundingBoxCenter(newgeonode, False)  # 获取边界框中心位置
-            newbxvector = getBoundingBoxVector(newgeonode)  # 获取边界框对角线向量
-            newbxsize = getvectorlength(newbxvector)  # 获取边界框向量长度
-            for oldvector in oldVectors:
-
-                oldbxvector = olddict[oldvector]
-                oldbxsize = getvectorlength(oldbxvector)
-                oldgeonode = oldgeonodes[oldVectors.index(oldvector)]
-
-                dist = CalVectorLength(oldvector, newvector)  # 计算中心点差值
-                cossim = cos_sim(oldbxvector, newbxvector)  # 计算边界框对角线向量相似度
-                bxsizediff = Calpercent(oldbxsize, newbxsize) * 100  # 计算边界框向量长度相似度
-
-                # 计算面数相似度
-                a = oldgeonode.getChildCount()
-                b = newgeonode.getChildCount()
-                componentcount = Calpercent(a, b)
-
-                _thresholdValue = self.thresholdValue  # 获得中心点阈值
-                sizeThresholdValue = self.sizethresholdValue  # 定义边界框大小阈值
-
-                # 如果中心点差值<=阈值，再判断边界框对角线向量相似度，再判断组件个数，符合条件则判断是否为一个件替换材质
-                if dist <= _thresholdValue:
-                    if bxsizediff >= sizeThresholdValue:
-                        if cossim >= 0.8:
-                            if componentcount >= 0.5:
-                                newgeonode.applyMaterial(oldgeonode.getMaterial())  # 获取节点并替换材质
+        # 提取阶段：将几何体的中心点、对角线向量和子节点数量写入数据表
+        def fillBoxTable(geonodes, start, span):
+            table = matchScoring.BoxTable()
+            for geonode in geonodes:
+                center = vrNodeUtils.getBoundingBoxCenter(geonode, False)
+                table.append((center.x(), center.y(), center.z()), getBoundingBoxVector(geonode), geonode.getChildCount())
+                if len(table) % 500 == 0:
+                    setProgress(start + span * len(table) / len(geonodes))
+                    QtWidgets.QApplication.processEvents()
+                    if progress.cancelled:
+                        break
+            return table
 
+        def setProgress(value):
+            self._pbar.setValue(value)
+            progressDialog.setValue(value)
 
-            nodeprocess += 1
-            currentpersent = nodeprocess / len(newgeonodes)
-            self._pbar.setValue(currentpersent * 100)
 
         self._pbar.reset()
+        self.setEnabled(False)
+
+        # 提取和匹配阶段可以取消，取消时不修改任何材质
+        progress = matchScoring.MatchProgress()
+        progressDialog = QtWidgets.QProgressDialog('匹配材质...', '取消', 0, 100, self)
+        progressDialog.setWindowTitle('材质匹配')
+        progressDialog.setWindowModality(QtCore.Qt.WindowModal)
+        progressDialog.setMinimumDuration(0)
+        progressDialog.canceled.connect(progress.cancel)
+        matches = None
+        mismatched = False
 
-        self._MessageBox("新对象材质替换完成！")
+        try:
+            # 提取阶段（主线程），进度 0% - 30%
+            # 参考节点优先读取磁盘缓存，命中时跳过遍历和边界框查询
+            oldgeonodes = []
+            cachefile = None
+            cached = None
+            if self.useSignatureCache:
+                cachefile = signatureCache.cachePath(vrFileIO.getFileIOFilePath(), getNodePath(vrdNode(oldnode)))
+                cached = signatureCache.load(cachefile)
+
+            # 缓存中的材质按对象ID和名称解析，有无法唯一确定的材质时视为未命中，重新提取参考数据
+            unresolved = 0
+            if cached:
+                oldTable, cachedMaterials = cached
+                oldMaterials = signatureCache.resolveMaterials(cachedMaterials, vrMaterialService.getAllMaterials(),
+                                                               lambda mat: mat.getObjectId(), lambda mat: mat.getName())
+                unresolved = oldMaterials.count(None)
+                if unresolved:
+                    print("%d cached materials unresolved, rebuilding old data" % unresolved)
+                    cached = None
+                else:
+                    print("Old Data Loaded From Cache")
+
+            if not cached:
+                self.findGeosRecursive(vrdNode(oldnode), oldgeonodes, None)
+                oldTable = fillBoxTable(oldgeonodes, 0, 15)
+                oldMaterials = [oldgeonode.getMaterial() for oldgeonode in oldgeonodes]
+                if cachefile and not progress.cancelled:
+                    signatureCache.save(cachefile, oldTable, [(oldmat.getName(), oldmat.getObjectId())
+                                                              for oldmat in oldMaterials])
+
+            # 遍历新数据对象
+            newgeonodes = []
+            self.findGeosRecursive(vrdNode(newnode), newgeonodes, None)
+            newTable = fillBoxTable(newgeonodes, 15, 15)
+            self.profiler.addNodes(len(oldgeonodes) + len(newgeonodes))
+
+            print("Old Data Done")
+
+            # 匹配阶段（工作线程），只读取数据表，不访问VRED，进度 30% - 80%
+            # 以中心点阈值为格子大小建立空间索引，每个新对象只检查阈值范围内的老对象，
+            # 批量计算中心点距离、对角线向量相似度、边界框大小和组件个数
+            if not progress.cancelled:
+                progress.total = len(newTable)
+                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                    future = executor.submit(matchScoring.findMatches, oldTable, newTable,
+                                             self.thresholdValue, self.sizethresholdValue, progress, self.matchMode)
+                    while not future.done():
+                        setProgress(30 + 50 * progress.fraction())
+                        QtWidgets.QApplication.processEvents(QtCore.QEventLoop.AllEvents, 50)
+                        time.sleep(0.01)
+                    matches = future.result()
+
+            if matches is None:
+                return
+            # 每个新对象都应有匹配结果，数量不一致时不修改任何材质
+            if len(matches) != len(newgeonodes):
+                mismatched = True
+                return
+
+            # 赋予阶段（主线程），按材质分组批量赋予，进度 80% - 100%，不再允许取消
+            progressDialog.setCancelButton(None)
+            progressDialog.setLabelText('赋予材质...')
+            groups = {}
+            unmatched = []
+            for newgeonode, idx in zip(newgeonodes, matches):
+                if idx < 0:
+                    unmatched.append(newgeonode)
+                else:
+                    groups.setdefault(idx, []).append(newgeonode)
+
+            # 未匹配的对象统一赋予检查材质
+            mat = vrMaterialPtr.findMaterial('CheckMat')
+            if mat.getName() == None:
+                mat = vrMaterialPtr.createMaterial("UPlasticMaterial")
+                mat.setName('CheckMat')
+                mat.fields().setVec3f("diffuseColor", 0, 1, 0)
+                mat.fields().setVec4f("incandescenceColor", 0, 1, 0, 1)
+
+            for newgeonode in unmatched:
+                newgeonode.applyMaterial(mat)
+
+            # 相同材质的对象合并为一次赋予
+            materialGroups = {}
+            for idx, nodes in groups.items():
+                oldmat = oldMaterials[idx]
+                materialGroups.setdefault(oldmat.getObjectId(), (oldmat, []))[1].extend(nodes)
+
+            applied = 0
+            for oldmat, nodes in materialGroups.values():
+                vrMaterialService.applyMaterialToNodes(oldmat, nodes)  # 获取节点并替换材质
+                applied += 1
+                setProgress(80 + 20 * applied / len(materialGroups))
+                QtWidgets.QApplication.processEvents()
+        finally:
+            self.setEnabled(True)
+            progressDialog.close()
+            self._pbar.reset()
+            if matches is None and progress.cancelled:
+                self._MessageBox("材质匹配已取消，未修改任何材质！")
+            elif mismatched:
+                self._MessageBox("匹配结果数量与新对象数量不一致，未修改任何材质！")
+
+        message = "新对象材质替换完成！\n未匹配（赋予CheckMat）：%d / %d" % (len(unmatched), len(newgeonodes))
+        if unresolved:
+            message += "\n缓存中 %d 个材质无法唯一确定，已重新提取参考数据" % unresolved
+        self._MessageBox(message)
 
 
     def vrlock(self):
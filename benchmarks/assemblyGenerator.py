@@ -0,0 +1,116 @@
+"""
+合成装配体生成器
+在 vredMock 场景中生成指定零件数量、层级深度和重复比例的装配体，
+每个零件为一个带曲面子节点的几何体，重复零件与原零件的几何数据和位置相同。
+"""
+import random
+
+from vredMock import MockNode, scene
+
+
+def _box(x, y, z, sx, sy, sz):
+    return (x - sx / 2, y - sy / 2, z - sz / 2, x + sx / 2, y + sy / 2, z + sz / 2)
+
+
+def _makePart(name, bbox, surfaces, primitiveCount, positions, material):
+    part = MockNode(name, 'Geometry')
+    part.primitiveCount = primitiveCount
+    part.positions = positions
+    part.indices = list(range(len(positions) // 3))
+    x1, y1, z1, x2, y2, z2 = bbox
+    step = (x2 - x1) / max(surfaces, 1)
+    for i in range(surfaces):
+        surface = MockNode('%s_surface_%d' % (name, i), 'Surface', (x1 + step * i, y1, z1, x1 + step * (i + 1), y2, z2))
+        surface.primitiveCount = primitiveCount // max(surfaces, 1)
+        part.addChild(surface)
+    if material is not None:
+        part.applyMaterial(material)
+    return part
+
+
+def generateAssembly(parts, depth=4, duplicateRatio=0.1, surfaces=2, materials=50, seed=0, name='Assembly'):
+    """ 在场景根节点下生成装配体
+        Args:
+            parts (int): 零件数量
+            depth (int): 组节点层级深度
+            duplicateRatio (float): 与已有零件完全重复（几何、位置、曲面）的零件比例
+            surfaces (int): 每个零件的曲面数量
+            materials (int): 材质数量
+            seed (int): 随机种子
+            name (str): 装配体根节点名称
+        Returns:
+            MockNode: 装配体根节点
+    """
+    rng = random.Random(seed)
+    if len(scene.materials) < materials:
+        for i in range(len(scene.materials), materials):
+            scene.createMaterial('Mat_%03d_%s' % (i, rng.choice(['Chrome', 'Paint', 'Rubber', 'Glass', 'Leather'])))
+    palette = scene.materials[:materials]
+
+    root = scene.root.addChild(MockNode(name, 'Group'))
+
+    # 每层分支数量，使叶层组节点数量约为零件数量的十分之一
+    groups = max(parts // 10, 1)
+    fanout = max(int(round(groups ** (1.0 / max(depth, 1)))), 1)
+    level = [root]
+    for d in range(depth):
+        nextLevel = []
+        for parent in level:
+            for i in range(fanout):
+                nextLevel.append(parent.addChild(MockNode('%s_%d' % (parent.getName(), i), 'Transform')))
+        level = nextLevel
+
+    created = []
+    for i in range(parts):
+        parent = level[i % len(level)]
+        if created and rng.random() < duplicateRatio:
+            source = rng.choice(created)
+            part = _makePart('Part_%d' % i, source.bbox, len(source.children), source.primitiveCount,
+                             source.positions, source.material)
+            part.bbox = list(source.bbox)
+            for surface, sourceSurface in zip(part.children, source.children):
+                surface.bbox = list(sourceSurface.bbox)
+        else:
+            size = rng.uniform(5, 500)
+            bbox = _box(rng.uniform(-5000, 5000), rng.uniform(-2000, 2000), rng.uniform(0, 1500),
+                        size, size * rng.uniform(0.2, 1), size * rng.uniform(0.2, 1))
+            count = rng.randint(12, 2000)
+            positions = [rng.uniform(-1, 1) for _ in range(27)]
+            part = _makePart('Part_%d' % i, bbox, surfaces, count, positions, rng.choice(palette))
+            part.bbox = list(bbox)
+        parent.addChild(part)
+        created.append(part)
+    return root
+
+
+def generateRevision(reference, jitter=0.5, seed=1, name='Revision'):
+    """ 复制参考装配体作为新版本，零件位置加入微小偏移且不带材质，用于材质匹配
+        Args:
+            reference (MockNode): 参考装配体根节点
+            jitter (float): 位置偏移量
+            seed (int): 随机种子
+            name (str): 新装配体根节点名称
+    """
+    rng = random.Random(seed)
+
+    def copy(node, parent):
+        clone = MockNode(node.getName(), node.nodeType)
+        clone.primitiveCount = node.primitiveCount
+        clone.positions = node.positions
+        clone.indices = node.indices
+        if node.bbox is not None:
+            dx = rng.uniform(-jitter, jitter)
+            clone.bbox = [node.bbox[0] + dx, node.bbox[1], node.bbox[2], node.bbox[3] + dx, node.bbox[4], node.bbox[5]]
+        parent.addChild(clone)
+        stack.append((node, clone))
+        return clone
+
+    root = scene.root.addChild(MockNode(name, 'Group'))
+    stack = []
+    for child in reference.children:
+        copy(child, root)
+    while stack:
+        node, clone = stack.pop()
+        for child in node.children:
+            copy(child, clone)
+    return root
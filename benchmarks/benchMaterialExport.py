@@ -0,0 +1,84 @@
+"""
+UE 材质替换表导出基准测试
+对比原实现（循环内 sorted(set(...), key=list.index) 去重）与 vrToolsCore.materialTable 的流式导出，
+流式导出的耗时应随材质数量线性增长
+
+用法:
+    python benchmarks/benchMaterialExport.py --materials 1000 10000 100000 --legacy-limit 1000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vrToolsCore import materialTable
+
+
+WORDS = ['Chrome', 'Paint', 'Rubber', 'Glass', 'Leather', 'Metal', 'Carbon', 'Plastic', 'Fabric', 'Wood']
+
+
+def buildNames(count, seed=0):
+    """ 约一半的名称只有数字后缀不同，规范化后重复 """
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        base = '%s_%s_%s' % (rng.choice(WORDS), rng.choice(WORDS), ''.join(rng.choice('abcdefgh') for _ in range(4)))
+        names.append(base + '.%03d' % rng.randint(0, 999) if i % 2 else base + str(i))
+    return names
+
+
+def legacyExport(names, path):
+    """ 原实现的包含模式 """
+    searchstring = []
+    for name in names:
+        newMatname = re.sub(u"([^\u4E00-\u9FA5\uf900-\ufa2d\u0041-\u005a\u0061-\u007a\u005f])", "", name)
+        searchstring.append(newMatname)
+        searchstring = sorted(set(searchstring), key=searchstring.index)
+    rows = [[row, row, 'Contains', None] for row in searchstring]
+    materialTable.writeRows(path, rows)
+    return len(rows)
+
+
+def streamingExport(names, path, maxRows=0):
+    rows = materialTable.iterRows(names, materialTable.MATCH_CONTAINS)
+    return materialTable.writeRows(path, rows, maxRows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='UE 材质替换表导出基准测试')
+    parser.add_argument('--materials', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--legacy-limit', type=int, default=1000, help='原实现只测试不超过该数量的材质')
+    parser.add_argument('--max-rows', type=int, default=0, help='每个文件的最大行数')
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'MaterialData.csv')
+
+    previous = None
+    for count in args.materials:
+        names = buildNames(count)
+
+        start = time.perf_counter()
+        paths = streamingExport(names, path, args.max_rows)
+        streaming = time.perf_counter() - start
+
+        line = '%8d materials  streaming %8.3fs (%.2f us/material, %d files)' % (
+            count, streaming, streaming / count * 1e6, len(paths))
+        if previous is not None:
+            line += '  x%.1f time for x%.1f materials' % (streaming / previous[1], count / previous[0])
+        previous = (count, streaming)
+
+        if count <= args.legacy_limit:
+            start = time.perf_counter()
+            legacyExport(names, path)
+            line += '  legacy %8.3fs' % (time.perf_counter() - start)
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+材质名称模糊匹配基准测试
+在合成的 VRED 材质名称和 UE 材质表上测量 vrToolsCore.nameMatcher 的建表和匹配耗时
+
+用法:
+    python benchmarks/benchNameMatch.py --materials 5000 --ue 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vrToolsCore import nameMatcher
+
+
+WORDS = ['Chrome', 'Paint', 'Rubber', 'Glass', 'Leather', 'Metal', 'Carbon', 'Plastic', 'Fabric', 'Wood',
+         'Brushed', 'Matte', 'Gloss', 'Dark', 'Light', 'Red', 'Blue', 'Black', 'White', 'Grey',
+         'Tire', 'Seat', 'Door', 'Dash', 'Trim', 'Mirror', 'Lamp', 'Logo', 'Grille', 'Wheel']
+
+
+def buildNames(materials, ue, seed=0):
+    """ UE 名称为 MI_ 前缀加三个单词，VRED 名称为其中一到四个单词的小写组合加数字后缀 """
+    rng = random.Random(seed)
+    ueNames = ['MI_' + '_'.join(rng.sample(WORDS, 3)) + '_%d' % i for i in range(ue)]
+    vredNames = ['_'.join(rng.sample(WORDS, rng.randint(1, 4))).lower() + '%d.%03d' % (i, rng.randint(0, 9))
+                 for i in range(materials)]
+    return vredNames, ueNames
+
+
+def main():
+    parser = argparse.ArgumentParser(description='材质名称模糊匹配基准测试')
+    parser.add_argument('--materials', type=int, default=5000)
+    parser.add_argument('--ue', type=int, default=50000)
+    args = parser.parse_args()
+
+    vredNames, ueNames = buildNames(args.materials, args.ue)
+
+    start = time.perf_counter()
+    matcher = nameMatcher.NameMatcher(ueNames)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    suggestions = matcher.suggestAll(vredNames, 1)
+    match = time.perf_counter() - start
+
+    matched = sum(1 for suggestion in suggestions if suggestion)
+    print('%d x %d names: index %.3fs, match %.3fs, %d suggestions' % (
+        args.materials, args.ue, build, match, matched))
+    for name, suggestion in list(zip(vredNames, suggestions))[:5]:
+        if suggestion:
+            print('    %-32s -> %s (%.2f)' % (name, ueNames[suggestion[0][1]], suggestion[0][0]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+材质名称搜索基准测试
+在合成的 UE 材质名称上对比逐项小写比较与 vrToolsCore.searchIndex 的三字符索引搜索，
+索引搜索在 10 万条名称下应保持在 16 ms 以内
+
+用法:
+    python benchmarks/benchSearch.py --names 10000 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vrToolsCore import searchIndex
+
+
+WORDS = ['Chrome', 'Paint', 'Rubber', 'Glass', 'Leather', 'Metal', 'Carbon', 'Plastic', 'Fabric', 'Wood']
+QUERIES = ['c', 'ch', 'chr', 'chrome', 'rome_pa', '00012', 'leather_glass', 'zzz']
+
+
+def buildNames(count, seed=0):
+    rng = random.Random(seed)
+    return ['M_%s_%s_%06d' % (rng.choice(WORDS), rng.choice(WORDS), i) for i in range(count)]
+
+
+def linearSearch(names, text):
+    """ 原实现：每次输入都对全部名称小写后比较 """
+    query = text.lower()
+    return [idx for idx, name in enumerate(names) if query in name.lower()]
+
+
+def timeit(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='材质名称搜索基准测试')
+    parser.add_argument('--names', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    for count in args.names:
+        names = buildNames(count)
+        build, index = timeit(searchIndex.TrigramIndex, names)
+        print('%d names, index built in %.3fs' % (count, build))
+        for query in QUERIES:
+            linear, expected = timeit(linearSearch, names, query)
+            indexed, result = timeit(index.search, query)
+            assert result == expected
+            print('    %-16s %7d hits  linear %8.2fms  index %8.2fms' % (
+                repr(query), len(result), linear * 1000, indexed * 1000))
+
+
+if __name__ == '__main__':
+    main()
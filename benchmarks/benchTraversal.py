@@ -0,0 +1,118 @@
+"""
+场景树遍历基准测试
+在合成的深层级和宽层级树上对比递归遍历与 vrToolsCore.sceneTraversal 的迭代遍历
+
+用法:
+    python benchmarks/benchTraversal.py --nodes 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vrToolsCore import sceneTraversal
+
+
+class SyntheticNode(object):
+
+    """
+    合成场景节点，只实现遍历需要的接口
+    """
+
+    __slots__ = ('children', 'isGeometry')
+
+    def __init__(self, isGeometry=False):
+        self.children = []
+        self.isGeometry = isGeometry
+
+    def getChildren(self):
+        return self.children
+
+
+def buildDeepTree(count):
+    """ 深度为 count 的单链，每层挂一个几何体 """
+    root = SyntheticNode()
+    node = root
+    for _ in range(count // 2):
+        child = SyntheticNode()
+        node.children.append(SyntheticNode(True))
+        node.children.append(child)
+        node = child
+    return root
+
+
+def buildWideTree(count, fanout=1000):
+    """ 两层宽树，每个组节点下挂 fanout 个几何体 """
+    root = SyntheticNode()
+    groups = max(count // (fanout + 1), 1)
+    for _ in range(groups):
+        group = SyntheticNode()
+        group.children = [SyntheticNode(True) for _ in range(fanout)]
+        root.children.append(group)
+    return root
+
+
+def getChildren(node):
+    return node.children
+
+
+def asLeaf(node):
+    return node if node.isGeometry else None
+
+
+def recursiveGeos(node, geos):
+    """ 原 findGeosRecursive 的递归实现 """
+    if node.isGeometry:
+        geos.append(node)
+    else:
+        for child in node.children:
+            recursiveGeos(child, geos)
+
+
+def timeit(function):
+    start = time.perf_counter()
+    try:
+        result = function()
+    except RecursionError:
+        return None, 'RecursionError'
+    return time.perf_counter() - start, result
+
+
+def run(counts):
+    results = []
+    for count in counts:
+        for shape, builder in (('deep', buildDeepTree), ('wide', buildWideTree)):
+            root = builder(count)
+
+            def recursive():
+                geos = []
+                recursiveGeos(root, geos)
+                return len(geos)
+
+            def iterative():
+                return sum(1 for _ in sceneTraversal.iterLeaves(root, getChildren, asLeaf))
+
+            def branches():
+                return sum(len(leaves) for _, leaves, _ in sceneTraversal.iterBranches(root, getChildren, asLeaf))
+
+            for name, function in (('recursive', recursive), ('iterLeaves', iterative), ('iterBranches', branches)):
+                seconds, value = timeit(function)
+                results.append((count, shape, name, seconds, value))
+                if seconds is None:
+                    print('%8d %-5s %-13s %s' % (count, shape, name, value))
+                else:
+                    print('%8d %-5s %-13s %8.3fs  geos=%d' % (count, shape, name, seconds, value))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--nodes', type=int, nargs='+', default=[100000, 1000000], help='合成树的节点数量')
+    args = parser.parse_args()
+    run(args.nodes)
+
+
+if __name__ == '__main__':
+    main()
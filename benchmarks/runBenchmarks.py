@@ -0,0 +1,168 @@
+"""
+VredVRTools 离线基准测试
+在 vredMock 替身环境中加载插件，对合成装配体测量各项操作的耗时和 VRED 接口调用次数，
+结果以 JSON 输出，可与基准文件比较并报告性能回退。
+
+用法:
+    python benchmarks/runBenchmarks.py --sizes 1000 10000 --output result.json
+    python benchmarks/runBenchmarks.py --sizes 1000 --baseline result.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import vredMock
+import assemblyGenerator
+
+
+def caseMaterialsCore(plugin, parts, args):
+    reference = assemblyGenerator.generateAssembly(parts, args.depth, args.duplicates, seed=args.seed, name='Reference')
+    revision = assemblyGenerator.generateRevision(reference, seed=args.seed + 1)
+    plugin.thresholdValue = 5
+    plugin.sizethresholdValue = 80
+    plugin.useSignatureCache = False
+    return lambda: plugin.materialsCore(reference, revision)
+
+
+def caseRemoveFace(plugin, parts, args):
+    root = assemblyGenerator.generateAssembly(parts, args.depth, args.duplicates, surfaces=4, seed=args.seed)
+    geonodes = []
+    plugin.findGeosRecursive(root, geonodes, None)
+    return lambda: plugin.removeDuplicateFaces(geonodes, 0.001, False)
+
+
+def caseMergeSelGeos(plugin, parts, args):
+    root = assemblyGenerator.generateAssembly(parts, args.depth, args.duplicates, seed=args.seed)
+    vredMock.scene.selection = [root]
+    return plugin.mergeSelGeos
+
+
+def caseRenameDefault(plugin, parts, args):
+    assemblyGenerator.generateAssembly(parts, args.depth, args.duplicates, seed=args.seed)
+    return lambda: plugin.Rename_default_Recursive(vredMock.scene.root)
+
+
+def caseRenameChange(plugin, parts, args):
+    assemblyGenerator.generateAssembly(parts, args.depth, args.duplicates, seed=args.seed)
+    return lambda: plugin.Rename_change_Recursive(vredMock.scene.root)
+
+
+def caseExportMaterialData(plugin, parts, args):
+    # 材质数量与零件数量相同
+    assemblyGenerator.generateAssembly(min(parts, 1000), args.depth, args.duplicates, materials=parts, seed=args.seed)
+    path = os.path.join(tempfile.mkdtemp(), 'MaterialData.csv')
+    plugin.matMatchMode = 0
+    plugin.refFilename = ''
+    return lambda: plugin.writeMaterialData(path)
+
+
+def caseClearTextures(plugin, parts, args):
+    # 材质数量与零件数量相同，每个材质带两张 2K 贴图
+    for i in range(parts):
+        image = vredMock.FieldContainer({'width': 2048, 'height': 2048, 'bpp': 4})
+        vredMock.scene.createMaterial('Mat_%d' % i, textures={'diffuse': image, 'bump': image})
+    return plugin.clearTextures
+
+
+CASES = {
+    'materialsCore': caseMaterialsCore,
+    'removeFace': caseRemoveFace,
+    'mergeSelGeos': caseMergeSelGeos,
+    'renameDefault': caseRenameDefault,
+    'renameChange': caseRenameChange,
+    'exportMaterialData': caseExportMaterialData,
+    'clearTextures': caseClearTextures,
+}
+
+
+def runCase(plugin, name, parts, args):
+    """ 生成场景并执行一次操作，返回结果记录 """
+    vredMock.scene.reset()
+    operation = CASES[name](plugin, parts, args)
+    vredMock.callCounts.clear()
+
+    start = time.perf_counter()
+    operation()
+    seconds = time.perf_counter() - start
+
+    return {
+        'case': name,
+        'parts': parts,
+        'seconds': round(seconds, 6),
+        'apiCalls': sum(vredMock.callCounts.values()),
+        'apiCallsByKind': dict(vredMock.callCounts.most_common()),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """ 与基准结果比较，返回耗时超过基准 (1 + tolerance) 倍的记录 """
+    reference = dict(((item['case'], item['parts']), item) for item in baseline.get('results', []))
+    regressions = []
+    for item in results:
+        old = reference.get((item['case'], item['parts']))
+        if old is None or old['seconds'] <= 0:
+            continue
+        ratio = item['seconds'] / old['seconds']
+        if ratio > 1 + tolerance:
+            regressions.append({
+                'case': item['case'],
+                'parts': item['parts'],
+                'baselineSeconds': old['seconds'],
+                'seconds': item['seconds'],
+                'ratio': round(ratio, 3),
+            })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000], help='零件数量，可用 10^3 - 10^6')
+    parser.add_argument('--cases', nargs='+', default=sorted(CASES), choices=sorted(CASES))
+    parser.add_argument('--depth', type=int, default=4, help='组节点层级深度')
+    parser.add_argument('--duplicates', type=float, default=0.1, help='重复零件比例')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='结果 JSON 文件')
+    parser.add_argument('--baseline', help='基准结果 JSON 文件')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='允许的耗时增长比例')
+    args = parser.parse_args()
+
+    plugin = vredMock.loadPlugin()
+
+    results = []
+    for parts in args.sizes:
+        for name in args.cases:
+            item = runCase(plugin, name, parts, args)
+            results.append(item)
+            print('%-20s %8d parts %10.3fs %10d api calls' % (name, parts, item['seconds'], item['apiCalls']))
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'depth': args.depth,
+        'duplicates': args.duplicates,
+        'results': results,
+    }
+
+    exitCode = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        report['regressions'] = regressions
+        if regressions:
+            exitCode = 1
+            print(json.dumps({'regressions': regressions}, indent=2))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return exitCode
+
+
+if __name__ == '__main__':
+    sys.exit(main())
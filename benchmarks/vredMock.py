@@ -0,0 +1,749 @@
+"""
+VRED 接口的纯 Python 替身
+只实现 VredVRTools 使用到的接口子集，用于在 VRED 之外加载插件并测量各项操作的耗时。
+场景、材质和接口调用次数保存在 MockScene 中，install() 将替身模块注册到 sys.modules。
+"""
+import builtins
+import collections
+import functools
+import importlib.util
+import itertools
+import os
+import sys
+import types
+
+
+# 接口调用计数
+callCounts = collections.Counter()
+
+
+def counted(kind):
+    """ 统计接口调用次数的装饰器 """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            callCounts[kind] += 1
+            return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_ids = itertools.count(1)
+
+
+class Vec3(object):
+
+    __slots__ = ('_x', '_y', '_z')
+
+    def __init__(self, x, y, z):
+        self._x = x
+        self._y = y
+        self._z = z
+
+    def x(self):
+        return self._x
+
+    def y(self):
+        return self._y
+
+    def z(self):
+        return self._z
+
+
+class FieldContainer(object):
+
+    """ 字段容器，对应 vrFieldAccess 访问的数据 """
+
+    def __init__(self, fields=None):
+        self.fields = dict(fields or {})
+
+    def isValid(self):
+        return True
+
+
+class MockMaterial(object):
+
+    """ 材质，同时提供 vrMaterialPtr 与 vrdMaterial 的接口 """
+
+    def __init__(self, name, materialType='UPlasticMaterial', textures=None):
+        self._id = next(_ids)
+        self._name = name
+        self.materialType = materialType
+        self.tags = set()
+        # 使用该材质的节点，按赋予顺序保存
+        self.nodes = {}
+        components = {}
+        for channel, image in (textures or {}).items():
+            components[channel + 'Component'] = FieldContainer({'useTexture': True, 'image': image})
+        self.container = FieldContainer({'colorComponentData': FieldContainer(components)})
+
+    @counted('material.getName')
+    def getName(self):
+        return self._name
+
+    @counted('material.setName')
+    def setName(self, name):
+        self._name = name
+
+    def getObjectId(self):
+        return self._id
+
+    def getID(self):
+        return self._id
+
+    def isValid(self):
+        return self._name is not None
+
+    def fields(self):
+        return vrFieldAccess(self.container)
+
+    def getPreview(self):
+        return None
+
+    def getNodes(self):
+        return list(self.nodes.values())
+
+    def getType(self):
+        return self.materialType
+
+
+class MockNode(object):
+
+    """ 场景节点，同时提供 vrNodePtr 与 vrdNode 的接口 """
+
+    def __init__(self, name, nodeType='Transform', bbox=None):
+        self._id = next(_ids)
+        self._name = name
+        self.nodeType = nodeType
+        self.children = []
+        self.parent = None
+        self.bbox = list(bbox) if bbox is not None else None
+        self.material = None
+        self.primitiveCount = 0
+        self.positions = None
+        self.indices = None
+        self.visible = True
+        self.attributes = {}
+        _registry[self._id] = self
+
+    def __eq__(self, other):
+        other = getattr(other, '_node', other)
+        return isinstance(other, MockNode) and other._id == self._id
+
+    def __hash__(self):
+        return self._id
+
+    def __repr__(self):
+        return '<MockNode %s %s>' % (self.nodeType, self._name)
+
+    # 基本信息
+    @counted('node.getName')
+    def getName(self):
+        return self._name
+
+    @counted('node.setName')
+    def setName(self, name):
+        self._name = name
+
+    @counted('node.getType')
+    def getType(self):
+        return self.nodeType
+
+    def getObjectId(self):
+        return self._id
+
+    def getID(self):
+        return self._id
+
+    def isValid(self):
+        return self._id in _registry
+
+    def isVisible(self):
+        return self.visible
+
+    # 层级
+    @counted('node.getChildren')
+    def getChildren(self):
+        return list(self.children)
+
+    @counted('node.getChildCount')
+    def getChildCount(self):
+        return len(self.children)
+
+    def getNChildren(self):
+        return len(self.children)
+
+    def getChild(self, index):
+        return self.children[index]
+
+    def getParent(self):
+        return self.parent if self.parent is not None else _invalidNode
+
+    def addChild(self, child):
+        if child.parent is not None:
+            child.parent.children.remove(child)
+        child.parent = self
+        self.children.append(child)
+        return child
+
+    # 边界框
+    @counted('node.getBoundingBox')
+    def getBoundingBox(self):
+        return list(worldBoundingBox(self))
+
+    # 材质
+    @counted('node.getMaterial')
+    def getMaterial(self):
+        return self.material
+
+    @counted('node.applyMaterial')
+    def applyMaterial(self, material):
+        for node in iterSubtree(self):
+            if node.nodeType == 'Geometry':
+                _assignMaterial(node, material)
+
+    # 几何数据
+    @counted('geometry.getPrimitiveCount')
+    def getPrimitiveCount(self):
+        return self.primitiveCount
+
+    @counted('geometry.getPositions')
+    def getPositions(self):
+        return list(self.positions or ())
+
+    @counted('geometry.getIndices')
+    def getIndices(self):
+        return list(self.indices or ())
+
+    def fields(self):
+        return vrFieldAccess(FieldContainer(self.attributes))
+
+
+class _InvalidNode(object):
+
+    def isValid(self):
+        return False
+
+    def getObjectId(self):
+        return 0
+
+    def getID(self):
+        return 0
+
+    def getParent(self):
+        return self
+
+    def getName(self):
+        return ''
+
+    def getChildren(self):
+        return []
+
+
+_invalidNode = _InvalidNode()
+_registry = {}
+
+
+def _assignMaterial(node, material):
+    if node.material is not None:
+        node.material.nodes.pop(node._id, None)
+    node.material = material
+    if material is not None:
+        material.nodes[node._id] = node
+
+
+def iterSubtree(node):
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        stack.extend(reversed(current.children))
+
+
+def worldBoundingBox(node):
+    """ 节点及其子节点的边界框，未设置时为空盒 """
+    boxes = [n.bbox for n in iterSubtree(node) if n.bbox is not None]
+    if not boxes:
+        return (0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+    return (min(b[0] for b in boxes), min(b[1] for b in boxes), min(b[2] for b in boxes),
+            max(b[3] for b in boxes), max(b[4] for b in boxes), max(b[5] for b in boxes))
+
+
+def _unwrap(node):
+    return getattr(node, '_node', node)
+
+
+class MockScene(object):
+
+    """ 当前场景：根节点、选择和材质 """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        _registry.clear()
+        callCounts.clear()
+        self.root = MockNode('Root', 'Group')
+        self.selection = []
+        self.materials = []
+        self.filePath = ''
+
+    def createMaterial(self, name, textures=None):
+        material = MockMaterial(name, textures=textures)
+        self.materials.append(material)
+        return material
+
+
+scene = MockScene()
+
+
+# vrKernelServices 中的包装类
+def vrdNode(node):
+    return _unwrap(node)
+
+
+class vrdGeometryNode(object):
+
+    """ 几何体包装，非几何体节点无效 """
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = _unwrap(node)
+
+    def isValid(self):
+        callCounts['vrdGeometryNode'] += 1
+        return self._node.nodeType == 'Geometry'
+
+    def __getattr__(self, name):
+        return getattr(self._node, name)
+
+    def __eq__(self, other):
+        return _unwrap(other) == self._node
+
+    def __hash__(self):
+        return hash(self._node)
+
+
+class vrdDecoreSettings(object):
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class vrdVirtualTouchpadButton(object):
+
+    def __init__(self, *args):
+        pass
+
+
+class _Enum(object):
+
+    def __getattr__(self, name):
+        return _Enum()
+
+
+# 以模块形式提供的 VRED 接口
+def _module(name, **members):
+    module = types.ModuleType(name)
+    module.__dict__.update(members)
+    return module
+
+
+def _vrNodePtr():
+    @counted('vrNodePtr.toNode')
+    def toNode(objectId):
+        return _registry.get(objectId, _invalidNode)
+    return _module('vrNodePtr', toNode=toNode)
+
+
+def _vrScenegraph():
+    @counted('vrScenegraph.getRootNode')
+    def getRootNode():
+        return scene.root
+
+    @counted('vrScenegraph.getSelectedNodes')
+    def getSelectedNodes():
+        return list(scene.selection)
+
+    @counted('vrScenegraph.getSelectedNode')
+    def getSelectedNode():
+        return scene.selection[0] if scene.selection else _invalidNode
+
+    @counted('vrScenegraph.selectNodes')
+    def selectNodes(nodes, clear=True):
+        scene.selection = [_unwrap(node) for node in nodes]
+
+    @counted('vrScenegraph.selectNode')
+    def selectNode(node, clear=True):
+        scene.selection = [_unwrap(node)]
+
+    @counted('vrScenegraph.moveNode')
+    def moveNode(node, oldParent, newParent):
+        _unwrap(newParent).addChild(_unwrap(node))
+
+    @counted('vrScenegraph.deleteNode')
+    def deleteNode(node, keepShared=False):
+        node = _unwrap(node)
+        if node.parent is not None:
+            node.parent.children.remove(node)
+            node.parent = None
+        for current in list(iterSubtree(node)):
+            _assignMaterial(current, None)
+            _registry.pop(current._id, None)
+
+    @counted('vrScenegraph.createNode')
+    def createNode(nodeType, name, parent):
+        return _unwrap(parent).addChild(MockNode(name, nodeType))
+
+    @counted('vrScenegraph.cloneNode')
+    def cloneNode(node, recursive=True):
+        node = _unwrap(node)
+        clone = MockNode(node._name, node.nodeType, node.bbox)
+        clone.primitiveCount = node.primitiveCount
+        clone.positions = node.positions
+        clone.indices = node.indices
+        _assignMaterial(clone, node.material)
+        if recursive:
+            for child in node.children:
+                clone.addChild(cloneNode(child, True))
+        if node.parent is not None:
+            node.parent.addChild(clone)
+        return clone
+
+    def updateScenegraph(flag=True):
+        pass
+
+    return _module('vrScenegraph', getRootNode=getRootNode, getSelectedNodes=getSelectedNodes,
+                   getSelectedNode=getSelectedNode, selectNodes=selectNodes, selectNode=selectNode,
+                   moveNode=moveNode, deleteNode=deleteNode, createNode=createNode, cloneNode=cloneNode,
+                   updateScenegraph=updateScenegraph)
+
+
+def _vrNodeUtils():
+    @counted('vrNodeUtils.getBoundingBoxCenter')
+    def getBoundingBoxCenter(node, world=True):
+        bbox = worldBoundingBox(_unwrap(node))
+        return Vec3((bbox[0] + bbox[3]) / 2, (bbox[1] + bbox[4]) / 2, (bbox[2] + bbox[5]) / 2)
+
+    @counted('vrNodeUtils.unshareCores')
+    def unshareCores(node):
+        pass
+
+    return _module('vrNodeUtils', getBoundingBoxCenter=getBoundingBoxCenter, unshareCores=unshareCores)
+
+
+def _vrOptimize():
+    @counted('vrOptimize.flushTransformations')
+    def flushTransformations(node):
+        pass
+
+    @counted('vrOptimize.mergeGeometry')
+    def mergeGeometry(node):
+        """ 将同一父节点下的几何体合并为一个 """
+        for parent in list(iterSubtree(_unwrap(node))):
+            geos = [child for child in parent.children if child.nodeType == 'Geometry']
+            if len(geos) < 2:
+                continue
+            merged = MockNode(geos[0]._name, 'Geometry', worldBoundingBox(geos[0]))
+            merged.bbox = list(worldBoundingBox(parent))
+            merged.primitiveCount = sum(geo.primitiveCount for geo in geos)
+            _assignMaterial(merged, geos[0].material)
+            for geo in geos:
+                parent.children.remove(geo)
+                geo.parent = None
+                for current in list(iterSubtree(geo)):
+                    _assignMaterial(current, None)
+                    _registry.pop(current._id, None)
+            parent.addChild(merged)
+
+    def noop(*args, **kwargs):
+        pass
+
+    return _module('vrOptimize', flushTransformations=flushTransformations, mergeGeometry=mergeGeometry,
+                   shareGeometries=counted('vrOptimize.shareGeometries')(noop),
+                   removeEmptyGeometries=noop, removeEmptyShells=noop, cleanupGroupNodes=noop)
+
+
+def _vrMaterialPtr():
+    @counted('vrMaterialPtr.getAllMaterials')
+    def getAllMaterials():
+        return list(scene.materials)
+
+    @counted('vrMaterialPtr.findMaterial')
+    def findMaterial(name):
+        for material in scene.materials:
+            if material._name == name:
+                return material
+        return MockMaterial(None)
+
+    @counted('vrMaterialPtr.createMaterial')
+    def createMaterial(materialType):
+        material = MockMaterial('', materialType)
+        scene.materials.append(material)
+        return material
+
+    def toMaterial(objectId):
+        for material in scene.materials:
+            if material._id == objectId:
+                return material
+        return MockMaterial(None)
+
+    @counted('vrMaterialPtr.addMaterialTag')
+    def addMaterialTag(material, tag):
+        material.tags.add(tag)
+
+    @counted('vrMaterialPtr.removeMaterialTag')
+    def removeMaterialTag(material, tag):
+        material.tags.discard(tag)
+
+    @counted('vrMaterialPtr.hasMaterialTag')
+    def hasMaterialTag(material, tag):
+        return tag in material.tags
+
+    return _module('vrMaterialPtr', getAllMaterials=getAllMaterials, findMaterial=findMaterial,
+                   createMaterial=createMaterial, toMaterial=toMaterial,
+                   addMaterialTag=addMaterialTag, removeMaterialTag=removeMaterialTag,
+                   hasMaterialTag=hasMaterialTag)
+
+
+class vrFieldAccess(object):
+
+    """ 字段访问 """
+
+    def __init__(self, container):
+        self.container = container if container is not None else FieldContainer()
+
+    def isValid(self):
+        return True
+
+    def hasField(self, name):
+        return name in self.container.fields
+
+    @counted('vrFieldAccess.getFieldContainer')
+    def getFieldContainer(self, name):
+        return self.container.fields.get(name)
+
+    def getBool(self, name):
+        return bool(self.container.fields.get(name, False))
+
+    @counted('vrFieldAccess.setBool')
+    def setBool(self, name, value):
+        self.container.fields[name] = value
+
+    def getInt32(self, name):
+        return int(self.container.fields.get(name, 0))
+
+    def getString(self, name):
+        return str(self.container.fields.get(name, ''))
+
+    def setVec3f(self, name, *values):
+        self.container.fields[name] = values
+
+    def setVec4f(self, name, *values):
+        self.container.fields[name] = values
+
+    def setMReal32(self, name, values):
+        self.container.fields[name] = list(values)
+
+    def getMReal32(self, name):
+        return list(self.container.fields.get(name, []))
+
+
+class _MaterialService(object):
+
+    @counted('vrMaterialService.getAllMaterials')
+    def getAllMaterials(self):
+        return list(scene.materials)
+
+    @counted('vrMaterialService.applyMaterialToNodes')
+    def applyMaterialToNodes(self, material, nodes):
+        for node in nodes:
+            _unwrap(node).applyMaterial(material)
+
+    @counted('vrMaterialService.findMaterial')
+    def findMaterial(self, name):
+        for material in scene.materials:
+            if material._name == name:
+                return material
+        return MockMaterial(None)
+
+    def getMaterialSelection(self):
+        return []
+
+
+class _NodeService(object):
+
+    def getSelectedNodes(self):
+        return list(scene.selection)
+
+    def initFindCache(self):
+        pass
+
+    def clearFindCache(self):
+        pass
+
+    def findNode(self, name, wildcard=False, includeComponents=False, root=None):
+        for node in iterSubtree(scene.root):
+            if node._name == name:
+                return node
+        return _invalidNode
+
+
+class _UndoService(object):
+
+    def __init__(self):
+        self.undoCount = 0
+
+    def beginUndo(self):
+        pass
+
+    def endUndo(self):
+        pass
+
+    def beginMultiCommand(self, name):
+        pass
+
+    def endMultiCommand(self):
+        pass
+
+    def undo(self):
+        self.undoCount += 1
+
+
+class _Signal(object):
+
+    def connect(self, *args):
+        pass
+
+    def disconnect(self, *args):
+        pass
+
+
+class _AnythingMeta(type):
+
+    """ 类属性访问同样返回替身，用于 QtCore.Qt.KeepAspectRatio 之类的常量 """
+
+    def __getattr__(cls, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _Anything()
+
+
+class _Anything(object, metaclass=_AnythingMeta):
+
+    """ 未实现的接口，任何属性访问和调用都返回替身 """
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _Anything()
+
+    def __call__(self, *args, **kwargs):
+        return _Anything()
+
+    def __getitem__(self, key):
+        return ''
+
+    def __iter__(self):
+        return iter(())
+
+    def __int__(self):
+        return 0
+
+    def __float__(self):
+        return 0.0
+
+
+class _QtModule(types.ModuleType):
+
+    """ PySide2 替身模块，所有类都是 _Anything """
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return _Anything
+
+
+class _QApplication(_Anything):
+
+    @staticmethod
+    def processEvents(*args):
+        pass
+
+
+def _qtModules():
+    QtCore = _QtModule('PySide2.QtCore')
+    QtGui = _QtModule('PySide2.QtGui')
+    QtWidgets = _QtModule('PySide2.QtWidgets')
+    QtWidgets.QApplication = _QApplication
+    QtWidgets.QWidget = _Anything
+    PySide2 = _module('PySide2', QtCore=QtCore, QtGui=QtGui, QtWidgets=QtWidgets)
+    return {'PySide2': PySide2, 'PySide2.QtCore': QtCore, 'PySide2.QtGui': QtGui, 'PySide2.QtWidgets': QtWidgets,
+            'shiboken2': _module('shiboken2', wrapInstance=lambda *args: _Anything())}
+
+
+class _Form(object):
+
+    def setupUi(self, widget):
+        pass
+
+
+def _uiTools():
+    return _module('uiTools', loadUiType=lambda path: (_Form, _Anything))
+
+
+def install():
+    """ 注册替身模块和 VRED 注入的全局服务，返回场景对象 """
+    modules = _qtModules()
+    modules.update({
+        'vrKernelServices': _module('vrKernelServices', vrdNode=vrdNode, vrdGeometryNode=vrdGeometryNode,
+                                    vrScenegraphTypes=_Enum(), vrdVirtualTouchpadButton=vrdVirtualTouchpadButton,
+                                    vrdDecoreSettings=vrdDecoreSettings, vrGeometryTypes=_Enum(),
+                                    vrMaterialTypes=_Enum()),
+        'vrController': _module('vrController', VRED_MSG_SELECTED_NODE=1, VRED_MSG_SELECTED_MATERIAL=2),
+        'vrFileIO': _module('vrFileIO', getFileIOFilePath=lambda: scene.filePath, save=lambda path: None),
+        'vrScenegraph': _vrScenegraph(),
+        'vrOptimize': _vrOptimize(),
+        'vrMaterialPtr': _vrMaterialPtr(),
+        'vrNodePtr': _vrNodePtr(),
+        'vrNodeUtils': _vrNodeUtils(),
+        'vrFieldAccess': _module('vrFieldAccess', vrFieldAccess=vrFieldAccess),
+        'vrGeometryEditor': _module('vrGeometryEditor', tessellateSurfaces=counted('vrGeometryEditor.tessellateSurfaces')(lambda *args: None)),
+        'vrFileDialog': _module('vrFileDialog', getSaveFileName=lambda *args: ''),
+        'uiTools': _uiTools(),
+    })
+    sys.modules.update(modules)
+
+    services = {
+        'vrMaterialService': _MaterialService(),
+        'vrNodeService': _NodeService(),
+        'vrUndoService': _UndoService(),
+        'vrMessageService': _module('vrMessageService', message=_Signal()),
+        'vrDecoreService': _Anything(),
+        'vrDeviceService': _Anything(),
+        'vrImmersiveInteractionService': _Anything(),
+        'VREDPluginWidget': _Anything(),
+        'VREDMainWindowId': 0,
+    }
+    for name, service in services.items():
+        setattr(builtins, name, service)
+    return scene
+
+
+def loadPlugin(path=None):
+    """ 在替身环境中加载 VredVRTools.py，返回插件实例 """
+    install()
+    if path is None:
+        path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'VredVRTools.py')
+    spec = importlib.util.spec_from_file_location('VredVRTools', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if module.importError:
+        raise ImportError('VredVRTools failed to import inside the mock environment')
+    plugin = module.VredVRTools
+    plugin._MessageBox = lambda message: None
+    return plugin
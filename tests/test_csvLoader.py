@@ -0,0 +1,26 @@
+from vrToolsCore import csvLoader
+from vrToolsCore.csvLoader import LoadStats
+
+
+def writeCsv(tmp_path, text, encoding='utf-8'):
+    path = tmp_path / 'names.csv'
+    path.write_bytes(text.encode(encoding))
+    return str(path)
+
+
+def test_unterminated_quote_skips_only_its_row(tmp_path):
+    path = writeCsv(tmp_path, 'id,name\n1,"M_1\n2,M_2\n3,M_3\n4,M_4\n')
+    stats = LoadStats()
+    assert csvLoader.loadColumn(path, stats=stats) == ['M_2', 'M_3', 'M_4']
+    assert stats.skipped == 1
+    assert stats.rows == 4
+
+
+def test_duplicates_and_short_rows(tmp_path):
+    # 分号分隔，GBK 编码
+    path = writeCsv(tmp_path, 'id;name\n1;材质\n2;材质\n3\n', 'gb18030')
+    stats = LoadStats()
+    assert csvLoader.loadColumn(path, stats=stats) == ['材质']
+    assert stats.delimiter == ';'
+    assert stats.duplicates == 1
+    assert stats.skipped == 1
@@ -0,0 +1,54 @@
+from vrToolsCore import decoreBatches
+from vrToolsCore.decoreBatches import MAX_RESOLUTION, MIN_RESOLUTION, TimingHistory
+
+
+def row(count):
+    # 沿 x 轴排列的单位立方体
+    return [(float(i), 0.0, 0.0, i + 1.0, 1.0, 1.0) for i in range(count)]
+
+
+def test_groups_respect_weight_cap():
+    boxes = row(100)
+    weights = [10] * 100
+    groups = decoreBatches.splitGroups(boxes, weights, 95)
+    assert sorted(idx for group in groups for idx in group) == list(range(100))
+    assert all(sum(weights[idx] for idx in group) <= 95 for group in groups)
+    # 空间上相邻的零件在同一组
+    for group in groups:
+        assert max(group) - min(group) == len(group) - 1
+
+
+def test_oversized_part_gets_own_group():
+    groups = decoreBatches.splitGroups(row(5), [1, 1, 100, 1, 1], 10)
+    assert [2] in groups
+    assert sorted(idx for group in groups for idx in group) == list(range(5))
+    assert decoreBatches.splitGroups([], [], 10) == []
+
+
+def test_resolution_range():
+    assert decoreBatches.resolutionFor(10.0) == MIN_RESOLUTION
+    assert decoreBatches.resolutionFor(1000.0, 2.0) == 512
+    assert decoreBatches.resolutionFor(1e9) == MAX_RESOLUTION
+
+
+def test_estimate_fits_history():
+    history = TimingHistory()
+    assert history.estimate(1000, 256, 2) is None
+    for primitives, resolution, steps in ((1000, 256, 2), (4000, 256, 2), (1000, 512, 4)):
+        history.add(primitives, resolution, steps, primitives * 1e-3 + resolution * resolution * steps * 1e-6)
+    assert abs(history.estimate(2000, 1024, 2) - (2.0 + 1024 * 1024 * 2 * 1e-6)) < 1e-6
+
+
+def test_estimate_falls_back_to_ratio():
+    # 两个特征成比例，方程退化
+    history = TimingHistory()
+    history.add(131072, 256, 2, 1.0)
+    history.add(262144, 256, 4, 2.0)
+    assert abs(history.estimate(393216, 256, 6) - 3.0) < 1e-9
+
+    # 最小二乘系数为负，按总耗时与总图元数量的比值估算
+    history = TimingHistory()
+    history.add(1000, 256, 1, 10.0)
+    history.add(2000, 256, 1, 5.0)
+    history.add(1000, 512, 1, 1.0)
+    assert abs(history.estimate(1000, 256, 1) - 4.0) < 1e-9
@@ -0,0 +1,28 @@
+from vrToolsCore import lodPlanner
+from vrToolsCore.tessellationPlanner import PRESETS
+
+
+def test_levels_use_coarsest_presets():
+    levels = lodPlanner.planLevels(4)
+    assert [level.suffix for level in levels] == ['_LOD1', '_LOD2', '_LOD3']
+    assert [level.parameters for level in levels] == [PRESETS[2], PRESETS[1], PRESETS[0]]
+    assert [level.decore for level in levels] == [(1024, 8), (512, 4), (256, 2)]
+
+    levels = lodPlanner.planLevels(2, useDecore=False)
+    assert [level.parameters for level in levels] == [PRESETS[0]]
+    assert levels[0].decore is None
+
+
+def test_level_count_is_clamped():
+    assert len(lodPlanner.planLevels(1)) == 1
+    assert len(lodPlanner.planLevels(10)) == lodPlanner.MAX_LEVELS - 1
+
+
+def test_switch_ranges_grow_with_level():
+    ranges = lodPlanner.switchRanges(20.0, 4)
+    assert len(ranges) == 3
+    assert ranges == sorted(ranges)
+    assert abs(ranges[0] - 40.0) < 1e-9
+    # 级别较少时使用最远的切换距离
+    assert lodPlanner.switchRanges(20.0, 2) == ranges[-1:]
+    assert lodPlanner.switchRanges(20.0, 4, 2.0) == [value * 2.0 for value in ranges]
@@ -0,0 +1,30 @@
+from vrToolsCore import matchScoring
+from vrToolsCore.matchScoring import BoxTable
+
+
+def table(rows):
+    result = BoxTable()
+    for center in rows:
+        result.append(center, (1.0, 1.0, 1.0), 1)
+    return result
+
+
+def test_exclusive_modes_fall_back_for_repeated_parts():
+    # 两个重复的新零件只有一个老零件候选，都应得到该老零件的材质
+    oldTable = table([(0.0, 0.0, 0.0)])
+    newTable = table([(0.1, 0.0, 0.0), (0.2, 0.0, 0.0)])
+    for mode in (matchScoring.MATCH_GREEDY, matchScoring.MATCH_ASSIGNMENT):
+        assert matchScoring.findMatches(oldTable, newTable, 5, 80, mode=mode) == [0, 0]
+
+
+def test_exclusive_assignment_is_kept_when_possible():
+    oldTable = table([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0)])
+    newTable = table([(0.9, 0.0, 0.0), (0.1, 0.0, 0.0)])
+    for mode in (matchScoring.MATCH_GREEDY, matchScoring.MATCH_ASSIGNMENT):
+        assert matchScoring.findMatches(oldTable, newTable, 5, 80, mode=mode) == [1, 0]
+
+
+def test_cancel_returns_none():
+    progress = matchScoring.MatchProgress()
+    progress.cancel()
+    assert matchScoring.findMatches(table([(0.0, 0.0, 0.0)]), table([(0.0, 0.0, 0.0)]), 5, 80, progress) is None
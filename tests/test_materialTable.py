@@ -0,0 +1,33 @@
+import pytest
+
+from vrToolsCore import materialTable
+
+
+def rows(count):
+    return [['M_%d' % i, 'M_%d' % i, 'Exact Match', None] for i in range(count)]
+
+
+def test_export_with_fewer_rows_removes_stale_parts(tmp_path):
+    path = str(tmp_path / 'MaterialData.csv')
+    assert len(materialTable.writeRows(path, rows(5), 2)) == 3
+    assert materialTable.writeRows(path, rows(3), 2) == [path, materialTable.partPath(path, 1)]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['MaterialData.csv', 'MaterialData_2.csv']
+
+
+def test_failed_export_removes_written_files(tmp_path):
+    path = str(tmp_path / 'MaterialData.csv')
+
+    def failing():
+        yield from rows(3)
+        raise ValueError('broken row')
+
+    with pytest.raises(ValueError):
+        materialTable.writeRows(path, failing(), 2)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_empty_export_writes_header(tmp_path):
+    path = str(tmp_path / 'MaterialData.csv')
+    assert materialTable.writeRows(path, []) == [path]
+    with open(path, encoding='utf-8') as f:
+        assert f.read().strip() == ','.join(materialTable.HEADER)
@@ -0,0 +1,25 @@
+from vrToolsCore.materialTagger import TagIndex
+
+
+def run(index, names, tags):
+    toTag, toUntag = index.update(names, lambda name: name, lambda name: name in tags)
+    tags.update(toTag)
+    tags.difference_update(toUntag)
+    return toTag, toUntag
+
+
+def test_tags_are_restored_after_undo():
+    index = TagIndex(['M_Paint'])
+    tags = set()
+    assert run(index, ['M_Paint', 'Mat_01'], tags) == (['Mat_01'], [])
+    # 撤销标记后再次运行时重新添加
+    tags.clear()
+    assert run(index, ['M_Paint', 'Mat_01'], tags) == (['Mat_01'], [])
+    assert index.report() == (1, 1, 1, 1)
+
+
+def test_stale_tags_from_loaded_scene_are_removed():
+    index = TagIndex(['M_Paint'])
+    tags = {'M_Paint', 'Mat_01'}
+    assert run(index, ['M_Paint', 'Mat_01'], tags) == ([], ['M_Paint'])
+    assert tags == {'Mat_01'}
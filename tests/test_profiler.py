@@ -0,0 +1,32 @@
+import collections
+import types
+
+from vrToolsCore import profiler
+
+
+class Service(object):
+
+    def getNodes(self):
+        return []
+
+
+def test_uninstall_removes_wrappers_of_class_methods():
+    service = Service()
+    module = types.ModuleType('vrModule')
+    module.createNode = lambda name: name
+    original = module.createNode
+
+    counts = collections.Counter()
+    counter = profiler.CallCounter({'service': service, 'vrModule': module})
+    counter.install(counts)
+    service.getNodes()
+    module.createNode('a')
+    counter.uninstall()
+
+    assert counts == {'service.getNodes': 1, 'vrModule.createNode': 1}
+    assert 'getNodes' not in service.__dict__
+    assert module.createNode is original
+
+
+def test_memory_tracking_is_off_by_default():
+    assert not profiler.Profiler().trackMemory
@@ -0,0 +1,34 @@
+from vrToolsCore import referenceTable
+from vrToolsCore.referenceTable import CONTAINS, EXACT, ReferenceTable
+
+
+def overlappingTable():
+    return ReferenceTable([
+        ('Chrome', CONTAINS, 'M_Chrome'),
+        ('Chrome_Dark', CONTAINS, 'M_ChromeDark'),
+    ])
+
+
+def test_exact_search_string_wins_over_contains():
+    assert overlappingTable().lookup('Chrome_Dark') == 'M_ChromeDark'
+    assert overlappingTable().lookup('Chrome') == 'M_Chrome'
+
+
+def test_longest_contains_hit_wins():
+    table = overlappingTable()
+    assert table.lookup('Door_Chrome_Dark_01') == 'M_ChromeDark'
+    assert table.lookup('Door_Chrome_01') == 'M_Chrome'
+
+
+def test_contains_is_case_sensitive():
+    assert overlappingTable().lookup('door_chrome_dark') is None
+
+
+def test_exact_rows_and_regex():
+    table = ReferenceTable([
+        ('Paint', EXACT, 'M_Paint'),
+        ('^Glass_[0-9]+$', referenceTable.REGEX, 'M_Glass'),
+    ])
+    assert table.lookup('Paint') == 'M_Paint'
+    assert table.lookup('Paint_01') is None
+    assert table.lookup('Glass_12') == 'M_Glass'
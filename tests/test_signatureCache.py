@@ -0,0 +1,37 @@
+from vrToolsCore import signatureCache
+from vrToolsCore.matchScoring import BoxTable
+
+
+class Material(object):
+
+    def __init__(self, objectId, name):
+        self.objectId = objectId
+        self.name = name
+
+
+def resolve(materials, sceneMaterials):
+    return signatureCache.resolveMaterials(materials, sceneMaterials, lambda mat: mat.objectId, lambda mat: mat.name)
+
+
+def test_resolve_by_id_then_unique_name():
+    paint = Material(1, 'Paint')
+    chrome = Material(2, 'Chrome')
+    # 对象 ID 变化（重新加载场景）时按唯一的名称查找
+    assert resolve([('Paint', 1), ('Chrome', 7)], [paint, chrome]) == [paint, chrome]
+
+
+def test_duplicate_or_missing_names_are_unresolved():
+    first = Material(1, 'Paint')
+    second = Material(2, 'Paint')
+    assert resolve([('Paint', 2), ('Paint', 9), ('Glass', 3)], [first, second]) == [second, None, None]
+
+
+def test_save_and_load_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(signatureCache, 'cacheDir', lambda: str(tmp_path))
+    table = BoxTable()
+    table.append((0.0, 1.0, 2.0), (1.0, 1.0, 1.0), 3)
+    path = str(tmp_path / 'ref.vrsig')
+    signatureCache.save(path, table, [('Paint', 42)])
+    loaded, materials = signatureCache.load(path)
+    assert len(loaded) == 1
+    assert materials == [('Paint', 42)]
@@ -0,0 +1,41 @@
+import math
+import random
+
+from vrToolsCore import spatialIndex
+from vrToolsCore.spatialIndex import SpatialGrid
+
+
+def bruteForce(points, point, radius):
+    return [idx for idx, other in enumerate(points) if math.dist(point, other) <= radius]
+
+
+def randomPoints(rng, count, span):
+    return [(rng.uniform(-span, span), rng.uniform(-span, span), rng.uniform(-span, span)) for _ in range(count)]
+
+
+def test_grid_matches_brute_force():
+    rng = random.Random(7)
+    # 包含负坐标和落在格子边界上的点
+    points = randomPoints(rng, 500, 50.0) + [(0.0, 0.0, 0.0), (5.0, 0.0, 0.0), (-5.0, 5.0, -5.0)]
+    grid = spatialIndex.buildGrid(points, 5.0)
+    queries = randomPoints(rng, 200, 55.0) + [(0.0, 0.0, 0.0), (2.5, 0.0, 0.0)]
+    for query in queries:
+        assert grid.query(query, 5.0) == bruteForce(points, query, 5.0)
+
+
+def test_radius_larger_than_cell_size():
+    rng = random.Random(11)
+    points = randomPoints(rng, 300, 20.0)
+    grid = SpatialGrid(2.0)
+    for point in points:
+        grid.insert(point)
+    for query in randomPoints(rng, 50, 20.0):
+        for radius in (0.0, 1.0, 4.5, 9.0):
+            assert grid.query(query, radius) == bruteForce(points, query, radius)
+
+
+def test_non_positive_cell_size():
+    grid = spatialIndex.buildGrid([(0.0, 0.0, 0.0), (0.5, 0.0, 0.0)], 0)
+    assert grid.cellSize == 1.0
+    assert len(grid) == 2
+    assert grid.query((0.0, 0.0, 0.0), 0.5) == [0, 1]
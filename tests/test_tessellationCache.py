@@ -0,0 +1,33 @@
+from vrToolsCore import signatureCache, tessellationCache
+from vrToolsCore.tessellationCache import TessellationCache
+
+BOX = (0.0, 0.0, 0.0, 10.0, 10.0, 10.0)
+PARAMETERS = (0.075, 10.0, 200.0, True, 0.1, False)
+
+
+def state(surfaceHashes=('a', 'b')):
+    return tessellationCache.fingerprint(['Surface_1'], list(surfaceHashes), 100, [], BOX)
+
+
+def test_clean_until_parameters_change():
+    records = TessellationCache()
+    records.update('/Root/Part', state(), PARAMETERS)
+    assert records.isClean('/Root/Part', state(), PARAMETERS)
+    assert not records.isClean('/Root/Part', state(), (0.15,) + PARAMETERS[1:])
+    assert not records.isClean('/Root/Other', state(), PARAMETERS)
+
+
+def test_surface_content_change_is_dirty():
+    # 名称、图元数量和边界框不变，只有曲面网格改变
+    records = TessellationCache()
+    records.update('/Root/Part', state(), PARAMETERS)
+    assert not records.isClean('/Root/Part', state(('a', 'c')), PARAMETERS)
+
+
+def test_records_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(signatureCache, 'cacheDir', lambda: str(tmp_path))
+    path = str(tmp_path / 'scene.vrtess')
+    records = TessellationCache(path)
+    records.update('/Root/Part', state(), PARAMETERS)
+    records.save()
+    assert TessellationCache(path).isClean('/Root/Part', state(), PARAMETERS)
@@ -0,0 +1,36 @@
+from vrToolsCore import tessellationPlanner
+from vrToolsCore.tessellationPlanner import MAX_DEVIATION, MIN_DEVIATION
+
+
+def parts(count=50):
+    diagonals = [10.0 * (1 + i % 7) for i in range(count)]
+    triangles = [1000 * (1 + i % 5) for i in range(count)]
+    return diagonals, triangles
+
+
+def test_estimate_close_to_feasible_budget():
+    diagonals, triangles = parts()
+    for budget in (50000, 200000):
+        parameters, estimate = tessellationPlanner.planParameters(diagonals, triangles, budget, 0.075)
+        assert len(parameters) == len(diagonals)
+        # 量化到 2 的半次幂，估算值不超过预算的 1.2 倍
+        assert budget * 0.5 < estimate <= budget * 1.2
+        assert all(MIN_DEVIATION <= parameter[0] <= MAX_DEVIATION for parameter in parameters)
+
+
+def test_infeasible_budget_clamps_to_coarsest():
+    diagonals, triangles = parts()
+    parameters, estimate = tessellationPlanner.planParameters(diagonals, triangles, 100, 0.075)
+    assert all(parameter[0] == MAX_DEVIATION for parameter in parameters)
+    # 全部使用最粗糙的参数仍超出预算，由调用方提示
+    assert estimate > 100
+
+
+def test_larger_parts_get_coarser_deviation():
+    parameters, estimate = tessellationPlanner.planParameters([10.0, 1000.0], [1000, 1000], 2000, 0.075)
+    assert parameters[0][0] < parameters[1][0]
+
+
+def test_group_by_parameters_keeps_first_order():
+    groups = tessellationPlanner.groupByParameters([(0.1,), (0.2,), (0.1,)])
+    assert list(groups.items()) == [((0.1,), [0, 2]), ((0.2,), [1])]
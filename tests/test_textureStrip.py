@@ -0,0 +1,48 @@
+from vrToolsCore import textureStrip
+from vrToolsCore.textureStrip import StripStats
+
+
+class Fields(object):
+
+    def __init__(self, fields):
+        self.fields = fields
+
+    def hasField(self, name):
+        return name in self.fields
+
+    def getFieldContainer(self, name):
+        return self.fields[name]
+
+    def getBool(self, name):
+        return self.fields.get(name, False)
+
+    def setBool(self, name, value):
+        self.fields[name] = value
+
+
+def material(image):
+    return Fields({'diffuseComponent': Fields({'useTexture': True, 'image': image}),
+                   'bumpComponent': Fields({'useTexture': True, 'image': image})})
+
+
+def measure(component):
+    return component.getFieldContainer('image'), 1000
+
+
+def test_shared_image_counted_once():
+    # 两个材质的四个通道共用同一张图像
+    stats = StripStats()
+    image = object()
+    for componentData in (material(image), material(image)):
+        textureStrip.stripMaterial(componentData, lambda container: container, stats, True, measure)
+    assert stats.textures == 4
+    assert len(stats.seenImages) == 1
+    assert stats.bytes == 1000
+
+
+def test_dry_run_keeps_textures():
+    componentData = material(object())
+    textureStrip.stripMaterial(componentData, lambda container: container, StripStats(), True)
+    assert componentData.fields['diffuseComponent'].getBool('useTexture')
+    textureStrip.stripMaterial(componentData, lambda container: container, StripStats())
+    assert not componentData.fields['diffuseComponent'].getBool('useTexture')
@@ -0,0 +1,4 @@
+"""
+VredVRTools 的纯 Python 核心模块
+不依赖 VRED 运行环境，供插件主文件调用
+"""
@@ -0,0 +1,56 @@
+"""
+细分后边界框清理
+细分曲面后，将每个曲面的边界框与所属几何体细分前的边界框比较，超出原边界框的曲面需要删除。
+全部边界框收集到连续数组后一次完成比较，安装了 NumPy 时使用向量化计算，否则退回纯 Python 实现。
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def outsideFlags(originals, owners, boxes, tolerance, useNumpy=None):
+    """ 判断每个曲面是否超出所属几何体的原边界框
+        与原有判断一致：六项比较（最小值不小于原最小值减容差、最大值不大于原最大值加容差）
+        结果不完全相同时视为超出；全部不满足（曲面在每个方向上都包住原边界框）时不视为超出
+        Args:
+            originals (list): 几何体细分前的边界框 (x1, y1, z1, x2, y2, z2)
+            owners (list of int): 每个曲面所属几何体在 originals 中的序号
+            boxes (list): 曲面的边界框
+            tolerance (float): 容差
+            useNumpy (bool): None 时自动检测
+        Returns:
+            list of bool: 每个曲面是否超出
+    """
+    if not boxes:
+        return []
+    if useNumpy is None:
+        useNumpy = np is not None
+    if useNumpy and np is not None:
+        return _outsideNumpy(originals, owners, boxes, tolerance)
+    return _outsidePython(originals, owners, boxes, tolerance)
+
+
+def _outsideNumpy(originals, owners, boxes, tolerance):
+    reference = np.asarray(originals, dtype=np.float64).reshape(-1, 6)[np.asarray(owners, dtype=np.intp)]
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 6)
+    tests = np.empty((len(boxes), 6), dtype=bool)
+    tests[:, :3] = reference[:, :3] - tolerance <= boxes[:, :3]
+    tests[:, 3:] = reference[:, 3:] + tolerance >= boxes[:, 3:]
+    passed = tests.sum(axis=1)
+    return ((passed != 0) & (passed != 6)).tolist()
+
+
+def _outsidePython(originals, owners, boxes, tolerance):
+    flags = []
+    for owner, box in zip(owners, boxes):
+        reference = originals[owner]
+        passed = 0
+        for idx in range(3):
+            if reference[idx] - tolerance <= box[idx]:
+                passed += 1
+        for idx in range(3, 6):
+            if reference[idx] + tolerance >= box[idx]:
+                passed += 1
+        flags.append(passed != 0 and passed != 6)
+    return flags
@@ -0,0 +1,169 @@
+"""
+CSV 表格流式读取
+根据文件开头的字节判断 BOM 和编码，逐行解析，不把整个文件读入内存；
+格式错误的行被跳过并计数，不会导致整个文件读取失败。
+"""
+import codecs
+import csv
+
+
+# 用于判断编码的文件开头字节数
+SNIFF_SIZE = 65536
+
+# 按长度从长到短检查，UTF-32 LE 的 BOM 以 UTF-16 LE 的 BOM 开头
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# 不是 UTF 编码时的后备编码，中文系统下 Excel 默认以 GBK 保存 CSV
+FALLBACK_ENCODING = 'gb18030'
+
+DELIMITERS = ',;\t'
+
+
+class LoadStats(object):
+
+    """ 读取统计 """
+
+    def __init__(self):
+        self.encoding = None
+        self.delimiter = None
+        self.rows = 0
+        # 列数不足或无法解析的行
+        self.skipped = 0
+        self.duplicates = 0
+
+
+def sniffEncoding(head):
+    """ 根据文件开头的字节判断编码
+        Args:
+            head (bytes): 文件开头的字节
+        Returns:
+            str: 可直接用于 open() 的编码名称，带 BOM 的编码会在读取时去掉 BOM
+    """
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+
+    # 没有 BOM 的 UTF-16：ASCII 字符的高位字节为 0
+    if len(head) >= 4:
+        even = head[0::2].count(0)
+        odd = head[1::2].count(0)
+        half = len(head) // 2
+        if odd > half * 0.3 and even < half * 0.05:
+            return 'utf-16-le'
+        if even > half * 0.3 and odd < half * 0.05:
+            return 'utf-16-be'
+
+    # 开头字节可能截断在多字节字符中间，使用增量解码器且不结束解码
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(head, False)
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+    return 'utf-8'
+
+
+def sniffFileEncoding(path):
+    """ 判断文件编码，开头部分全部为 ASCII 时继续按块检查，直到遇到非 ASCII 字节 """
+    with open(path, 'rb') as f:
+        head = f.read(SNIFF_SIZE)
+        encoding = sniffEncoding(head)
+        if encoding != 'utf-8' or not head.isascii():
+            return encoding
+
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        while True:
+            chunk = f.read(SNIFF_SIZE)
+            if not chunk:
+                return encoding
+            if chunk.isascii():
+                continue
+            try:
+                decoder.decode(chunk, False)
+                decoder.decode(f.read(SNIFF_SIZE), False)
+            except UnicodeDecodeError:
+                return FALLBACK_ENCODING
+            return encoding
+
+
+def sniffDelimiter(line):
+    """ 返回首行中出现次数最多的分隔符，默认为逗号 """
+    counts = [(line.count(delimiter), delimiter) for delimiter in DELIMITERS]
+    count, delimiter = max(counts)
+    return delimiter if count > 0 else ','
+
+
+def iterRows(path, encoding=None, stats=None):
+    """ 逐行读取 CSV 文件，产出字段列表
+        Args:
+            path (str): 文件路径
+            encoding (str): None 时根据文件内容判断
+            stats (LoadStats): None 或用于记录编码、行数和跳过行数
+    """
+    if stats is None:
+        stats = LoadStats()
+
+    if encoding is None:
+        encoding = sniffFileEncoding(path)
+    stats.encoding = encoding
+
+    # 无法解码的字节替换为占位符，只影响所在的字段
+    with open(path, 'r', encoding=encoding, errors='replace', newline='') as f:
+        first = f.readline()
+        stats.delimiter = sniffDelimiter(first)
+        f.seek(0)
+
+        # 每个物理行单独解析，未闭合的引号只影响所在的行，不会吞掉之后的行；
+        # 字段内含换行的行也按格式错误处理
+        for line in _cleanLines(f):
+            try:
+                row = next(csv.reader([line], delimiter=stats.delimiter, strict=True))
+            except csv.Error:
+                stats.skipped += 1
+                continue
+            stats.rows += 1
+            yield row
+
+
+def _cleanLines(lines):
+    # csv 模块遇到 NUL 字符会报错，直接去掉
+    for line in lines:
+        if '\0' in line:
+            line = line.replace('\0', '')
+        yield line
+
+
+def loadColumn(path, column=1, header=True, encoding=None, stats=None):
+    """ 读取一列并去重，保持首次出现的顺序
+        Args:
+            path (str): 文件路径
+            column (int): 列序号
+            header (bool): 是否跳过首行表头
+            encoding (str): None 时根据文件内容判断
+            stats (LoadStats): None 或用于记录读取统计
+        Returns:
+            list: 去掉首尾空白后的非空值
+    """
+    if stats is None:
+        stats = LoadStats()
+
+    # dict 保持插入顺序，作为有序集合使用
+    values = {}
+    for index, row in enumerate(iterRows(path, encoding, stats)):
+        if header and index == 0:
+            continue
+        if len(row) <= column:
+            stats.skipped += 1
+            continue
+        value = row[column].strip()
+        if not value:
+            continue
+        if value in values:
+            stats.duplicates += 1
+            continue
+        values[value] = None
+    return list(values)
@@ -0,0 +1,144 @@
+"""
+分批去除内部面
+按零件中心点沿最长轴递归二分，得到空间上相邻、图元数量接近的若干组，每组分别调用 decore；
+每组的分辨率按组的边界框尺寸选择，并记录每组耗时，用于估算之后运行的时间。
+"""
+import json
+import os
+
+# 分辨率范围，取 2 的幂
+MIN_RESOLUTION = 256
+MAX_RESOLUTION = 4096
+# 默认每像素对应的场景长度（毫米）
+DEFAULT_CELL_SIZE = 2.0
+# 耗时记录最多保留的条数
+HISTORY_LIMIT = 200
+
+
+def historyPath():
+    """ 耗时记录文件路径 """
+    return os.path.join(os.path.expanduser('~'), '.VredVRTools', 'decore_history.json')
+
+
+def groupBounds(boxes, indices):
+    """ 一组零件的合并边界框 """
+    bounds = list(boxes[indices[0]])
+    for idx in indices[1:]:
+        box = boxes[idx]
+        for axis in range(3):
+            bounds[axis] = min(bounds[axis], box[axis])
+            bounds[axis + 3] = max(bounds[axis + 3], box[axis + 3])
+    return bounds
+
+
+def extentOf(bounds):
+    """ 边界框最长边 """
+    return max(bounds[3] - bounds[0], bounds[4] - bounds[1], bounds[5] - bounds[2])
+
+
+def resolutionFor(extent, cellSize=DEFAULT_CELL_SIZE):
+    """ 使每像素不大于 cellSize 的最小 2 的幂分辨率，限制在范围内 """
+    resolution = MIN_RESOLUTION
+    while resolution < MAX_RESOLUTION and resolution * cellSize < extent:
+        resolution *= 2
+    return resolution
+
+
+def splitGroups(boxes, weights, maxWeight):
+    """ 将零件分组，每组总权重不超过 maxWeight（单个零件超过时单独成组）
+        Args:
+            boxes (list): 零件边界框 (x1, y1, z1, x2, y2, z2)
+            weights (list of int): 零件权重，如图元数量
+            maxWeight (int): 每组最大权重
+        Returns:
+            list of list: 每组的零件序号，空间上相邻的零件在同一组
+    """
+    centers = [((box[0] + box[3]) / 2.0, (box[1] + box[4]) / 2.0, (box[2] + box[5]) / 2.0) for box in boxes]
+    groups = []
+    stack = [list(range(len(boxes)))] if boxes else []
+    while stack:
+        indices = stack.pop()
+        total = sum(weights[idx] for idx in indices)
+        if total <= maxWeight or len(indices) == 1:
+            groups.append(indices)
+            continue
+
+        # 沿中心点分布最长的轴排序，在权重各占一半处切分
+        spans = [max(centers[idx][axis] for idx in indices) - min(centers[idx][axis] for idx in indices)
+                 for axis in range(3)]
+        axis = spans.index(max(spans))
+        indices.sort(key=lambda idx: centers[idx][axis])
+        half = total / 2.0
+        running = 0
+        split = 1
+        for position, idx in enumerate(indices[:-1]):
+            running += weights[idx]
+            split = position + 1
+            if running >= half:
+                break
+        stack.append(indices[split:])
+        stack.append(indices[:split])
+    return groups
+
+
+class TimingHistory(object):
+
+    """ 每组去除内部面的耗时记录，按 图元数量 与 分辨率平方 × 质量级数 线性估算耗时 """
+
+    def __init__(self, path=None):
+        self.path = path
+        # (图元数量, 分辨率, 质量级数, 秒)
+        self.entries = []
+        if path is not None:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = [tuple(entry) for entry in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            self.entries = []
+
+    def save(self):
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        tmpPath = self.path + '.tmp'
+        with open(tmpPath, 'w', encoding='utf-8') as f:
+            json.dump(self.entries[-HISTORY_LIMIT:], f)
+        os.replace(tmpPath, self.path)
+
+    def add(self, primitives, resolution, qualitySteps, seconds):
+        self.entries.append((primitives, resolution, qualitySteps, seconds))
+        del self.entries[:-HISTORY_LIMIT]
+
+    @staticmethod
+    def _features(primitives, resolution, qualitySteps):
+        return float(primitives), float(resolution) * resolution * qualitySteps
+
+    def estimate(self, primitives, resolution, qualitySteps):
+        """ 估算耗时（秒），没有记录时返回 None """
+        if not self.entries:
+            return None
+        rows = [(self._features(p, r, q), s) for p, r, q, s in self.entries]
+
+        # 两个系数的最小二乘，方程退化或系数为负时按总耗时与总图元数量的比值估算
+        a11 = sum(f[0] * f[0] for f, s in rows)
+        a12 = sum(f[0] * f[1] for f, s in rows)
+        a22 = sum(f[1] * f[1] for f, s in rows)
+        b1 = sum(f[0] * s for f, s in rows)
+        b2 = sum(f[1] * s for f, s in rows)
+        determinant = a11 * a22 - a12 * a12
+        x, y = self._features(primitives, resolution, qualitySteps)
+        if determinant > 1e-9 * max(a11 * a22, 1e-300):
+            c1 = (b1 * a22 - b2 * a12) / determinant
+            c2 = (a11 * b2 - a12 * b1) / determinant
+            if c1 >= 0 and c2 >= 0:
+                return c1 * x + c2 * y
+        totalPrimitives = sum(f[0] for f, s in rows)
+        totalSeconds = sum(s for f, s in rows)
+        if totalPrimitives <= 0:
+            return totalSeconds / len(rows)
+        return totalSeconds / totalPrimitives * x
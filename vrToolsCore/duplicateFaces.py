@@ -0,0 +1,87 @@
+"""
+重复面检测
+按容差量化边界框中心点分桶，一次遍历即可找出重复面。
+签名包括中心点、边界框尺寸、图元数量和可选的顶点哈希。
+"""
+import math
+
+
+class FaceSignature(object):
+
+    """
+    面的签名
+    """
+
+    __slots__ = ('center', 'extents', 'primitiveCount', 'vertexHash')
+
+    def __init__(self, center, extents, primitiveCount, vertexHash=None):
+        """
+            Args:
+                center (tuple of float): 边界框中心点
+                extents (tuple of float): 边界框尺寸 (dx, dy, dz)
+                primitiveCount (int): 图元数量，未知时为 None
+                vertexHash (str): None 或顶点哈希，见 geometryHash.contentHash
+        """
+        self.center = tuple(center)
+        self.extents = tuple(extents)
+        self.primitiveCount = primitiveCount
+        self.vertexHash = vertexHash
+
+
+def _within(a, b, tolerance):
+    for x, y in zip(a, b):
+        if abs(x - y) > tolerance:
+            return False
+    return True
+
+
+def _cell(center, tolerance):
+    if tolerance <= 0:
+        return center
+    return tuple(int(math.floor(value / tolerance)) for value in center)
+
+
+def _neighbourCells(cell, tolerance):
+    if tolerance <= 0:
+        yield cell
+        return
+    x, y, z = cell
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                yield (x + dx, y + dy, z + dz)
+
+
+def findDuplicates(signatures, tolerance=0.0):
+    """ 找出重复面分组
+        中心点和边界框尺寸在容差内、图元数量和顶点哈希相同的面视为重复
+        Args:
+            signatures (list of FaceSignature): 面签名
+            tolerance (float): 坐标容差，0 表示精确比较
+        Returns:
+            list of list of int: 包含两个及以上成员的分组，组内按原顺序排列
+    """
+    buckets = {}
+    groups = []
+    for idx, signature in enumerate(signatures):
+        exact = (signature.primitiveCount, signature.vertexHash)
+        cell = _cell(signature.center, tolerance)
+
+        found = None
+        for neighbour in _neighbourCells(cell, tolerance):
+            for groupIdx in buckets.get((exact, neighbour), ()):
+                first = signatures[groups[groupIdx][0]]
+                if _within(first.center, signature.center, tolerance) \
+                        and _within(first.extents, signature.extents, tolerance):
+                    found = groupIdx
+                    break
+            if found is not None:
+                break
+
+        if found is None:
+            buckets.setdefault((exact, cell), []).append(len(groups))
+            groups.append([idx])
+        else:
+            groups[found].append(idx)
+
+    return [group for group in groups if len(group) > 1]
@@ -0,0 +1,65 @@
+"""
+几何体内容哈希
+按块读取顶点和索引缓冲区计算哈希值，不复制整个缓冲区，
+内容完全相同的几何体哈希值相同，用于查找相同零件、重新共享几何体和删除重复面。
+"""
+import hashlib
+from array import array
+
+# 每次写入哈希的元素数量
+CHUNK_SIZE = 65536
+# 哈希值字节数
+DIGEST_SIZE = 16
+
+
+def _update(digest, values, typecode, chunkSize):
+    """ 按块写入哈希，支持列表和实现了缓冲区协议的数组，结果与元素类型无关 """
+    digest.update(typecode.encode('ascii'))
+    digest.update(len(values).to_bytes(8, 'little'))
+    try:
+        view = memoryview(values)
+    except TypeError:
+        view = None
+
+    if view is not None and view.ndim == 1 and view.format == typecode:
+        # 类型一致的缓冲区对象直接切片，不产生副本
+        view = view.cast('B')
+        step = chunkSize * array(typecode).itemsize
+        for start in range(0, len(view), step):
+            digest.update(view[start:start + step])
+        return
+
+    for start in range(0, len(values), chunkSize):
+        digest.update(array(typecode, values[start:start + chunkSize]).tobytes())
+
+
+def contentHash(positions, indices=None, chunkSize=CHUNK_SIZE):
+    """ 计算几何体内容哈希
+        Args:
+            positions (sequence of float): 顶点坐标 x0, y0, z0, x1, ...
+            indices (sequence of int): None 或索引缓冲区
+            chunkSize (int): 每块元素数量
+        Returns:
+            str: 十六进制哈希值
+    """
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    _update(digest, positions, 'f', chunkSize)
+    if indices is not None:
+        _update(digest, indices, 'I', chunkSize)
+    return digest.hexdigest()
+
+
+def groupIdentical(items, hashFunction):
+    """ 按内容哈希分组
+        Args:
+            items (list): 待分组对象
+            hashFunction (function): hashFunction(item)->str，返回 None 的对象不参与分组
+        Returns:
+            list of list: 包含两个及以上成员的分组，组内按原顺序排列
+    """
+    groups = {}
+    for item in items:
+        key = hashFunction(item)
+        if key is not None:
+            groups.setdefault(key, []).append(item)
+    return [group for group in groups.values() if len(group) > 1]
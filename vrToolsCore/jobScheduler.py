@@ -0,0 +1,74 @@
+"""
+分块任务调度
+VRED 场景接口只能在主线程调用，长时间操作被拆分为多个小任务，
+每执行完一块（达到时间预算）就交还事件循环，界面保持响应，并支持取消和记录每块耗时。
+"""
+import time
+
+
+class ChunkedJobRunner(object):
+
+    """
+    按时间预算分块执行任务
+    任务为无参数的可调用对象，可以由生成器惰性产生，前一个任务执行完成后才会取下一个任务
+    """
+
+    def __init__(self, jobs, timeBudget=0.1, yieldFunction=None, progressFunction=None):
+        """
+            Args:
+                jobs (iterable): 任务序列，元素为 (name, function)
+                timeBudget (float): 每块的时间预算（秒），至少执行一个任务
+                yieldFunction (function): None 或每块结束后调用，用于处理界面事件
+                progressFunction (function): None 或 progressFunction(jobCount) 每块结束后调用
+        """
+        self.jobs = jobs
+        self.timeBudget = timeBudget
+        self.yieldFunction = yieldFunction
+        self.progressFunction = progressFunction
+        self.cancelled = False
+        self.jobCount = 0
+        # 每块记录 (块序号, 任务数, 耗时, 任务名称列表)
+        self.timings = []
+        # 每个任务名称的累计耗时
+        self.jobTimes = {}
+
+    def cancel(self):
+        """ 请求取消，当前任务执行完成后停止 """
+        self.cancelled = True
+
+    def run(self):
+        """ 执行全部任务，全部完成返回 True，中途被取消返回 False """
+        jobs = iter(self.jobs)
+        finished = False
+        while not finished and not self.cancelled:
+            chunkStart = time.perf_counter()
+            names = []
+            while True:
+                job = next(jobs, None)
+                if job is None:
+                    finished = True
+                    break
+                name, function = job
+                jobStart = time.perf_counter()
+                function()
+                self.jobTimes[name] = self.jobTimes.get(name, 0.0) + time.perf_counter() - jobStart
+                self.jobCount += 1
+                names.append(name)
+                if self.cancelled or time.perf_counter() - chunkStart >= self.timeBudget:
+                    break
+
+            if names:
+                self.timings.append((len(self.timings), len(names), time.perf_counter() - chunkStart, names))
+            if self.progressFunction is not None:
+                self.progressFunction(self.jobCount)
+            if self.yieldFunction is not None:
+                self.yieldFunction()
+        return finished
+
+    def report(self, limit=10):
+        """ 返回总耗时和最慢的几个块 """
+        total = sum(timing[2] for timing in self.timings)
+        lines = ['%d jobs in %d chunks, %.3fs' % (self.jobCount, len(self.timings), total)]
+        for index, count, seconds, names in sorted(self.timings, key=lambda timing: -timing[2])[:limit]:
+            lines.append('chunk %d: %d jobs, %.3fs (%s)' % (index, count, seconds, ', '.join(names[:3])))
+        return '\n'.join(lines)
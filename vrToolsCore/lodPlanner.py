@@ -0,0 +1,56 @@
+"""
+LOD 级别规划
+第 0 级为原始几何体，其余级别由细分预设从精细到粗糙依次生成，粗糙级别再以较低分辨率去除内部面；
+切换距离按零件边界框对角线计算，零件在视野中的大小（对角线与距离之比）低于阈值时切换到下一级。
+"""
+from .tessellationPlanner import PRESETS
+
+# 最多级别数量，包含原始几何体
+MAX_LEVELS = 4
+# 各级别切换时对角线与距离的比值，从精细到粗糙
+SWITCH_RATIOS = (0.5, 0.15, 0.05)
+# 各细分预设对应的去除内部面分辨率和质量级数，与 PRESETS 顺序一致，None 为不去除
+DECORE_SETTINGS = ((256, 2), (512, 4), (1024, 8), None)
+
+
+class LodLevel(object):
+
+    """ 一个 LOD 级别的细分参数和去除内部面设置 """
+
+    def __init__(self, index, parameters, decore):
+        self.index = index
+        # (弦高误差, 法线容差, 最大弦长)
+        self.parameters = parameters
+        # None 或 (分辨率, 质量级数)
+        self.decore = decore
+
+    @property
+    def suffix(self):
+        return '_LOD%d' % self.index
+
+
+def planLevels(count, useDecore=True):
+    """ 第 1 级到第 count - 1 级的参数，使用最粗糙的 count - 1 个细分预设
+        Args:
+            count (int): 级别数量，包含原始几何体，2 到 MAX_LEVELS
+            useDecore (bool): 是否对粗糙级别去除内部面
+    """
+    count = min(max(count, 2), MAX_LEVELS)
+    levels = []
+    for index in range(1, count):
+        preset = count - 1 - index
+        decore = DECORE_SETTINGS[preset] if useDecore else None
+        levels.append(LodLevel(index, PRESETS[preset], decore))
+    return levels
+
+
+def switchRanges(diagonal, count, scale=1.0):
+    """ 各级别的切换距离，共 count - 1 个，从近到远
+        Args:
+            diagonal (float): 零件边界框对角线长度
+            count (int): 级别数量
+            scale (float): 距离系数，越大越晚切换到粗糙级别
+    """
+    count = min(max(count, 2), MAX_LEVELS)
+    diagonal = max(diagonal, 1e-3)
+    return [diagonal / ratio * scale for ratio in SWITCH_RATIOS[MAX_LEVELS - count:]]
@@ -0,0 +1,419 @@
+"""
+材质匹配评分引擎
+将边界框数据打包为连续数组，按候选块批量计算中心点距离、对角线余弦相似度、
+边界框大小比例和组件数量比例。安装了 NumPy 时使用向量化计算，否则退回纯 Python 实现，
+两种实现的判断结果与原有阈值逻辑一致。
+"""
+import math
+
+from . import spatialIndex
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# 对角线向量余弦相似度阈值
+COS_THRESHOLD = 0.8
+# 组件数量比例阈值
+COMPONENT_THRESHOLD = 0.5
+
+# 匹配模式：保留最后一个满足条件的老对象（旧版行为）
+MATCH_LAST = 0
+# 匹配模式：按代价从小到大贪心分配，老对象优先只分配一次
+MATCH_GREEDY = 1
+# 匹配模式：按连通分量求全局最优分配（匈牙利算法），老对象优先只分配一次
+MATCH_ASSIGNMENT = 2
+# 以上两种模式中，一对一分配后仍未分配的新对象退回代价最小的候选，重复、实例化的零件可以共用同一老对象
+
+# 全局最优分配时单个连通分量的最大规模（新老对象数量的几何平均），超出时该分量退回贪心分配
+ASSIGNMENT_LIMIT = 200
+
+
+def ratio(a, b):
+    """ 计算比较百分比，a 与 b 相等时为 1，否则为较小值除以较大值 """
+    percent = 1
+    if a < b:
+        if b != 0:
+            percent = a / b
+        else:
+            percent = 0
+    if a > b:
+        if a != 0:
+            percent = b / a
+        else:
+            percent = 0
+    return percent
+
+
+class BoxTable(object):
+
+    """
+    边界框数据表
+    每行记录一个几何体的边界框中心点、对角线向量和子节点数量
+    """
+
+    def __init__(self):
+        self.centers = []
+        self.diagonals = []
+        self.childCounts = []
+        self._sizes = None
+        self._arrays = None
+
+    def append(self, center, diagonal, childCount):
+        """ 添加一行
+            Args:
+                center (tuple of float): 边界框中心点 (x, y, z)
+                diagonal (tuple of float): 边界框对角线向量 (x, y, z)
+                childCount (int): 子节点数量
+        """
+        self.centers.append(tuple(center))
+        self.diagonals.append(tuple(diagonal))
+        self.childCounts.append(childCount)
+        self._sizes = None
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.centers)
+
+    @property
+    def sizes(self):
+        """ 对角线向量长度 """
+        if self._sizes is None:
+            self._sizes = [math.sqrt(x * x + y * y + z * z) for x, y, z in self.diagonals]
+        return self._sizes
+
+    def arrays(self):
+        """ 返回 (centers, diagonals, sizes, childCounts) 的 NumPy 连续数组 """
+        if self._arrays is None:
+            centers = np.ascontiguousarray(np.array(self.centers, dtype=np.float64).reshape(-1, 3))
+            diagonals = np.ascontiguousarray(np.array(self.diagonals, dtype=np.float64).reshape(-1, 3))
+            sizes = np.sqrt(diagonals[:, 0] * diagonals[:, 0] + diagonals[:, 1] * diagonals[:, 1] + diagonals[:, 2] * diagonals[:, 2])
+            childCounts = np.array(self.childCounts, dtype=np.float64)
+            self._arrays = (centers, diagonals, sizes, childCounts)
+        return self._arrays
+
+
+class MatchScorer(object):
+
+    """
+    批量评分器
+    对一个新几何体和一组老几何体候选，计算四项指标并按阈值筛选
+    """
+
+    def __init__(self, thresholdValue, sizeThresholdValue, useNumpy=None):
+        """
+            Args:
+                thresholdValue (float): 中心点位置阈值
+                sizeThresholdValue (float): 边界框大小相似度阈值（百分比）
+                useNumpy (bool): None 时自动检测
+        """
+        self.thresholdValue = thresholdValue
+        self.sizeThresholdValue = sizeThresholdValue
+        if useNumpy is None:
+            useNumpy = np is not None
+        self.useNumpy = useNumpy and np is not None
+
+    def score(self, oldTable, candidates, newTable, j):
+        """ 计算新几何体 j 与候选老几何体的指标
+            Args:
+                oldTable (BoxTable): 老数据表
+                candidates (list of int): 老数据行号
+                newTable (BoxTable): 新数据表
+                j (int): 新数据行号
+            Returns:
+                (dist, cossim, sizePercent, componentRatio) 四个与 candidates 等长的序列
+        """
+        if self.useNumpy:
+            return self._scoreNumpy(oldTable, candidates, newTable, j)
+        return self._scorePython(oldTable, candidates, newTable, j)
+
+    def accept(self, oldTable, candidates, newTable, j):
+        """ 返回满足全部阈值的候选老数据行号，保持候选顺序 """
+        if len(candidates) == 0:
+            return []
+        dist, cossim, sizePercent, componentRatio = self.score(oldTable, candidates, newTable, j)
+        if self.useNumpy:
+            mask = (dist <= self.thresholdValue) & (sizePercent >= self.sizeThresholdValue) \
+                   & (cossim >= COS_THRESHOLD) & (componentRatio >= COMPONENT_THRESHOLD)
+            return np.asarray(candidates)[mask].tolist()
+
+        accepted = []
+        for k, idx in enumerate(candidates):
+            if dist[k] <= self.thresholdValue and sizePercent[k] >= self.sizeThresholdValue \
+                    and cossim[k] >= COS_THRESHOLD and componentRatio[k] >= COMPONENT_THRESHOLD:
+                accepted.append(idx)
+        return accepted
+
+    def acceptScored(self, oldTable, candidates, newTable, j):
+        """ 返回满足全部阈值的候选老数据行号及其匹配代价，代价越小越相似
+            代价 = 中心点距离/位置阈值 + (1 - 余弦相似度) + (1 - 大小比例) + (1 - 组件数量比例)
+        """
+        if len(candidates) == 0:
+            return [], []
+        dist, cossim, sizePercent, componentRatio = self.score(oldTable, candidates, newTable, j)
+        scale = self.thresholdValue if self.thresholdValue > 0 else 1.0
+        if self.useNumpy:
+            mask = (dist <= self.thresholdValue) & (sizePercent >= self.sizeThresholdValue) \
+                   & (cossim >= COS_THRESHOLD) & (componentRatio >= COMPONENT_THRESHOLD)
+            cost = dist / scale + (1 - cossim) + (1 - sizePercent / 100) + (1 - componentRatio)
+            return np.asarray(candidates)[mask].tolist(), cost[mask].tolist()
+
+        accepted = []
+        costs = []
+        for k, idx in enumerate(candidates):
+            if dist[k] <= self.thresholdValue and sizePercent[k] >= self.sizeThresholdValue \
+                    and cossim[k] >= COS_THRESHOLD and componentRatio[k] >= COMPONENT_THRESHOLD:
+                accepted.append(idx)
+                costs.append(dist[k] / scale + (1 - cossim[k]) + (1 - sizePercent[k] / 100) + (1 - componentRatio[k]))
+        return accepted, costs
+
+    def _scorePython(self, oldTable, candidates, newTable, j):
+        nx, ny, nz = newTable.centers[j]
+        dx, dy, dz = newTable.diagonals[j]
+        newSize = newTable.sizes[j]
+        newCount = newTable.childCounts[j]
+        oldSizes = oldTable.sizes
+
+        dist = []
+        cossim = []
+        sizePercent = []
+        componentRatio = []
+        for idx in candidates:
+            ox, oy, oz = oldTable.centers[idx]
+            dist.append(math.sqrt((ox - nx) * (ox - nx) + (oy - ny) * (oy - ny) + (oz - nz) * (oz - nz)))
+
+            ax, ay, az = oldTable.diagonals[idx]
+            lownum = oldSizes[idx] * newSize
+            if lownum != 0:
+                cossim.append((ax * dx + ay * dy + az * dz) / lownum)
+            else:
+                cossim.append(0)
+
+            sizePercent.append(ratio(oldSizes[idx], newSize) * 100)
+            componentRatio.append(ratio(oldTable.childCounts[idx], newCount))
+        return dist, cossim, sizePercent, componentRatio
+
+    def _scoreNumpy(self, oldTable, candidates, newTable, j):
+        oldCenters, oldDiagonals, oldSizes, oldCounts = oldTable.arrays()
+        newCenters, newDiagonals, newSizes, newCounts = newTable.arrays()
+        idx = np.asarray(candidates, dtype=np.intp)
+
+        delta = oldCenters[idx] - newCenters[j]
+        dist = np.sqrt(delta[:, 0] * delta[:, 0] + delta[:, 1] * delta[:, 1] + delta[:, 2] * delta[:, 2])
+
+        diag = oldDiagonals[idx]
+        newDiag = newDiagonals[j]
+        upnum = diag[:, 0] * newDiag[0] + diag[:, 1] * newDiag[1] + diag[:, 2] * newDiag[2]
+        lownum = oldSizes[idx] * newSizes[j]
+        safe = np.where(lownum != 0, lownum, 1.0)
+        cossim = np.where(lownum != 0, upnum / safe, 0.0)
+
+        sizePercent = _ratioArray(oldSizes[idx], newSizes[j]) * 100
+        componentRatio = _ratioArray(oldCounts[idx], newCounts[j])
+        return dist, cossim, sizePercent, componentRatio
+
+
+def _ratioArray(a, b):
+    """ ratio 的向量化版本 """
+    b = np.broadcast_to(b, a.shape)
+    low = np.minimum(a, b)
+    high = np.maximum(a, b)
+    safe = np.where(high != 0, high, 1.0)
+    return np.where(a == b, 1.0, np.where(high != 0, low / safe, 0.0))
+
+
+class MatchProgress(object):
+
+    """
+    匹配进度，由工作线程写入，主线程读取；主线程调用 cancel 请求取消
+    """
+
+    def __init__(self, total=0):
+        self.total = total
+        self.done = 0
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def fraction(self):
+        if self.total == 0:
+            return 1.0
+        return self.done / self.total
+
+
+def findMatches(oldTable, newTable, thresholdValue, sizeThresholdValue, progress=None, mode=MATCH_LAST):
+    """ 匹配阶段，只读取数据表，不访问 VRED，可在工作线程中运行
+        Args:
+            oldTable (BoxTable): 老数据表
+            newTable (BoxTable): 新数据表
+            thresholdValue (float): 中心点位置阈值
+            sizeThresholdValue (float): 边界框大小相似度阈值（百分比）
+            progress (MatchProgress): None 或进度对象
+            mode (int): MATCH_LAST 时同一新几何体保留最后一个满足条件的老几何体（与逐个赋予材质的结果一致），
+                        MATCH_GREEDY / MATCH_ASSIGNMENT 时先一对一分配，
+                        满足条件却未分配到的新几何体再选代价最小的老几何体
+        Returns:
+            list of int: 每个新几何体对应的老数据行号，未匹配为 -1；被取消时返回 None
+    """
+    grid = spatialIndex.buildGrid(oldTable.centers, thresholdValue)
+    scorer = MatchScorer(thresholdValue, sizeThresholdValue)
+
+    if progress is not None:
+        progress.total = len(newTable)
+
+    matches = []
+    pairs = []
+    # 每个新几何体代价最小的候选 (代价, 老数据行号)
+    best = {}
+    for j in range(len(newTable)):
+        if progress is not None and progress.cancelled:
+            return None
+        candidates = grid.query(newTable.centers[j], thresholdValue)
+        if mode == MATCH_LAST:
+            accepted = scorer.accept(oldTable, candidates, newTable, j)
+            matches.append(accepted[-1] if accepted else -1)
+        else:
+            accepted, costs = scorer.acceptScored(oldTable, candidates, newTable, j)
+            for idx, cost in zip(accepted, costs):
+                pairs.append((cost, j, idx))
+                if j not in best or (cost, idx) < best[j]:
+                    best[j] = (cost, idx)
+            matches.append(-1)
+        if progress is not None:
+            progress.done = j + 1
+
+    if mode == MATCH_GREEDY:
+        _assignGreedy(pairs, matches)
+    elif mode == MATCH_ASSIGNMENT:
+        for component in _components(pairs):
+            _assignOptimal(component, matches)
+
+    # 候选都已被其他新几何体占用时，不再要求老几何体唯一
+    for j, (cost, idx) in best.items():
+        if matches[j] < 0:
+            matches[j] = idx
+    return matches
+
+
+def _assignGreedy(pairs, matches):
+    """ 按代价从小到大分配，新老对象都只使用一次 """
+    usedOld = set()
+    for cost, j, idx in sorted(pairs):
+        if matches[j] < 0 and idx not in usedOld:
+            matches[j] = idx
+            usedOld.add(idx)
+
+
+def _components(pairs):
+    """ 按新老对象的候选关系拆分为互不相关的连通分量 """
+    parent = {}
+
+    def find(key):
+        root = key
+        while parent[root] != root:
+            root = parent[root]
+        while parent[key] != root:
+            parent[key], key = root, parent[key]
+        return root
+
+    for cost, j, idx in pairs:
+        a = ('new', j)
+        b = ('old', idx)
+        parent.setdefault(a, a)
+        parent.setdefault(b, b)
+        ra = find(a)
+        rb = find(b)
+        if ra != rb:
+            parent[rb] = ra
+
+    groups = {}
+    for pair in pairs:
+        groups.setdefault(find(('new', pair[1])), []).append(pair)
+    return list(groups.values())
+
+
+def _assignOptimal(pairs, matches):
+    """ 对一个连通分量求最小总代价的一对一分配，优先保证匹配数量最多 """
+    rows = sorted(set(j for cost, j, idx in pairs))
+    cols = sorted(set(idx for cost, j, idx in pairs))
+    if len(rows) * len(cols) > ASSIGNMENT_LIMIT * ASSIGNMENT_LIMIT:
+        _assignGreedy(pairs, matches)
+        return
+
+    # 没有候选关系的位置使用一个大于所有真实代价之和的值，使算法优先增加匹配数量
+    missing = sum(cost for cost, j, idx in pairs) + 1.0
+    transpose = len(rows) > len(cols)
+    if transpose:
+        rows, cols = cols, rows
+    rowIndex = dict((key, i) for i, key in enumerate(rows))
+    colIndex = dict((key, i) for i, key in enumerate(cols))
+
+    matrix = [[missing] * len(cols) for _ in rows]
+    real = set()
+    for cost, j, idx in pairs:
+        r, c = (idx, j) if transpose else (j, idx)
+        matrix[rowIndex[r]][colIndex[c]] = cost
+        real.add((r, c))
+
+    for i, k in enumerate(_hungarian(matrix)):
+        r = rows[i]
+        c = cols[k]
+        if (r, c) in real:
+            j, idx = (c, r) if transpose else (r, c)
+            matches[j] = idx
+
+
+def _hungarian(matrix):
+    """ 匈牙利算法，行数不大于列数，返回每行分配到的列号 """
+    n = len(matrix)
+    m = len(matrix[0])
+    inf = float('inf')
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    p = [0] * (m + 1)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            row = matrix[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    cur = row[j - 1] - u[i0] - v[j]
+                    if cur < minv[j]:
+                        minv[j] = cur
+                        way[j] = j0
+                    if minv[j] < delta:
+                        delta = minv[j]
+                        j1 = j
+            for j in range(m + 1):
+                if used[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while True:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+            if j0 == 0:
+                break
+
+    result = [0] * n
+    for j in range(1, m + 1):
+        if p[j]:
+            result[p[j] - 1] = j - 1
+    return result
@@ -0,0 +1,106 @@
+"""
+UE 材质替换表导出
+材质名称逐个规范化、去重后直接写入 CSV，不在内存中保存整张表；
+行数超过上限时拆分为多个文件，每个文件都带表头；
+写入前删除上次导出留下的拆分文件，写入失败时删除本次已写入的文件。
+"""
+import csv
+import os
+
+from . import nameMatcher
+
+
+HEADER = ['Row Name', 'Search String', 'String Match', 'Material Replacement']
+
+# 材质替换模式，与导出对话框中的选项顺序一致
+MATCH_CONTAINS = 0
+MATCH_EXACT = 1
+
+
+def iterRows(names, mode, reference=None):
+    """ 逐个产出替换表的行
+        Args:
+            names (iterable): 材质名称
+            mode (int): MATCH_CONTAINS 时名称规范化后去重，保持首次出现的顺序；MATCH_EXACT 时原样输出
+            reference (referenceTable.ReferenceTable): None 或用于查找 Material Replacement 的参考表
+    """
+    lookup = reference.lookup if reference is not None else lambda name: None
+
+    if mode == MATCH_CONTAINS:
+        seen = set()
+        for name in names:
+            searchString = nameMatcher.normalize(name)
+            if searchString in seen:
+                continue
+            seen.add(searchString)
+            yield [searchString, searchString, 'Contains', lookup(searchString)]
+    else:
+        for name in names:
+            yield [name, name, 'Exact Match', lookup(name)]
+
+
+def partPath(path, part):
+    """ 第 part 个拆分文件的路径，第一个文件使用原路径 """
+    if part == 0:
+        return path
+    root, ext = os.path.splitext(path)
+    return '%s_%d%s' % (root, part + 1, ext)
+
+
+def removeParts(path):
+    """ 删除上次导出留下的拆分文件（第二个及之后的文件），返回删除的数量 """
+    part = 1
+    while os.path.isfile(partPath(path, part)):
+        os.remove(partPath(path, part))
+        part += 1
+    return part - 1
+
+
+def writeRows(path, rows, maxRows=0):
+    """ 写入替换表
+        Args:
+            path (str): 文件路径
+            rows (iterable): 表格行，不含表头
+            maxRows (int): 每个文件的最大行数，0 为不拆分
+        Returns:
+            list: 写入的文件路径
+    """
+    # 重新导出的行数较少时，之前多出的拆分文件不能保留
+    removeParts(path)
+
+    paths = []
+    f = None
+    try:
+        count = 0
+        for row in rows:
+            if f is None or (maxRows and count >= maxRows):
+                if f is not None:
+                    f.close()
+                paths.append(partPath(path, len(paths)))
+                f = open(paths[-1], 'w', newline='', encoding='utf-8')
+                writer = csv.writer(f, delimiter=',')
+                writer.writerow(HEADER)
+                count = 0
+            writer.writerow(row)
+            count += 1
+
+        # 没有数据时仍写入只有表头的文件
+        if f is None:
+            paths.append(path)
+            f = open(path, 'w', newline='', encoding='utf-8')
+            csv.writer(f, delimiter=',').writerow(HEADER)
+    except Exception:
+        # 不保留不完整的导出结果，先关闭文件再删除
+        if f is not None:
+            f.close()
+            f = None
+        for written in paths:
+            try:
+                os.remove(written)
+            except OSError:
+                pass
+        raise
+    finally:
+        if f is not None:
+            f.close()
+    return paths
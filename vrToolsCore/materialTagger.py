@@ -0,0 +1,59 @@
+"""
+未重命名材质标记
+以 UE 材质名称集合判断材质是否已重命名，并与材质当前实际的标记状态比较，
+只对需要改变标记状态的材质添加或去掉标记。
+实际标记状态每次都从场景读取，撤销、手动修改标记或加载场景后结果仍然正确。
+"""
+
+
+class TagIndex(object):
+
+    """ 以 UE 材质名称集合判断材质是否已重命名，并统计上次标记的结果 """
+
+    def __init__(self, names=()):
+        """
+            Args:
+                names (iterable): UE 材质名称
+        """
+        self.names = set(names)
+        self.tagged = 0
+        self.untagged = 0
+        self.touched = 0
+        self.skipped = 0
+
+    def setNames(self, names):
+        """ 更换 UE 材质名称集合 """
+        self.names = set(names)
+
+    def update(self, materials, getName, isTagged):
+        """ 检查材质列表，返回需要修改标记状态的材质
+            Args:
+                materials (list): 场景中的全部材质
+                getName (function): getName(material)->名称
+                isTagged (function): isTagged(material)->材质当前是否带有标记
+            Returns:
+                tuple: (需要添加标记的材质列表, 需要去掉标记的材质列表)
+        """
+        toTag = []
+        toUntag = []
+        self.tagged = 0
+        self.untagged = 0
+        for material in materials:
+            shouldTag = getName(material) not in self.names
+            tagged = isTagged(material)
+            if shouldTag and not tagged:
+                toTag.append(material)
+            elif tagged and not shouldTag:
+                toUntag.append(material)
+            if shouldTag:
+                self.tagged += 1
+            else:
+                self.untagged += 1
+
+        self.touched = len(toTag) + len(toUntag)
+        self.skipped = len(materials) - self.touched
+        return toTag, toUntag
+
+    def report(self):
+        """ 返回 (已标记数量, 未标记数量, 本次修改数量, 本次跳过数量) """
+        return self.tagged, self.untagged, self.touched, self.skipped
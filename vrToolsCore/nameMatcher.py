@@ -0,0 +1,139 @@
+"""
+材质名称模糊匹配
+名称按导出材质替换表时的规则规范化后拆分为单词，以三字符（trigram）相似度和单词重合度打分。
+候选名称通过倒排索引获取，只与共享少见三字符的名称比较，不做全部名称两两比较。
+"""
+import re
+from collections import Counter
+
+
+# 只保留中文、英文字母和下划线，与导出材质替换表的规则一致
+NORMALIZE_PATTERN = re.compile(u"([^\u4E00-\u9FA5\uf900-\ufa2d\u0041-\u005a\u0061-\u007a\u005f])")
+# 拆分单词：连续大写缩写、首字母大写单词、小写单词、中文
+TOKEN_PATTERN = re.compile(u"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[\u4E00-\u9FA5\uf900-\ufa2d]+")
+
+# 单词重合度在总分中的权重
+TOKEN_WEIGHT = 0.3
+# 每个名称最多取多少个候选进行完整打分
+CANDIDATE_LIMIT = 20
+
+
+def normalize(name):
+    """ 去掉中文、英文字母和下划线以外的字符 """
+    return NORMALIZE_PATTERN.sub('', name)
+
+
+def tokens(name):
+    """ 规范化后拆分为小写单词 """
+    return [token.lower() for token in TOKEN_PATTERN.findall(normalize(name))]
+
+
+def trigrams(key):
+    padded = ' ' + key + ' '
+    return set(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class NameMatcher(object):
+
+    """ 在名称列表中查找与给定名称最相似的名称 """
+
+    def __init__(self, names, maxPosting=None):
+        """
+            Args:
+                names (list): 候选名称列表，结果为其中的序号
+                maxPosting (int): None 或倒排列表长度上限，超过的常见三字符不用于获取候选，
+                                  默认为名称数量的 1%，至少 50
+        """
+        self.names = list(names)
+        self.tokens = []
+        self.grams = []
+        self.exact = {}
+        self.postings = {}
+        for idx, name in enumerate(self.names):
+            nameTokens = tokens(name)
+            key = ' '.join(nameTokens)
+            grams = trigrams(key)
+            self.tokens.append(set(nameTokens))
+            self.grams.append(grams)
+            self.exact.setdefault(key, idx)
+            for gram in grams:
+                posting = self.postings.get(gram)
+                if posting is None:
+                    self.postings[gram] = [idx]
+                else:
+                    posting.append(idx)
+
+        if maxPosting is None:
+            maxPosting = max(len(self.names) // 100, 50)
+        self.maxPosting = maxPosting
+        # 规范化后相同的名称（如只有数字后缀不同）共用查找结果
+        self.cache = {}
+
+    def candidates(self, grams):
+        """ 按共享的少见三字符数量返回候选序号 """
+        postings = [self.postings[gram] for gram in grams if gram in self.postings]
+        if not postings:
+            return []
+        rare = [posting for posting in postings if len(posting) <= self.maxPosting]
+        # 全部为常见三字符时，只使用最少见的几个
+        if not rare:
+            rare = sorted(postings, key=len)[:3]
+
+        counts = Counter()
+        for posting in rare:
+            counts.update(posting)
+        return [idx for idx, count in counts.most_common(CANDIDATE_LIMIT)]
+
+    def suggest(self, name, limit=5):
+        """ 返回最相似的名称
+            Args:
+                name (str): 查询名称
+                limit (int): 返回数量
+            Returns:
+                list: (score, index)，score 在 0 - 1 之间，按分数从高到低排列
+        """
+        nameTokens = tokens(name)
+        key = ' '.join(nameTokens)
+        if not key:
+            return []
+
+        exact = self.exact.get(key)
+        if exact is not None and limit == 1:
+            return [(1.0, exact)]
+
+        cached = self.cache.get((key, limit))
+        if cached is not None:
+            return cached
+
+        grams = trigrams(key)
+        tokenSet = set(nameTokens)
+        scored = []
+        for idx in self.candidates(grams):
+            other = self.grams[idx]
+            # Dice 系数
+            gramScore = 2.0 * len(grams & other) / (len(grams) + len(other))
+            otherTokens = self.tokens[idx]
+            union = len(tokenSet | otherTokens)
+            tokenScore = len(tokenSet & otherTokens) / union if union else 0.0
+            scored.append(((1 - TOKEN_WEIGHT) * gramScore + TOKEN_WEIGHT * tokenScore, idx))
+
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        scored = scored[:limit]
+        self.cache[(key, limit)] = scored
+        return scored
+
+    def suggestAll(self, names, limit=1, progress=None):
+        """ 对名称列表逐个查找
+            Args:
+                names (list): 查询名称列表
+                limit (int): 每个名称返回的数量
+                progress (function): None 或 progress(done, total) 每 200 个名称调用一次
+            Returns:
+                list: 每个查询名称的 suggest 结果
+        """
+        results = []
+        for done, name in enumerate(names):
+            results.append(self.suggest(name, limit))
+            if progress is not None and done % 200 == 0:
+                progress(done, len(names))
+        return results
@@ -0,0 +1,89 @@
+"""
+节点信息缓存
+在一次操作内按对象 ID 缓存节点的类型、名称、子节点和包装对象，
+避免对同一节点反复调用 vrNodePtr.toNode / vrdGeometryNode 等接口，并统计节省的调用次数。
+"""
+
+
+class NodeInfoCache(object):
+
+    """
+    按对象 ID 记忆节点信息
+    具体的 VRED 调用由 resolvers 提供，便于脱离 VRED 环境使用
+    """
+
+    # 可缓存的信息种类
+    KINDS = ('type', 'name', 'children', 'ptr', 'geometry')
+
+    def __init__(self, objectId, resolvers):
+        """
+            Args:
+                objectId (function): objectId(node)->int
+                resolvers (dict): 信息种类到 resolver(node, objectId) 的映射，种类见 KINDS
+        """
+        self._objectId = objectId
+        self._resolvers = resolvers
+        self._cache = dict((kind, {}) for kind in self.KINDS)
+        self.calls = dict((kind, 0) for kind in self.KINDS)
+        self.saved = dict((kind, 0) for kind in self.KINDS)
+        self.calls['objectId'] = 0
+
+    def objectId(self, node):
+        self.calls['objectId'] += 1
+        return self._objectId(node)
+
+    def _get(self, kind, node):
+        objectId = self.objectId(node)
+        cache = self._cache[kind]
+        if objectId in cache:
+            self.saved[kind] += 1
+            return cache[objectId]
+        self.calls[kind] += 1
+        value = self._resolvers[kind](node, objectId)
+        cache[objectId] = value
+        return value
+
+    def type(self, node):
+        """ 节点类型名称，如 'Geometry' """
+        return self._get('type', node)
+
+    def name(self, node):
+        return self._get('name', node)
+
+    def children(self, node):
+        """ 子节点列表，节点结构变化后需调用 invalidate """
+        return self._get('children', node)
+
+    def childIds(self, node):
+        return [self.objectId(child) for child in self.children(node)]
+
+    def ptr(self, node):
+        """ 节点的 vrNodePtr 包装 """
+        return self._get('ptr', node)
+
+    def geometry(self, node):
+        """ 节点的 vrdGeometryNode 包装 """
+        return self._get('geometry', node)
+
+    def isGeometry(self, node):
+        return self.type(node) == 'Geometry'
+
+    def invalidate(self, node, kinds=('children',)):
+        """ 节点被修改后清除其缓存信息，默认只清除子节点列表 """
+        objectId = self.objectId(node)
+        for kind in kinds:
+            self._cache[kind].pop(objectId, None)
+
+    def clear(self):
+        for cache in self._cache.values():
+            cache.clear()
+
+    def report(self):
+        """ 返回各类接口调用次数和节省次数的文本 """
+        lines = []
+        for kind in self.KINDS:
+            if self.calls[kind] or self.saved[kind]:
+                lines.append('%s: %d calls, %d saved' % (kind, self.calls[kind], self.saved[kind]))
+        lines.append('objectId: %d calls' % self.calls['objectId'])
+        lines.append('total saved: %d' % sum(self.saved.values()))
+        return '\n'.join(lines)
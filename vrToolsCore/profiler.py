@@ -0,0 +1,203 @@
+"""
+操作性能记录
+记录每次插件操作的耗时、VRED 接口调用次数、处理的节点数量和 Python 内存峰值，
+结果保留在内存中供界面显示，同时写入滚动日志文件。
+接口调用次数通过在操作期间临时替换模块和服务对象上的函数统计，操作结束后恢复。
+"""
+import logging
+import logging.handlers
+import os
+import time
+import tracemalloc
+from collections import Counter
+
+
+# 单个日志文件大小和保留的历史文件数量
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 5
+# 内存中保留的记录数量
+HISTORY_LIMIT = 50
+
+
+def logDir():
+    """ 日志目录，位于用户目录下 """
+    return os.path.join(os.path.expanduser('~'), '.VredVRTools', 'logs')
+
+
+def createLogger(path=None):
+    """ 创建写入滚动日志文件的 logger，目录不可写时只返回不带文件输出的 logger
+        Args:
+            path (str): None 或日志文件路径，默认位于 logDir()
+    """
+    logger = logging.getLogger('VredVRTools.profile')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if logger.handlers:
+        return logger
+
+    if path is None:
+        path = os.path.join(logDir(), 'profile.log')
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=LOG_MAX_BYTES,
+                                                       backupCount=LOG_BACKUP_COUNT, encoding='utf-8')
+    except OSError:
+        logger.addHandler(logging.NullHandler())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+        logger.addHandler(handler)
+    return logger
+
+
+class ActionRecord(object):
+
+    """ 一次操作的记录 """
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.time()
+        self.seconds = 0.0
+        # 按 "模块.函数" 统计的接口调用次数
+        self.calls = Counter()
+        self.nodes = 0
+        # 内存峰值（字节），未记录时为 None
+        self.peakMemory = None
+        self.error = None
+
+    def summary(self, limit=5):
+        """ 返回一行摘要和调用次数最多的几个接口 """
+        line = '%s: %.3fs, %d nodes, %d api calls' % (self.name, self.seconds, self.nodes, sum(self.calls.values()))
+        if self.peakMemory is not None:
+            line += ', peak %.1f MB' % (self.peakMemory / 1048576.0)
+        if self.error is not None:
+            line += ', error: %s' % self.error
+        lines = [line]
+        for kind, count in self.calls.most_common(limit):
+            lines.append('    %s x%d' % (kind, count))
+        return '\n'.join(lines)
+
+
+class CallCounter(object):
+
+    """ 临时替换对象上的公开函数，按 "名称.函数" 统计调用次数 """
+
+    def __init__(self, targets):
+        """
+            Args:
+                targets (dict): 名称 -> 模块或服务对象
+        """
+        self.targets = targets
+        self.patched = []
+
+    def install(self, counts):
+        """ 开始统计，调用次数写入 counts """
+        for targetName, target in self.targets.items():
+            for name in dir(target):
+                if name.startswith('_'):
+                    continue
+                try:
+                    function = getattr(target, name)
+                except Exception:
+                    continue
+                # 类和常量保持不变
+                if isinstance(function, type) or not callable(function):
+                    continue
+                # 替换前判断属性是否定义在对象自身上，继承自类的方法恢复时删除包装即可
+                owned = name in getattr(target, '__dict__', {})
+                try:
+                    setattr(target, name, _counted(function, targetName + '.' + name, counts))
+                except (AttributeError, TypeError):
+                    continue
+                self.patched.append((target, name, function, owned))
+
+    def uninstall(self):
+        """ 恢复被替换的函数 """
+        for target, name, function, owned in reversed(self.patched):
+            try:
+                if owned:
+                    setattr(target, name, function)
+                else:
+                    delattr(target, name)
+            except (AttributeError, TypeError):
+                pass
+        self.patched = []
+
+
+def _counted(function, kind, counts):
+    def wrapper(*args, **kwargs):
+        counts[kind] += 1
+        return function(*args, **kwargs)
+    return wrapper
+
+
+class Profiler(object):
+
+    """
+    记录插件操作
+    嵌套调用的操作合并到最外层操作的记录中
+    """
+
+    def __init__(self, targets=None, logger=None, trackMemory=False, historyLimit=HISTORY_LIMIT):
+        """
+            Args:
+                targets (dict): None 或 名称 -> 需要统计调用次数的模块或服务对象
+                logger (logging.Logger): None 或写入记录的 logger
+                trackMemory (bool): 是否使用 tracemalloc 记录内存峰值，会明显减慢 Python 代码的执行，默认关闭
+                historyLimit (int): 内存中保留的记录数量
+        """
+        self.targets = targets or {}
+        self.logger = logger
+        self.trackMemory = trackMemory
+        self.historyLimit = historyLimit
+        self.history = []
+        # 每次操作结束后调用 listener(record)
+        self.listeners = []
+        self.current = None
+
+    def run(self, name, function, *args, **kwargs):
+        """ 执行并记录一次操作，返回操作的返回值 """
+        if self.current is not None:
+            return function(*args, **kwargs)
+
+        record = ActionRecord(name)
+        self.current = record
+        counter = CallCounter(self.targets)
+        counter.install(record.calls)
+
+        startedTracing = False
+        if self.trackMemory:
+            if tracemalloc.is_tracing():
+                if hasattr(tracemalloc, 'reset_peak'):
+                    tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                startedTracing = True
+
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        except Exception as e:
+            record.error = repr(e)
+            raise
+        finally:
+            record.seconds = time.perf_counter() - start
+            if self.trackMemory:
+                record.peakMemory = tracemalloc.get_traced_memory()[1]
+                if startedTracing:
+                    tracemalloc.stop()
+            counter.uninstall()
+            self.current = None
+            self._finish(record)
+
+    def addNodes(self, count):
+        """ 累加当前操作处理的节点数量，没有正在记录的操作时忽略 """
+        if self.current is not None:
+            self.current.nodes += count
+
+    def _finish(self, record):
+        self.history.append(record)
+        del self.history[:-self.historyLimit]
+        if self.logger is not None:
+            self.logger.info(record.summary(limit=20))
+        for listener in self.listeners:
+            listener(record)
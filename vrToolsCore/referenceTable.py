@@ -0,0 +1,190 @@
+"""
+UE 材质替换参考表
+读取一次并按文件路径和修改时间缓存，按匹配方式建立索引：
+所有行的搜索字符串都先按精确匹配查找（使用字典）；包含匹配使用 Aho-Corasick 自动机一次扫描名称
+找出全部包含的搜索字符串，最长的优先；正则匹配按表中顺序逐个检查。匹配均区分大小写。
+"""
+import os
+import re
+
+from . import csvLoader
+
+
+EXACT = 'Exact Match'
+CONTAINS = 'Contains'
+REGEX = 'Regex'
+
+# 表头名称规范化后与列的对应关系
+HEADER_NAMES = {
+    'searchstring': 'search',
+    'stringmatch': 'match',
+    'materialreplacement': 'replacement',
+}
+# 没有可识别的表头时使用 UE 数据表的默认列顺序：Row Name, Search String, String Match, Material Replacement
+DEFAULT_COLUMNS = {'search': 1, 'match': 2, 'replacement': 3}
+
+# 路径 -> (修改时间, 文件大小, ReferenceTable)
+_cache = {}
+
+
+def _headerKey(cell):
+    return re.sub('[^a-z]', '', cell.lower())
+
+
+def detectColumns(row):
+    """ 根据首行判断列的位置，返回 (列位置字典, 首行是否为表头) """
+    columns = {}
+    for index, cell in enumerate(row):
+        name = HEADER_NAMES.get(_headerKey(cell))
+        if name is not None and name not in columns:
+            columns[name] = index
+    if 'search' in columns and 'replacement' in columns:
+        return columns, True
+    return dict(DEFAULT_COLUMNS), False
+
+
+def matchType(text):
+    """ 将 String Match 列的文本转换为匹配方式，无法识别时为精确匹配 """
+    key = _headerKey(text)
+    if key.startswith('contain'):
+        return CONTAINS
+    if key.startswith('regex') or key.startswith('regular'):
+        return REGEX
+    return EXACT
+
+
+class AhoCorasick(object):
+
+    """ 多模式字符串匹配自动机 """
+
+    def __init__(self, patterns):
+        """
+            Args:
+                patterns (list): 模式字符串，匹配结果为其中的序号
+        """
+        # 每个状态的转移、失败链接和输出的模式序号
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        for idx, pattern in enumerate(patterns):
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                nextState = self.goto[state].get(char)
+                if nextState is None:
+                    nextState = len(self.goto)
+                    self.goto[state][char] = nextState
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = nextState
+            self.output[state].append(idx)
+
+        # 按层建立失败链接，并合并失败状态的输出
+        queue = list(self.goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for char, nextState in self.goto[state].items():
+                queue.append(nextState)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[nextState] = target if target != nextState else 0
+                self.output[nextState] = self.output[nextState] + self.output[self.fail[nextState]]
+
+    def search(self, text):
+        """ 返回 text 中出现的全部模式序号（不重复） """
+        found = set()
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
+
+
+class ReferenceTable(object):
+
+    """ 按搜索字符串查找材质替换 """
+
+    def __init__(self, rows):
+        """
+            Args:
+                rows (iterable): (search, match, replacement)，match 为 EXACT、CONTAINS 或 REGEX
+        """
+        self.exact = {}
+        self.contains = []
+        self.regexes = []
+        for search, match, replacement in rows:
+            if not search:
+                continue
+            # 名称与搜索字符串完全相同时，无论匹配方式都直接命中；与原有读取方式一致，重复时后面的行优先
+            self.exact[search] = replacement
+            if match == CONTAINS:
+                self.contains.append((search, replacement))
+            elif match == REGEX:
+                try:
+                    self.regexes.append((re.compile(search), replacement))
+                except re.error:
+                    continue
+        self.automaton = AhoCorasick([search for search, replacement in self.contains])
+
+    def __len__(self):
+        return len(self.exact)
+
+    @classmethod
+    def fromFile(cls, path):
+        """ 读取 CSV 参考表，跳过列数不足的行 """
+        def rows():
+            columns = None
+            for row in csvLoader.iterRows(path):
+                if columns is None:
+                    columns, isHeader = detectColumns(row)
+                    width = max(columns.values()) + 1
+                    if isHeader:
+                        continue
+                if len(row) < width:
+                    continue
+                match = matchType(row[columns['match']]) if 'match' in columns else EXACT
+                yield row[columns['search']].strip(), match, row[columns['replacement']].strip()
+        return cls(rows())
+
+    def lookup(self, name):
+        """ 查找材质替换，依次尝试精确匹配、包含匹配（最长的搜索字符串优先，长度相同时表中靠前的优先）
+            和正则匹配，没有时返回 None
+        """
+        replacement = self.exact.get(name)
+        if replacement is not None:
+            return replacement
+
+        if self.contains:
+            found = self.automaton.search(name)
+            if found:
+                best = min(found, key=lambda idx: (-len(self.contains[idx][0]), idx))
+                return self.contains[best][1]
+
+        for pattern, replacement in self.regexes:
+            if pattern.search(name):
+                return replacement
+        return None
+
+
+def load(path):
+    """ 读取参考表，文件未修改时返回缓存的结果 """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == stat.st_mtime and cached[1] == stat.st_size:
+        return cached[2]
+    table = ReferenceTable.fromFile(path)
+    _cache[path] = (stat.st_mtime, stat.st_size, table)
+    return table
@@ -0,0 +1,113 @@
+"""
+场景树遍历
+使用显式栈代替递归，提供惰性生成器接口，深层级结构不会超出 Python 递归深度限制。
+栈中保存子节点迭代器，内存占用只与树的深度相关。
+"""
+
+
+def walk(root, getChildren, prune=None, maxDepth=None):
+    """ 先序遍历，依次产出 (node, depth)
+        Args:
+            root: 起始节点，深度为 0
+            getChildren (function): getChildren(node)->list
+            prune (function): None 或 prune(node)->bool，为 True 时不再遍历该节点的子节点
+            maxDepth (int): None 或最大深度，超过该深度的节点不再遍历
+    """
+    stack = [iter((root,))]
+    while stack:
+        node = next(stack[-1], _END)
+        if node is _END:
+            stack.pop()
+            continue
+        depth = len(stack) - 1
+        yield node, depth
+        if prune is not None and prune(node):
+            continue
+        if maxDepth is not None and depth >= maxDepth:
+            continue
+        stack.append(iter(getChildren(node)))
+
+
+def iterLeaves(root, getChildren, asLeaf, predicate=None, maxDepth=None):
+    """ 遍历并产出叶节点，遇到叶节点后不再遍历其子节点
+        Args:
+            root: 起始节点
+            getChildren (function): getChildren(node)->list
+            asLeaf (function): asLeaf(node)->叶节点对象，不是叶节点时返回 None
+            predicate (function): None 或 predicate(leaf)->bool
+            maxDepth (int): None 或最大深度
+    """
+    stack = [iter((root,))]
+    while stack:
+        node = next(stack[-1], _END)
+        if node is _END:
+            stack.pop()
+            continue
+        leaf = asLeaf(node)
+        if leaf is not None:
+            if predicate is None or predicate(leaf):
+                yield leaf
+            continue
+        if maxDepth is not None and len(stack) - 1 >= maxDepth:
+            continue
+        stack.append(iter(getChildren(node)))
+
+
+def iterBranches(root, getChildren, asLeaf, maxDepth=None):
+    """ 先序遍历所有非叶节点，产出 (node, leaves, branches)
+        leaves 为该节点下的叶节点对象，branches 为其余子节点，随后继续遍历 branches
+        Args:
+            root: 起始节点
+            getChildren (function): getChildren(node)->list
+            asLeaf (function): asLeaf(node)->叶节点对象，不是叶节点时返回 None
+            maxDepth (int): None 或最大深度
+    """
+    stack = [iter((root,))]
+    while stack:
+        node = next(stack[-1], _END)
+        if node is _END:
+            stack.pop()
+            continue
+        leaves = []
+        branches = []
+        for child in getChildren(node):
+            leaf = asLeaf(child)
+            if leaf is not None:
+                leaves.append(leaf)
+            else:
+                branches.append(child)
+        yield node, leaves, branches
+        if maxDepth is not None and len(stack) - 1 >= maxDepth:
+            continue
+        stack.append(iter(branches))
+
+
+def topLevelNodes(nodes, getParent, key):
+    """ 去掉祖先节点也在列表中的节点，返回互不包含的子树根节点，保持原顺序
+        Args:
+            nodes (list): 节点列表
+            getParent (function): getParent(node)->父节点，根节点返回 None
+            key (function): key(node)->可哈希的节点标识
+    """
+    keys = set(key(node) for node in nodes)
+    result = []
+    seen = set()
+    for node in nodes:
+        nodeKey = key(node)
+        if nodeKey in seen:
+            continue
+        seen.add(nodeKey)
+        parent = getParent(node)
+        nested = False
+        while parent is not None:
+            if key(parent) in keys:
+                nested = True
+                break
+            parent = getParent(parent)
+        if not nested:
+            result.append(node)
+    return result
+
+
+# 迭代结束标记
+_END = object()
@@ -0,0 +1,54 @@
+"""
+名称搜索索引
+预先保存小写名称并建立三字符（trigram）倒排索引，子串搜索只检查包含查询中最少见三字符的名称，
+不需要在每次输入时遍历全部名称。
+"""
+
+
+class TrigramIndex(object):
+
+    """ 不区分大小写的子串搜索 """
+
+    def __init__(self, names=()):
+        """
+            Args:
+                names (iterable): 名称序列，搜索结果为其中的序号
+        """
+        self.names = list(names)
+        self.lowered = [name.lower() for name in self.names]
+        # trigram -> 升序的名称序号列表
+        self.postings = {}
+        for idx, name in enumerate(self.lowered):
+            for gram in set(name[i:i + 3] for i in range(len(name) - 2)):
+                posting = self.postings.get(gram)
+                if posting is None:
+                    self.postings[gram] = [idx]
+                else:
+                    posting.append(idx)
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, text):
+        """ 返回包含 text 的名称序号列表，按升序排列，text 为空时返回全部序号 """
+        query = text.lower()
+        if not query:
+            return list(range(len(self.names)))
+
+        # 少于三个字符时没有可用的 trigram，直接扫描小写名称
+        if len(query) < 3:
+            return [idx for idx, name in enumerate(self.lowered) if query in name]
+
+        smallest = None
+        for i in range(len(query) - 2):
+            posting = self.postings.get(query[i:i + 3])
+            if posting is None:
+                return []
+            if smallest is None or len(posting) < len(smallest):
+                smallest = posting
+
+        # 三个字符的查询与 trigram 完全相同，无需再次检查
+        if len(query) == 3:
+            return list(smallest)
+        lowered = self.lowered
+        return [idx for idx in smallest if query in lowered[idx]]
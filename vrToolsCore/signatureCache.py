@@ -0,0 +1,158 @@
+"""
+参考节点几何特征缓存
+将参考节点下每个几何体的边界框中心点、对角线向量、子节点数量和材质（名称和对象 ID）保存到磁盘，
+以 vpb 文件路径、修改时间和节点路径作为键，重复匹配同一参考节点时跳过遍历和边界框查询。
+缓存文件为 zip 容器，数值列以小端二进制数组保存。
+注意：键只包含已保存文件的修改时间，参考节点在保存之后的修改（移动、换材质等）不会使缓存失效，
+此时应关闭缓存或先保存场景。
+"""
+import hashlib
+import json
+import os
+import sys
+import zipfile
+from array import array
+
+from .matchScoring import BoxTable
+
+# 缓存格式版本，格式变化时递增以使旧缓存失效
+CACHE_VERSION = 2
+# 缓存目录中最多保留的文件数量
+MAX_CACHE_FILES = 50
+
+
+def cacheDir():
+    """ 返回缓存目录，不存在时创建 """
+    path = os.path.join(os.path.expanduser('~'), '.VredVRTools', 'cache')
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    return path
+
+
+def cacheKey(scenePath, mtime, nodePath):
+    """ 由 vpb 文件路径、修改时间和节点路径生成缓存键 """
+    text = '%s|%r|%s|%d' % (os.path.normcase(os.path.abspath(scenePath)), mtime, nodePath, CACHE_VERSION)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def cachePath(scenePath, nodePath):
+    """ 返回场景文件中某个节点对应的缓存文件路径，场景未保存时返回 None """
+    if not scenePath or not os.path.exists(scenePath):
+        return None
+    key = cacheKey(scenePath, os.path.getmtime(scenePath), nodePath)
+    return os.path.join(cacheDir(), key + '.vrsig')
+
+
+def _toBytes(values, typecode):
+    data = array(typecode, values)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data.tobytes()
+
+
+def _fromBytes(raw, typecode):
+    data = array(typecode)
+    data.frombytes(raw)
+    if sys.byteorder != 'little':
+        data.byteswap()
+    return data
+
+
+def save(path, table, materials):
+    """ 保存数据表和材质
+        Args:
+            path (str): 缓存文件路径
+            table (BoxTable): 参考节点数据表
+            materials (list): 与数据表行对应的 (材质名称, 材质对象 ID)
+    """
+    centers = [value for center in table.centers for value in center]
+    diagonals = [value for diagonal in table.diagonals for value in diagonal]
+    meta = {'version': CACHE_VERSION, 'count': len(table)}
+
+    tmpPath = path + '.tmp'
+    with zipfile.ZipFile(tmpPath, 'w', zipfile.ZIP_STORED) as archive:
+        archive.writestr('meta.json', json.dumps(meta))
+        archive.writestr('centers.f8', _toBytes(centers, 'd'))
+        archive.writestr('diagonals.f8', _toBytes(diagonals, 'd'))
+        archive.writestr('childCounts.i8', _toBytes(table.childCounts, 'q'))
+        archive.writestr('materials.json', json.dumps([list(material) for material in materials], ensure_ascii=False))
+    os.replace(tmpPath, path)
+    prune()
+
+
+def load(path):
+    """ 读取缓存，文件不存在或格式不符时返回 None
+        Returns:
+            (BoxTable, list of (材质名称, 材质对象 ID))
+    """
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        with zipfile.ZipFile(path, 'r') as archive:
+            meta = json.loads(archive.read('meta.json').decode('utf-8'))
+            if meta.get('version') != CACHE_VERSION:
+                return None
+            centers = _fromBytes(archive.read('centers.f8'), 'd')
+            diagonals = _fromBytes(archive.read('diagonals.f8'), 'd')
+            childCounts = _fromBytes(archive.read('childCounts.i8'), 'q')
+            materials = [tuple(material) for material in json.loads(archive.read('materials.json').decode('utf-8'))]
+    except (OSError, KeyError, ValueError, TypeError, zipfile.BadZipFile):
+        return None
+
+    count = meta['count']
+    if len(centers) != count * 3 or len(diagonals) != count * 3 or len(childCounts) != count or len(materials) != count:
+        return None
+
+    table = BoxTable()
+    for i in range(count):
+        table.append(centers[i * 3:i * 3 + 3], diagonals[i * 3:i * 3 + 3], childCounts[i])
+
+    # 更新修改时间，清理时按最近使用排序
+    try:
+        os.utime(path, None)
+    except OSError:
+        pass
+    return table, materials
+
+
+def resolveMaterials(materials, sceneMaterials, getId, getName):
+    """ 将缓存中的材质解析为场景中的材质
+        先按对象 ID 查找且名称一致，否则按名称查找，场景中只有一个同名材质时才使用
+        Args:
+            materials (list): 缓存中的 (材质名称, 材质对象 ID)
+            sceneMaterials (iterable): 场景中的全部材质
+            getId (function): getId(material)->对象 ID
+            getName (function): getName(material)->名称
+        Returns:
+            list: 与 materials 对应的场景材质，无法唯一确定时为 None
+    """
+    byId = {}
+    byName = {}
+    for material in sceneMaterials:
+        name = getName(material)
+        byId[getId(material)] = (name, material)
+        byName.setdefault(name, []).append(material)
+
+    resolved = []
+    for name, objectId in materials:
+        found = byId.get(objectId)
+        if found is not None and found[0] == name:
+            resolved.append(found[1])
+            continue
+        candidates = byName.get(name, ())
+        resolved.append(candidates[0] if len(candidates) == 1 else None)
+    return resolved
+
+
+def prune(maxFiles=MAX_CACHE_FILES, extension='.vrsig'):
+    """ 删除最久未使用的扩展名为 extension 的缓存文件，只保留 maxFiles 个 """
+    directory = cacheDir()
+    files = [os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(extension)]
+    if len(files) <= maxFiles:
+        return
+    files.sort(key=os.path.getmtime)
+    for path in files[:len(files) - maxFiles]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,80 @@
+"""
+空间索引
+使用均匀网格对边界框中心点进行分桶，查询时只检查半径范围内的格子
+"""
+import math
+
+
+class SpatialGrid(object):
+
+    """
+    三维均匀网格索引
+    格子边长与查询半径（位置阈值）一致时，每次查询只需检查相邻的 27 个格子
+    """
+
+    def __init__(self, cellSize):
+        """
+            Args:
+                cellSize (float): 格子边长，小于等于 0 时使用 1.0
+        """
+        if cellSize <= 0:
+            cellSize = 1.0
+        self.cellSize = float(cellSize)
+        self.cells = {}
+        self.points = []
+
+    def _cell(self, x, y, z):
+        size = self.cellSize
+        return (int(math.floor(x / size)), int(math.floor(y / size)), int(math.floor(z / size)))
+
+    def insert(self, point):
+        """ 插入一个点，返回该点的序号
+            Args:
+                point (tuple of float): (x, y, z)
+        """
+        idx = len(self.points)
+        x, y, z = point
+        self.points.append((x, y, z))
+        self.cells.setdefault(self._cell(x, y, z), []).append(idx)
+        return idx
+
+    def query(self, point, radius):
+        """ 返回与 point 距离 <= radius 的所有点序号，按插入顺序排列
+            Args:
+                point (tuple of float): (x, y, z)
+                radius (float): 查询半径
+        """
+        x, y, z = point
+        cx, cy, cz = self._cell(x, y, z)
+        reach = max(int(math.ceil(radius / self.cellSize)), 0)
+        points = self.points
+        cells = self.cells
+
+        result = []
+        for ix in range(cx - reach, cx + reach + 1):
+            for iy in range(cy - reach, cy + reach + 1):
+                for iz in range(cz - reach, cz + reach + 1):
+                    bucket = cells.get((ix, iy, iz))
+                    if not bucket:
+                        continue
+                    for idx in bucket:
+                        px, py, pz = points[idx]
+                        if math.sqrt((px - x) * (px - x) + (py - y) * (py - y) + (pz - z) * (pz - z)) <= radius:
+                            result.append(idx)
+        result.sort()
+        return result
+
+    def __len__(self):
+        return len(self.points)
+
+
+def buildGrid(points, radius):
+    """ 以查询半径为格子边长建立网格
+        Args:
+            points (list of tuple): 中心点列表
+            radius (float): 查询半径（位置阈值）
+    """
+    grid = SpatialGrid(radius)
+    for point in points:
+        grid.insert(point)
+    return grid
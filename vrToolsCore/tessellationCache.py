@@ -0,0 +1,92 @@
+"""
+增量细分记录
+每次细分后记录零件的状态指纹（曲面名称和数量、每个曲面的网格内容哈希、图元数量、世界变换、边界框）
+和细分参数，以场景文件路径为键保存到磁盘；再次细分时状态和参数都未变化的零件直接跳过。
+"""
+import hashlib
+import json
+import os
+
+from .signatureCache import cacheDir, prune
+
+# 记录格式版本，格式变化时递增以使旧记录失效
+CACHE_VERSION = 2
+# 浮点数比较的小数位数
+DIGITS = 4
+
+
+def cachePath(scenePath):
+    """ 返回场景文件对应的记录文件路径，场景未保存时返回 None """
+    if not scenePath:
+        return None
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(scenePath)).encode('utf-8')).hexdigest()
+    return os.path.join(cacheDir(), key + '.vrtess')
+
+
+def _rounded(values):
+    return [round(float(value), DIGITS) + 0.0 for value in values]
+
+
+def fingerprint(surfaceNames, surfaceHashes, primitiveCount, transform, boundingBox):
+    """ 零件的状态指纹
+        Args:
+            surfaceNames (list of str): 曲面子节点名称
+            surfaceHashes (list of str): 零件及每个曲面子节点的网格内容哈希，无效的几何体为 None
+            primitiveCount (int): 零件的图元数量
+            transform (list of float): 世界变换矩阵，无法获取时为空列表
+            boundingBox (list of float): 边界框 (x1, y1, z1, x2, y2, z2)
+    """
+    text = json.dumps([list(surfaceNames), list(surfaceHashes), primitiveCount, _rounded(transform), _rounded(boundingBox)],
+                      ensure_ascii=False)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class TessellationCache(object):
+
+    """ 节点路径 -> (状态指纹, 细分参数) """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.records = {}
+        if path is not None:
+            self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION:
+            return
+        for nodePath, (state, parameters) in data.get('records', {}).items():
+            self.records[nodePath] = (state, tuple(parameters))
+
+        # 更新修改时间，清理时按最近使用排序
+        try:
+            os.utime(self.path, None)
+        except OSError:
+            pass
+
+    def save(self):
+        if self.path is None:
+            return
+        tmpPath = self.path + '.tmp'
+        with open(tmpPath, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'records': self.records}, f, ensure_ascii=False)
+        os.replace(tmpPath, self.path)
+        prune(extension='.vrtess')
+
+    def parameters(self, nodePath, state):
+        """ 零件状态未变化时返回上次的细分参数，否则返回 None """
+        record = self.records.get(nodePath)
+        if record is None or record[0] != state:
+            return None
+        return record[1]
+
+    def isClean(self, nodePath, state, parameters):
+        """ 零件状态和细分参数都与上次相同 """
+        return self.parameters(nodePath, state) == tuple(parameters)
+
+    def update(self, nodePath, state, parameters):
+        self.records[nodePath] = (state, tuple(parameters))
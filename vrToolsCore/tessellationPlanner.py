@@ -0,0 +1,141 @@
+"""
+自适应细分参数
+按零件边界框大小和屏幕重要度分配弦高误差，使全部零件细分后的三角形总数接近给定预算。
+三角形数量按弦高误差的反比估算（弦长与误差的平方根成正比，三角形数量与弦长平方成反比），
+参数量化为有限的几档，参数相同的零件合并为一次细分调用。
+"""
+import math
+
+
+# 界面中的预设 (弦高误差, 法线容差, 最大弦长)，按弦高误差从大到小排列
+PRESETS = (
+    (1.00, 30.0, 400.0),
+    (0.15, 20.0, 300.0),
+    (0.075, 10.0, 200.0),
+    (0.0375, 7.5, 100.0),
+)
+
+# 弦高误差的取值范围
+MIN_DEVIATION = 0.01
+MAX_DEVIATION = 2.0
+# 每倍弦高误差分为几档
+LEVELS_PER_OCTAVE = 2
+# 尚未细分的零件按边界框对角线估算的三角形密度（每毫米对角线，参考弦高误差下）
+TRIANGLES_PER_UNIT = 2.0
+
+
+def importance(center, diagonal, eye):
+    """ 屏幕重要度：边界框对角线相对于到视点距离的比值，没有视点时为 1
+        Args:
+            center (tuple): 边界框中心点
+            diagonal (float): 边界框对角线长度
+            eye (tuple): None 或视点位置
+    """
+    if eye is None:
+        return 1.0
+    distance = math.sqrt(sum((c - e) * (c - e) for c, e in zip(center, eye)))
+    return diagonal / max(distance, diagonal, 1e-6)
+
+
+def estimateTriangles(triangles, diagonal, reference, deviation):
+    """ 估算零件以 deviation 细分后的三角形数量
+        Args:
+            triangles (int): 当前三角形数量，视为以 reference 细分的结果，为 0 时按对角线估算
+            diagonal (float): 边界框对角线长度
+            reference (float): 参考弦高误差
+            deviation (float): 目标弦高误差
+    """
+    if triangles <= 0:
+        triangles = diagonal * TRIANGLES_PER_UNIT
+    return triangles * reference / deviation
+
+
+def quantize(deviation):
+    """ 将弦高误差量化到 2 的分数次幂 """
+    level = round(math.log2(deviation) * LEVELS_PER_OCTAVE)
+    return round(2.0 ** (level / float(LEVELS_PER_OCTAVE)), 5)
+
+
+def presetFor(deviation):
+    """ 按弦高误差在预设之间插值法线容差和最大弦长（对数插值） """
+    if deviation >= PRESETS[0][0]:
+        return PRESETS[0][1], PRESETS[0][2]
+    if deviation <= PRESETS[-1][0]:
+        return PRESETS[-1][1], PRESETS[-1][2]
+    for upper, lower in zip(PRESETS, PRESETS[1:]):
+        if lower[0] <= deviation <= upper[0]:
+            t = (math.log(upper[0]) - math.log(deviation)) / (math.log(upper[0]) - math.log(lower[0]))
+            return (round(upper[1] + (lower[1] - upper[1]) * t, 2),
+                    round(upper[2] + (lower[2] - upper[2]) * t, 1))
+
+
+def planParameters(diagonals, triangles, budget, reference, importances=None, sizeExponent=1.0):
+    """ 计算每个零件的细分参数
+        Args:
+            diagonals (list of float): 零件边界框对角线长度
+            triangles (list of int): 零件当前三角形数量，视为以 reference 细分的结果
+            budget (int): 三角形总数预算
+            reference (float): 参考弦高误差（界面中的弦高误差）
+            importances (list of float): None 或零件屏幕重要度，越大细分越精细
+            sizeExponent (float): 弦高误差随零件大小增长的指数，越大小零件越粗糙
+        Returns:
+            tuple: (每个零件的 (弦高误差, 法线容差, 最大弦长), 估算的三角形总数)
+    """
+    count = len(diagonals)
+    if count == 0:
+        return [], 0
+    if importances is None:
+        importances = [1.0] * count
+
+    # 弦高误差 = scale * weight，weight 与零件大小成正比、与重要度成反比
+    ordered = sorted(diagonals)
+    median = max(ordered[count // 2], 1e-6)
+    meanImportance = sum(importances) / count or 1.0
+    weights = []
+    for diagonal, weight in zip(diagonals, importances):
+        relative = max(weight / meanImportance, 1e-3)
+        weights.append((max(diagonal, 1e-6) / median) ** sizeExponent / relative)
+
+    # 预算 = Σ estimate(reference) * reference / (scale * weight)，解出 scale；
+    # 被限制在取值范围的零件固定后对其余零件重新求解
+    base = [estimateTriangles(tris, diagonal, reference, reference) * reference
+            for tris, diagonal in zip(triangles, diagonals)]
+    deviations = [None] * count
+    free = list(range(count))
+    remaining = float(budget)
+    for _ in range(8):
+        if not free:
+            break
+        demand = sum(base[i] / weights[i] for i in free)
+        scale = demand / remaining if remaining > 0 else float('inf')
+        clamped = []
+        for i in free:
+            deviation = scale * weights[i]
+            if deviation < MIN_DEVIATION or deviation > MAX_DEVIATION:
+                deviations[i] = min(max(deviation, MIN_DEVIATION), MAX_DEVIATION)
+                clamped.append(i)
+            else:
+                deviations[i] = deviation
+        if not clamped:
+            break
+        for i in clamped:
+            remaining -= base[i] / deviations[i]
+        clampedSet = set(clamped)
+        free = [i for i in free if i not in clampedSet]
+
+    parameters = []
+    total = 0
+    for i, deviation in enumerate(deviations):
+        deviation = min(max(quantize(deviation), MIN_DEVIATION), MAX_DEVIATION)
+        normalTolerance, maxChordLength = presetFor(deviation)
+        parameters.append((deviation, normalTolerance, maxChordLength))
+        total += base[i] / deviation
+    return parameters, int(total)
+
+
+def groupByParameters(parameters):
+    """ 参数相同的零件分为一组，返回 参数 -> 零件序号列表，按首次出现的顺序 """
+    groups = {}
+    for idx, parameter in enumerate(parameters):
+        groups.setdefault(parameter, []).append(idx)
+    return groups
@@ -0,0 +1,117 @@
+"""
+贴图内存审查和缩小计划
+按图像文件汇总材质引用的贴图，估算显存占用并排序；
+给定显存预算和最大边长时，先限制边长，再不断将占用最大的贴图边长减半，直到满足预算。
+"""
+import heapq
+import os
+
+from . import textureStrip
+
+
+# 按文件扩展名估算上传到显卡后的每像素字节数，其余格式按 RGBA8 计算
+BYTES_PER_PIXEL = {'.hdr': 16, '.exr': 8, '.tif': 4, '.tiff': 4}
+DEFAULT_BYTES_PER_PIXEL = 4
+
+# 缩小后的最小边长
+MIN_SIZE = 256
+
+# 颜色贴图通道，缩小后可以有损压缩；法线、凹凸等数据贴图保持原格式
+COLOR_CHANNELS = ('diffuse', 'glossy', 'specular', 'incandescence', 'scatter')
+
+
+class TextureInfo(object):
+
+    """ 一张图像文件及引用它的材质通道 """
+
+    def __init__(self, path, width, height):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.format = os.path.splitext(path)[1].lower()
+        # (材质名称, 通道)
+        self.uses = []
+        # 引用该图像的贴图对象，用于替换为缩小后的图像
+        self.handles = []
+
+    @property
+    def bytesPerPixel(self):
+        return BYTES_PER_PIXEL.get(self.format, DEFAULT_BYTES_PER_PIXEL)
+
+    @property
+    def bytes(self):
+        return textureStrip.imageBytes(self.width, self.height, self.bytesPerPixel)
+
+    @property
+    def isColor(self):
+        """ 所有引用都是颜色通道时为 True """
+        return all(channel in COLOR_CHANNELS for materialName, channel in self.uses)
+
+
+def collect(references):
+    """ 按图像文件汇总贴图引用
+        Args:
+            references (iterable): (path, width, height, materialName, channel, handle)
+        Returns:
+            list: TextureInfo，按显存占用从大到小排列
+    """
+    textures = {}
+    for path, width, height, materialName, channel, handle in references:
+        key = os.path.normcase(os.path.abspath(path)) if path else (materialName, channel)
+        info = textures.get(key)
+        if info is None:
+            info = textures[key] = TextureInfo(path, width, height)
+        info.uses.append((materialName, channel))
+        info.handles.append(handle)
+    return rank(textures.values())
+
+
+def rank(textures):
+    """ 按显存占用从大到小排列 """
+    return sorted(textures, key=lambda info: (-info.bytes, info.path))
+
+
+def planDownscale(textures, budget, maxSize=None, minSize=MIN_SIZE):
+    """ 计算需要缩小的贴图和目标尺寸
+        Args:
+            textures (list): TextureInfo
+            budget (int): 显存预算（字节），0 为只限制最大边长
+            maxSize (int): None 或最大边长
+            minSize (int): 减半时的最小边长
+        Returns:
+            dict: TextureInfo -> (width, height)，只包含尺寸发生变化的贴图
+    """
+    sizes = {}
+    for info in textures:
+        width, height = info.width, info.height
+        if maxSize and max(width, height) > maxSize:
+            scale = float(maxSize) / max(width, height)
+            width = max(int(width * scale), 1)
+            height = max(int(height * scale), 1)
+        sizes[info] = (width, height)
+
+    def bytesOf(info, size):
+        return textureStrip.imageBytes(size[0], size[1], info.bytesPerPixel)
+
+    total = sum(bytesOf(info, size) for info, size in sizes.items())
+    if budget:
+        # 最大堆，序号用于在占用相同时保持稳定的顺序
+        heap = [(-bytesOf(info, size), idx, info) for idx, (info, size) in enumerate(sizes.items())]
+        heapq.heapify(heap)
+        while total > budget and heap:
+            negative, idx, info = heapq.heappop(heap)
+            width, height = sizes[info]
+            if max(width, height) // 2 < minSize:
+                continue
+            size = (max(width // 2, 1), max(height // 2, 1))
+            total -= -negative - bytesOf(info, size)
+            sizes[info] = size
+            heapq.heappush(heap, (-bytesOf(info, size), idx, info))
+
+    return dict((info, size) for info, size in sizes.items() if size != (info.width, info.height))
+
+
+def outputPath(path, directory, width, height, extension=None):
+    """ 缩小后图像的保存路径：目录/原文件名_宽x高.扩展名 """
+    root, ext = os.path.splitext(os.path.basename(path))
+    return os.path.join(directory, '%s_%dx%d%s' % (root, width, height, extension or ext))
@@ -0,0 +1,68 @@
+"""
+材质贴图清理
+每个材质只读取一次颜色组件容器，只修改当前启用贴图的通道，
+并统计清理的贴图数量和被清理贴图引用的内存（共享的图像只计一次），可只统计不修改。
+引用的内存不等于实际释放的内存，图像仍被其他材质或通道使用时不会释放。
+"""
+
+
+# 带贴图的颜色组件通道，字段名称为 通道名 + 'Component'
+CHANNELS = ('diffuse', 'glossy', 'specular', 'incandescence', 'bump', 'transparency', 'scatter', 'roughness',
+            'displacement', 'fresnel', 'rotation', 'indexOfRefraction', 'specularBump', 'metallic',
+            'ambientOcclusion')
+
+
+class StripStats(object):
+
+    """ 清理统计 """
+
+    def __init__(self):
+        self.materials = 0
+        # 没有颜色组件的材质（如开关材质、多层材质）
+        self.skippedMaterials = 0
+        self.textures = 0
+        # 被清理贴图引用的图像内存估算（字节），多个材质或通道共用的图像只计一次
+        self.bytes = 0
+        # 已计入内存的图像标识
+        self.seenImages = set()
+
+    def summary(self):
+        return '%d materials, %d skipped, %d textures, %d images, %.1f MB referenced' % (
+            self.materials, self.skippedMaterials, self.textures, len(self.seenImages), self.bytes / 1048576.0)
+
+
+def imageBytes(width, height, bytesPerPixel, depth=1, mipmapped=True):
+    """ 估算贴图占用的内存，生成 mipmap 时约增加三分之一 """
+    size = max(width, 0) * max(height, 0) * max(depth, 1) * max(bytesPerPixel, 0)
+    if mipmapped:
+        size = size * 4 // 3
+    return size
+
+
+def stripMaterial(componentData, access, stats, dryRun=False, measure=None):
+    """ 关闭一个材质所有通道的贴图
+        Args:
+            componentData: 材质颜色组件容器的字段访问对象（vrFieldAccess）
+            access (function): access(fieldContainer)->字段访问对象
+            stats (StripStats): 统计结果
+            dryRun (bool): 为 True 时只统计，不修改
+            measure (function): None 或 measure(component)->(图像标识, 贴图内存字节数)，
+                                没有图像时标识为 None
+    """
+    stats.materials += 1
+    for channel in CHANNELS:
+        name = channel + 'Component'
+        if not componentData.hasField(name):
+            continue
+        component = access(componentData.getFieldContainer(name))
+        # 未启用贴图的通道不写入
+        if not component.getBool('useTexture'):
+            continue
+        stats.textures += 1
+        if measure is not None:
+            image, size = measure(component)
+            if image is not None and image not in stats.seenImages:
+                stats.seenImages.add(image)
+                stats.bytes += size
+        if not dryRun:
+            component.setBool('useTexture', False)